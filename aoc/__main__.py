@@ -0,0 +1,3 @@
+from aoc.cli import main
+
+main()
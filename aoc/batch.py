@@ -0,0 +1,96 @@
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, asdict
+from datetime import timedelta
+from typing import Any, Dict, List
+import io
+import json
+import os
+import time
+import traceback
+
+from aoc import instrument, metrics
+from aoc.lazy import lazy_import
+from aoc.runner import Solver, load_solver
+
+futures = lazy_import("concurrent.futures")
+sharedmap = lazy_import("aoc.sharedmap")
+
+# Runs one day's solver over a directory of inputs. Every worker process loads the solver once and
+# then calls Solver.solve on the text of each input, so an input costs reading and solving it, not
+# starting an interpreter. Inputs are handed to the workers in chunks, which keeps the scheduling
+# and pickling overhead per input small. Results come back in input order.
+
+@dataclass
+class BatchResult:
+    path: str
+    part1: str = None
+    part2: str = None
+    time_ns: int = 0
+    error: str = None
+    # what the solver recorded with aoc.metrics
+    metrics: Dict[str, Dict[str, Any]] = None
+
+# the solver of this worker process, see init_worker
+_solver: Solver = None
+
+def init_worker(day: int, example: bool):
+    global _solver
+    _solver = load_solver(day)
+    _solver.set_example(example)
+    # the batch's workers already take every CPU they were given
+    sharedmap.set_default_jobs(1)
+
+def solve_file(path: str) -> BatchResult:
+    result = BatchResult(path)
+    try:
+        with open(path, "r") as file:
+            text = file.read()
+        # solvers print debug output and progress bars, keep them out of the results
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            metrics.collect() # left over from an input that raised
+            start = time.perf_counter_ns()
+            part1, part2 = _solver.solve(text)
+            result.time_ns = time.perf_counter_ns() - start
+        result.metrics = metrics.collect()
+        result.part1, result.part2 = str(part1), str(part2)
+    except Exception:
+        result.error = traceback.format_exc()
+    return result
+
+def input_files(directory: str) -> List[str]:
+    # regular files in name order, hidden ones left out
+    return sorted(entry.path for entry in os.scandir(directory) if entry.is_file() and not entry.name.startswith("."))
+
+def default_chunk_size(count: int, jobs: int) -> int:
+    # about four chunks per worker, like multiprocessing.Pool.map, so a slow chunk can't hold up the end for long
+    return max(1, -(-count // (jobs * 4)))
+
+def run_batch(day: int, directory: str, jobs: int, chunk_size: int = None, example: bool = False,
+              output_path: str = None) -> bool:
+    paths = input_files(directory)
+    if len(paths) == 0: raise ValueError(f"no input files in {directory}")
+    chunk_size = chunk_size or default_chunk_size(len(paths), jobs)
+
+    start = time.perf_counter_ns()
+    failed = 0
+    solve_ns = 0
+    output = open(output_path, "w") if output_path is not None else None
+    try:
+        with futures.ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(day, example)) as pool:
+            for result in pool.map(solve_file, paths, chunksize=chunk_size):
+                name = os.path.relpath(result.path, directory)
+                if result.error is not None:
+                    failed += 1
+                    print(f"{name} failed: {result.error.strip().splitlines()[-1]}")
+                else:
+                    solve_ns += result.time_ns
+                    print(f"{name} part1: {result.part1}  part2: {result.part2}")
+                if output is not None: output.write(json.dumps(asdict(result)) + "\n")
+    finally:
+        if output is not None: output.close()
+    wall_ns = time.perf_counter_ns() - start
+
+    print(f"day{day:02} batch: {len(paths)} inputs in {timedelta(microseconds=wall_ns // 1000)}  "
+          f"({len(paths) * 1_000_000_000 / wall_ns:.1f} inputs/s, solving {instrument.format_ns(solve_ns)}, "
+          f"{jobs} processes, chunks of {chunk_size})" + (f", {failed} failed" if failed > 0 else ""))
+    return failed == 0
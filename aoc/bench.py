@@ -0,0 +1,194 @@
+from contextlib import redirect_stdout
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+import io
+import json
+import os
+import time
+
+from aoc import progress
+from aoc.instrument import PHASES, format_bytes, format_ns
+from aoc.lazy import lazy_import
+from aoc.runner import ROOT_DIR, Solver, load_solver
+
+startup = lazy_import("aoc.startup")
+statistics = lazy_import("statistics")
+tracemalloc = lazy_import("tracemalloc")
+
+DEFAULT_OUTPUT_FILE = os.path.join(ROOT_DIR, "bench_output.txt")
+DEFAULT_TOLERANCE = 0.2
+# differences below this are timer and scheduler noise, never report them
+NOISE_FLOOR_NS = 100_000
+# bench results store the cold start time of each day next to its phases
+STARTUP = "startup"
+# peak memory differences below this are allocator and interning noise
+MEMORY_NOISE_FLOOR_BYTES = 64 * 1024
+
+@dataclass
+class PhaseStats:
+    runs: int
+    min_ns: int
+    median_ns: int
+    p95_ns: int
+    # peak traced memory during the phase, from a separate run with tracemalloc
+    peak_bytes: int = None
+
+    @classmethod
+    def from_samples(cls, samples: List[int], peak_bytes: int = None) -> "PhaseStats":
+        ordered = sorted(samples)
+        p95_idx = max(0, -(-len(ordered) * 95 // 100) - 1)
+        return cls(len(ordered), ordered[0], int(statistics.median(ordered)), ordered[p95_idx], peak_bytes)
+
+@dataclass
+class DayBench:
+    day: int
+    phases: Dict[str, PhaseStats]
+
+@dataclass
+class Regression:
+    day: int
+    phase: str
+    baseline_ns: int
+    current_ns: int
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+@dataclass
+class MemoryRegression:
+    day: int
+    phase: str
+    baseline_bytes: int
+    current_bytes: int
+
+    @property
+    def ratio(self) -> float:
+        return self.current_bytes / self.baseline_bytes
+
+def measure_peak_memory(solver: Solver, input_path: str) -> Dict[str, int]:
+    # tracemalloc slows allocations down a lot, so memory gets its own run outside the timed ones.
+    # The parsed input stays traced, so the part peaks include it.
+    peaks = {}
+    with redirect_stdout(io.StringIO()), progress.disabled():
+        tracemalloc.start()
+        try:
+            input_data = solver.parse(input_path)
+            peaks["parse"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            solver.part1(input_data)
+            peaks["part1"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            solver.part2(input_data)
+            peaks["part2"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return peaks
+
+def benchmark_solver(solver: Solver, input_path: str, repeat: int, warmup: int = 1, measure_memory: bool = False) -> DayBench:
+    samples = {phase: [] for phase in PHASES}
+
+    # solvers print debug output and progress, keep it out of the timings
+    with redirect_stdout(io.StringIO()), progress.disabled():
+        for run in range(warmup + repeat):
+            start = time.perf_counter_ns()
+            input_data = solver.parse(input_path)
+            parsed = time.perf_counter_ns()
+            solver.part1(input_data)
+            part1_done = time.perf_counter_ns()
+            solver.part2(input_data)
+            part2_done = time.perf_counter_ns()
+
+            if run < warmup: continue
+            samples["parse"].append(parsed - start)
+            samples["part1"].append(part1_done - parsed)
+            samples["part2"].append(part2_done - part1_done)
+
+    peaks = measure_peak_memory(solver, input_path) if measure_memory else {}
+    return DayBench(solver.day, {phase: PhaseStats.from_samples(samples[phase], peaks.get(phase)) for phase in PHASES})
+
+def benchmark_cold_start(day: int, repeat: int, warmup: int = 1) -> PhaseStats:
+    samples = [startup.cold_start_ns(day) for _ in range(warmup + repeat)]
+    return PhaseStats.from_samples(samples[warmup:])
+
+def benchmark_days(days: List[int], repeat: int, warmup: int = 1, example: bool = False, use_cache: bool = True,
+                   measure_memory: bool = False, measure_cold_start: bool = True) -> List[DayBench]:
+    results = []
+    for day in days:
+        solver = load_solver(day, use_cache)
+        solver.set_example(example)
+        result = benchmark_solver(solver, solver.input_path(example), repeat, warmup, measure_memory)
+        if measure_cold_start: result.phases[STARTUP] = benchmark_cold_start(day, repeat, warmup)
+        print_day_bench(result)
+        results.append(result)
+    return results
+
+def print_day_bench(result: DayBench):
+    cols = [f"{phase} min {format_ns(s.min_ns)} / med {format_ns(s.median_ns)} / p95 {format_ns(s.p95_ns)}" +
+            (f" / peak {format_bytes(s.peak_bytes)}" if s.peak_bytes is not None else "") for phase, s in result.phases.items()]
+    print(f"day{result.day:02}  " + "  |  ".join(cols))
+
+def results_to_json(results: List[DayBench]) -> Dict:
+    return {"days": {f"day{r.day:02}": {phase: asdict(s) for phase, s in r.phases.items()} for r in results}}
+
+def results_from_json(data: Dict) -> List[DayBench]:
+    results = []
+    for day_name, phases in data["days"].items():
+        day = int(day_name.removeprefix("day"))
+        results.append(DayBench(day, {phase: PhaseStats(**stats) for phase, stats in phases.items()}))
+    return results
+
+def write_results(path: str, results: List[DayBench]):
+    with open(path, "w") as file:
+        json.dump(results_to_json(results), file, indent=2)
+
+def read_results(path: str) -> List[DayBench]:
+    with open(path, "r") as file:
+        return results_from_json(json.load(file))
+
+def find_regressions(baseline: List[DayBench], current: List[DayBench], tolerance: float) -> List[Regression]:
+    baseline_by_day = {r.day: r for r in baseline}
+    regressions = []
+    for result in current:
+        base = baseline_by_day.get(result.day)
+        if base is None: continue
+        for phase, stats in result.phases.items():
+            base_stats = base.phases.get(phase)
+            if base_stats is None or base_stats.median_ns == 0: continue
+            if stats.median_ns - base_stats.median_ns < NOISE_FLOOR_NS: continue
+            if stats.median_ns > base_stats.median_ns * (1 + tolerance):
+                regressions.append(Regression(result.day, phase, base_stats.median_ns, stats.median_ns))
+    return regressions
+
+def find_memory_regressions(baseline: List[DayBench], current: List[DayBench], tolerance: float) -> List[MemoryRegression]:
+    baseline_by_day = {r.day: r for r in baseline}
+    regressions = []
+    for result in current:
+        base = baseline_by_day.get(result.day)
+        if base is None: continue
+        for phase, stats in result.phases.items():
+            base_stats = base.phases.get(phase)
+            if base_stats is None or not base_stats.peak_bytes or stats.peak_bytes is None: continue
+            if stats.peak_bytes - base_stats.peak_bytes < MEMORY_NOISE_FLOOR_BYTES: continue
+            if stats.peak_bytes > base_stats.peak_bytes * (1 + tolerance):
+                regressions.append(MemoryRegression(result.day, phase, base_stats.peak_bytes, stats.peak_bytes))
+    return regressions
+
+def run_bench(days: List[int], repeat: int, warmup: int, example: bool, output_path: str, baseline_path: str, save_baseline_path: str, tolerance: float,
+              use_cache: bool = True, measure_memory: bool = False, measure_cold_start: bool = True) -> bool:
+    results = benchmark_days(days, repeat, warmup, example, use_cache, measure_memory, measure_cold_start)
+    write_results(output_path, results)
+
+    if save_baseline_path is not None:
+        write_results(save_baseline_path, results)
+
+    if baseline_path is None: return True
+
+    baseline = read_results(baseline_path)
+    regressions = find_regressions(baseline, results, tolerance)
+    for reg in regressions:
+        print(f"REGRESSION day{reg.day:02} {reg.phase}: median {format_ns(reg.baseline_ns)} -> {format_ns(reg.current_ns)} ({reg.ratio:.2f}x)")
+    memory_regressions = find_memory_regressions(baseline, results, tolerance)
+    for reg in memory_regressions:
+        print(f"REGRESSION day{reg.day:02} {reg.phase}: peak memory {format_bytes(reg.baseline_bytes)} -> {format_bytes(reg.current_bytes)} ({reg.ratio:.2f}x)")
+    return len(regressions) == 0 and len(memory_regressions) == 0
@@ -0,0 +1,106 @@
+from array import array
+from types import ModuleType
+from typing import Any, Dict
+import json
+import os
+import struct
+
+from aoc.lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+mmap = lazy_import("mmap")
+
+# Parsed inputs are cached as named flat arrays in one binary file per (day, input, parser version).
+# A day opts in by defining PARSER_VERSION, encode_input(input_data) -> {name: array or bytes}
+# and decode_input(arrays) -> input_data. decode_input gets memoryviews into a read-only mmap
+# of the cache file, so it should copy whatever the solver mutates.
+#
+# file layout: MAGIC, u32 header length, JSON header {name: [typecode, offset, count]},
+# then the raw array data, every array starting on an ALIGN byte boundary
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "parsed")
+MAGIC = b"AOCP"
+FORMAT_VERSION = 1
+ALIGN = 8
+
+def supports_cache(module: ModuleType) -> bool:
+    return all(hasattr(module, name) for name in ["PARSER_VERSION", "encode_input", "decode_input"])
+
+def input_digest(module: ModuleType, input_path: str) -> str:
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{module.__name__}:{module.PARSER_VERSION}:".encode())
+    with open(input_path, "rb") as file:
+        digest.update(file.read())
+    return digest.hexdigest()[:32]
+
+def cache_path(module: ModuleType, input_path: str) -> str:
+    day_name = module.__name__.split(".")[0]
+    return os.path.join(CACHE_DIR, f"{day_name}-{input_digest(module, input_path)}.bin")
+
+def align(offset: int) -> int:
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def layout(arrays: Dict[str, Any]) -> (bytes, Dict[str, list], int, int):
+    # (header block, header, data start, total size)
+    header = {}
+    offset = 0
+    for name, values in arrays.items():
+        typecode = values.typecode if isinstance(values, array) else "B"
+        header[name] = [typecode, offset, len(values)]
+        offset = align(offset + len(values) * array(typecode).itemsize)
+
+    header_bytes = json.dumps(header).encode()
+    data_start = align(len(MAGIC) + 4 + len(header_bytes))
+    return MAGIC + struct.pack("<I", len(header_bytes)) + header_bytes, header, data_start, data_start + offset
+
+def write_arrays(path: str, arrays: Dict[str, Any]):
+    header_block, header, data_start, _ = layout(arrays)
+
+    # write to a temporary file first, so a crash never leaves a truncated cache file behind
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header_block)
+        for name, values in arrays.items():
+            file.write(b"\0" * (data_start + header[name][1] - file.tell()))
+            file.write(values.tobytes() if isinstance(values, array) else bytes(values))
+    os.replace(tmp_path, path)
+
+def pack_arrays(buffer: memoryview, arrays: Dict[str, Any]):
+    # the same layout into a writable buffer of at least layout()'s total size, e.g. shared memory
+    header_block, header, data_start, _ = layout(arrays)
+    buffer[:len(header_block)] = header_block
+    for name, values in arrays.items():
+        data = memoryview(values).cast("B")
+        start = data_start + header[name][1]
+        buffer[start:start + len(data)] = data
+
+def read_arrays(path: str) -> Dict[str, memoryview]:
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[:len(MAGIC)] != MAGIC: raise ValueError(f"not a parsed input cache file: {path}")
+    return unpack_arrays(memoryview(mapped))
+
+def unpack_arrays(view: memoryview) -> Dict[str, memoryview]:
+    (header_len,) = struct.unpack_from("<I", view, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    header = json.loads(bytes(view[header_start:header_start + header_len]))
+    data_start = align(header_start + header_len)
+
+    arrays = {}
+    for name, (typecode, offset, count) in header.items():
+        start = data_start + offset
+        arrays[name] = view[start:start + count * array(typecode).itemsize].cast(typecode)
+    return arrays
+
+def cached_parse(module: ModuleType, input_path: str) -> Any:
+    path = cache_path(module, input_path)
+    if os.path.exists(path):
+        try:
+            return module.decode_input(read_arrays(path))
+        except (ValueError, KeyError, TypeError, struct.error):
+            pass # unreadable or stale layout, parse again and overwrite it
+
+    input_data = module.parse_input(input_path)
+    write_arrays(path, module.encode_input(input_data))
+    return input_data
@@ -0,0 +1,153 @@
+import argparse
+import os
+import sys
+
+from aoc import bench, instrument, parallel, runner, scaling
+from aoc.lazy import lazy_import
+
+batch = lazy_import("aoc.batch")
+daemon = lazy_import("aoc.daemon")
+difftest = lazy_import("aoc.difftest")
+generators = lazy_import("aoc.generators")
+incremental = lazy_import("aoc.incremental")
+memo = lazy_import("aoc.memo")
+startup = lazy_import("aoc.startup")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="aoc", description="Advent of Code 2023 solvers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run solvers in this interpreter")
+    run_parser.add_argument("days", nargs="+", help="days to run, e.g. 5, 1-10, all")
+    run_parser.add_argument("--input", dest="input_path", help="input file (single day only)")
+    run_parser.add_argument("--example", action="store_true", help="use the example input")
+    run_parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="always parse the input text")
+    run_parser.add_argument("--profile", help="phases to profile, e.g. part1, parse,part2, all")
+    run_parser.add_argument("--profiler", choices=instrument.PROFILERS, default="cprofile", help="cprofile traces every call, sample takes stack samples")
+    run_parser.add_argument("--profile-dir", default=runner.DEFAULT_PROFILE_DIR, help="where to write collapsed stacks and .prof files")
+    run_parser.add_argument("--memory", action="store_true", help="trace allocations, print peak memory and top allocation sites per phase")
+    run_parser.add_argument("--concurrent-parts", action="store_true", help="parse once, then run part1 and part2 at the same time in two processes")
+    run_parser.add_argument("--import-profile", action="store_true", help="show what loading each day's solver imports and how long it takes, instead of running it")
+    run_parser.add_argument("--jobs", "-j", type=int, nargs="?", const=os.cpu_count(), help="run days and parts across this many processes, longest first")
+    run_parser.add_argument("--history", default=parallel.DEFAULT_HISTORY_FILE, help="bench results used to order --jobs runs")
+    run_parser.add_argument("--incremental", action="store_true", help="only run days whose source or input changed since the last incremental run")
+    run_parser.add_argument("--state", help="where --incremental keeps fingerprints, answers and times, .cache/runs.json by default")
+    run_parser.add_argument("--metrics", metavar="PATH", help="print the work counters solvers record, like search pushes and pops, and write them per day and phase to this JSON lines file")
+    run_parser.add_argument("--memo-stats", action="store_true", help="print hits, misses and sizes of each day's memo tables")
+    run_parser.add_argument("--persist-memo", nargs="?", const=True, metavar="DIR", help="keep memo tables that support it on disk between runs, in .cache/memo/ by default")
+
+    bench_parser = commands.add_parser("bench", help="time parse/part1/part2 over repeated runs")
+    bench_parser.add_argument("days", nargs="+", help="days to benchmark, e.g. 5, 1-10, all")
+    bench_parser.add_argument("--repeat", type=int, default=10, help="timed runs per day")
+    bench_parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing")
+    bench_parser.add_argument("--example", action="store_true", help="use the example input")
+    bench_parser.add_argument("--output", default=bench.DEFAULT_OUTPUT_FILE, help="where to write the JSON results")
+    bench_parser.add_argument("--baseline", help="fail if a phase median is slower than in this results file")
+    bench_parser.add_argument("--save-baseline", help="also write the results to this file")
+    bench_parser.add_argument("--tolerance", type=float, default=bench.DEFAULT_TOLERANCE, help="allowed slowdown vs baseline, 0.2 = 20%%")
+    bench_parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="time parsing the input text instead of loading the parse cache")
+    bench_parser.add_argument("--memory", action="store_true", help="also record each phase's peak memory in an extra traced run")
+    bench_parser.add_argument("--no-cold-start", dest="cold_start", action="store_false", help="don't time starting a fresh interpreter for each day")
+
+    batch_parser = commands.add_parser("batch", help="solve every input file in a directory with one day's solver")
+    batch_parser.add_argument("day", type=int)
+    batch_parser.add_argument("directory", help="directory of input files")
+    batch_parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="worker processes, every CPU by default")
+    batch_parser.add_argument("--chunk-size", type=int, help="inputs handed to a worker at a time, about four chunks per worker by default")
+    batch_parser.add_argument("--example", action="store_true", help="use the example puzzle constants")
+    batch_parser.add_argument("--output", help="also write one JSON line per input to this file")
+
+    difftest_parser = commands.add_parser("difftest", help="check fast implementations against reference ones on generated inputs")
+    difftest_parser.add_argument("days", nargs="+", help="days to check, e.g. 5, 1-10, all")
+    difftest_parser.add_argument("--seeds", type=int, default=10, help="generated inputs per scale")
+    difftest_parser.add_argument("--seed", type=int, default=0, help="first seed")
+
+    serve_parser = commands.add_parser("serve", help="keep solvers loaded and parsed inputs cached, answer requests on a Unix socket")
+    serve_parser.add_argument("--socket", help="socket path, .cache/aoc.sock by default")
+    serve_parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="parse input text instead of loading the parse cache")
+
+    ask_parser = commands.add_parser("ask", help="send a solve request to a running `serve` daemon")
+    ask_parser.add_argument("day", type=int)
+    ask_parser.add_argument("--part", type=int, choices=[1, 2], help="run only this part")
+    ask_parser.add_argument("--input", dest="input_path", help="input file")
+    ask_parser.add_argument("--example", action="store_true", help="use the example input")
+    ask_parser.add_argument("--socket", help="socket path, .cache/aoc.sock by default")
+
+    gen_parser = commands.add_parser("gen", help="generate a synthetic input for a day")
+    gen_parser.add_argument("day", type=int)
+    gen_parser.add_argument("--scale", type=int, required=True, help="size of the input, meaning depends on the day")
+    gen_parser.add_argument("--seed", type=int, default=0)
+    gen_parser.add_argument("--output", help="file to write, stdout if omitted")
+
+    scaling_parser = commands.add_parser("scaling", help="fit time and memory exponents over generated input sizes")
+    scaling_parser.add_argument("days", nargs="+", help="days to profile, e.g. 5, 1-10, all")
+    scaling_parser.add_argument("--scales", help="comma separated generator scales, defaults to a per-day sweep")
+    scaling_parser.add_argument("--repeat", type=int, default=3, help="timed runs per scale, the fastest is kept")
+    scaling_parser.add_argument("--time-limit", type=float, default=scaling.DEFAULT_TIME_LIMIT_S, help="stop a sweep once a scale takes longer (seconds)")
+    scaling_parser.add_argument("--seed", type=int, default=0)
+    scaling_parser.add_argument("--output", help="where to write the JSON results")
+    scaling_parser.add_argument("--baseline", help="fail if a time exponent is higher than in this results file")
+    scaling_parser.add_argument("--save-baseline", help="also write the results to this file")
+    scaling_parser.add_argument("--tolerance", type=float, default=scaling.DEFAULT_TOLERANCE, help="allowed exponent increase vs baseline")
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    incremental_state = (args.state or incremental.DEFAULT_STATE_FILE) if getattr(args, "incremental", False) else None
+
+    match args.command:
+        case "run" if args.import_profile:
+            for day in runner.parse_days(args.days):
+                startup.print_import_profile(day, startup.import_profile(day))
+        case "run" if args.jobs is not None:
+            if args.profile is not None or args.memory: sys.exit("--profile and --memory can't be used with --jobs")
+            if args.concurrent_parts: sys.exit("--concurrent-parts can't be used with --jobs")
+            if args.memo_stats or args.persist_memo or args.metrics: sys.exit("--memo-stats, --persist-memo and --metrics can't be used with --jobs")
+            ok = parallel.run_days(runner.parse_days(args.days), args.jobs, input_path=args.input_path, example=args.example,
+                                   use_cache=args.use_cache, history_path=args.history, incremental_state=incremental_state)
+            if not ok: sys.exit(1)
+        case "run":
+            if args.concurrent_parts and args.profile is not None: sys.exit("--profile can't be used with --concurrent-parts")
+            if args.incremental and (args.profile is not None or args.memory): sys.exit("--profile and --memory can't be used with --incremental")
+            if args.concurrent_parts and args.memo_stats: sys.exit("--memo-stats can't be used with --concurrent-parts")
+            if args.persist_memo: memo.enable_persistence(memo.DEFAULT_PERSIST_DIR if args.persist_memo is True else args.persist_memo)
+            runner.run_days(runner.parse_days(args.days), input_path=args.input_path, example=args.example, use_cache=args.use_cache,
+                            profile_phases=instrument.parse_phases(args.profile), profiler=args.profiler, profile_dir=args.profile_dir,
+                            trace_memory=args.memory, concurrent_parts=args.concurrent_parts, incremental_state=incremental_state,
+                            memo_stats=args.memo_stats, metrics_path=args.metrics)
+        case "bench":
+            ok = bench.run_bench(runner.parse_days(args.days), args.repeat, args.warmup, args.example,
+                                 args.output, args.baseline, args.save_baseline, args.tolerance, args.use_cache, args.memory,
+                                 args.cold_start)
+            if not ok: sys.exit(1)
+        case "scaling":
+            scales = [int(x) for x in args.scales.split(",")] if args.scales else None
+            ok = scaling.run_scaling(runner.parse_days(args.days), scales, args.repeat, args.time_limit, args.seed,
+                                     args.output, args.baseline, args.save_baseline, args.tolerance)
+            if not ok: sys.exit(1)
+        case "batch":
+            ok = batch.run_batch(args.day, args.directory, args.jobs, args.chunk_size, args.example, args.output)
+            if not ok: sys.exit(1)
+        case "difftest":
+            ok = difftest.run_difftest(runner.parse_days(args.days), list(range(args.seed, args.seed + args.seeds)))
+            if not ok: sys.exit(1)
+        case "serve":
+            daemon.serve(args.socket or daemon.DEFAULT_SOCKET_PATH, use_cache=args.use_cache)
+        case "ask":
+            request = {"day": args.day, "part": args.part, "example": args.example}
+            if args.input_path is not None: request["input_path"] = os.path.abspath(args.input_path)
+            response = daemon.send_request(request, args.socket or daemon.DEFAULT_SOCKET_PATH)
+            if "error" in response: sys.exit(response["error"])
+            for part, answer in response["answers"].items():
+                print(f"day{args.day:02} {part}: {answer}")
+            print(f"day{args.day:02} handled in {instrument.format_ns(response['handle_ns'])}  (" +
+                  ("parse cached, " if response["parse_cached"] else "") +
+                  ", ".join(f"{phase} {instrument.format_ns(ns)}" for phase, ns in response["time_ns"].items()) + ")")
+        case "gen":
+            text = generators.generate(args.day, args.scale, args.seed)
+            if args.output is None:
+                sys.stdout.write(text)
+            else:
+                with open(args.output, "w") as file:
+                    file.write(text)
@@ -0,0 +1,58 @@
+from typing import Tuple
+
+from aoc.grid import Grid
+
+# A position (x, y) packed into one int as (y + origin_y) * stride + (x + origin_x).
+# Directions are packed the same way without the origin, so moving is plain integer
+# addition, and sets and dicts of positions hash ints instead of dataclasses.
+# As long as stride is wider than every x that gets packed, packing is exact.
+
+# direction indexes in the same order as the direction lists in the solvers:
+# up, left, down, right. Each one is the ccw rotation of the previous one.
+UP, LEFT, DOWN, RIGHT = range(4)
+DIR4_VECTORS = ((0, -1), (-1, 0), (0, 1), (1, 0))
+
+def rotated_ccw_dir(dir_idx: int) -> int:
+    return (dir_idx + 1) & 3
+
+def rotated_cw_dir(dir_idx: int) -> int:
+    return (dir_idx + 3) & 3
+
+def reversed_dir(dir_idx: int) -> int:
+    return (dir_idx + 2) & 3
+
+class PackedCoords:
+    __slots__ = ["stride", "origin_x", "origin_y", "origin", "dirs4"]
+
+    def __init__(self, stride: int, origin_x: int = 0, origin_y: int = 0):
+        self.stride = stride
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.origin = origin_y * stride + origin_x
+        self.dirs4 = tuple(self.delta(x, y) for x, y in DIR4_VECTORS)
+
+    def pack(self, x: int, y: int) -> int:
+        return (y + self.origin_y) * self.stride + x + self.origin_x
+
+    def unpack(self, p: int) -> Tuple[int, int]:
+        y, x = divmod(p, self.stride)
+        return x - self.origin_x, y - self.origin_y
+
+    def delta(self, dx: int, dy: int) -> int:
+        return dy * self.stride + dx
+
+    def unpack_delta(self, d: int) -> Tuple[int, int]:
+        dy, dx = divmod(d + self.stride // 2, self.stride)
+        return dx - self.stride // 2, dy
+
+    def rotated_ccw(self, d: int) -> int:
+        dx, dy = self.unpack_delta(d)
+        return self.delta(dy, -dx)
+
+def grid_coords(grid: Grid) -> PackedCoords:
+    # packs positions to the same ints as Grid.index
+    return PackedCoords(grid.stride, 1, 1)
+
+def plane_coords(reach: int) -> PackedCoords:
+    # for unbounded planes: positions up to reach away from (0, 0) in any direction
+    return PackedCoords(2 * reach + 3, reach + 1, reach + 1)
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Set, Tuple
+import math
+
+# A sequence of states s0, s1 = step(s0), ... that eventually repeats is described by its tail,
+# the number of states before the loop starts, and its period. States are compared exactly,
+# so they should be compact hashable snapshots (ints, tuples, frozensets, bytes).
+
+@dataclass
+class Cycle:
+    tail: int
+    period: int
+    # states[i] is the state after i steps for i < tail + period, when they were recorded
+    states: List[Hashable] = None
+    # otherwise state_at replays from start with step
+    start: Hashable = None
+    step: Callable[[Any], Any] = None
+
+    def index_at(self, n: int) -> int:
+        # the step below tail + period whose state equals the state after n steps
+        if n < self.tail: return n
+        return self.tail + (n - self.tail) % self.period
+
+    def state_at(self, n: int) -> Hashable:
+        idx = self.index_at(n)
+        if self.states is not None: return self.states[idx]
+        state = self.start
+        for _ in range(idx):
+            state = self.step(state)
+        return state
+
+def iterate(start: Hashable, step: Callable[[Any], Any]) -> Iterator[Hashable]:
+    state = start
+    while True:
+        yield state
+        state = step(state)
+
+def find_cycle(states: Iterable[Hashable]) -> Cycle:
+    # remembers every state until one repeats, for state sequences produced by a simulation
+    # that can't be restarted. Returns None if states runs out first.
+    first_seen = {}
+    history = []
+    for idx, state in enumerate(states):
+        prev_idx = first_seen.get(state)
+        if prev_idx is not None:
+            return Cycle(prev_idx, idx - prev_idx, states=history)
+        first_seen[state] = idx
+        history.append(state)
+    return None
+
+def brent(start: Hashable, step: Callable[[Any], Any]) -> Cycle:
+    # constant memory, step has to be a pure function of the state
+    power = period = 1
+    tortoise = start
+    hare = step(start)
+    while tortoise != hare:
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        period += 1
+
+    tortoise = hare = start
+    for _ in range(period):
+        hare = step(hare)
+    tail = 0
+    while tortoise != hare:
+        tortoise = step(tortoise)
+        hare = step(hare)
+        tail += 1
+
+    return Cycle(tail, period, start=start, step=step)
+
+def combine_congruences(r1: int, m1: int, r2: int, m2: int) -> Tuple[int, int]:
+    # x = r1 mod m1 and x = r2 mod m2 as a single x = r mod m, None if there is no solution
+    g = math.gcd(m1, m2)
+    if (r2 - r1) % g != 0: return None
+    m = m1 // g * m2
+    k = (r2 - r1) // g * pow(m1 // g, -1, m2 // g) % (m2 // g)
+    return (r1 + m1 * k) % m, m
+
+def looping_hits(cycle: Cycle, hits: Set[int]) -> (Set[int], int):
+    # the hits at or after the tail as residues of the shortest period they repeat with,
+    # which can be much shorter than the cycle of the whole state
+    residues = {h % cycle.period for h in hits if h >= cycle.tail}
+    small_divisors = [d for d in range(1, math.isqrt(cycle.period) + 1) if cycle.period % d == 0]
+    divisors = sorted(set(small_divisors + [cycle.period // d for d in small_divisors]))
+    for d in divisors:
+        if all((r + d) % cycle.period in residues for r in residues):
+            return {r % d for r in residues}, d
+
+def first_common_step(cycles: List[Tuple[Cycle, Set[int]]]) -> int:
+    # smallest n at which every cycle's index_at(n) is one of its hit indexes, None if never
+    max_tail = max(cycle.tail for cycle, _ in cycles)
+    for n in range(max_tail):
+        if all(cycle.index_at(n) in hits for cycle, hits in cycles): return n
+
+    # from max_tail on every cycle is looping, so a hit means n = residue mod period
+    congruences = {(0, 1)}
+    for cycle, hits in cycles:
+        residues, period = looping_hits(cycle, hits)
+        combined = (combine_congruences(r, m, residue, period) for r, m in congruences for residue in residues)
+        congruences = {c for c in combined if c is not None}
+
+    if len(congruences) == 0: return None
+    return min(r if r >= max_tail else r + (max_tail - r + m - 1) // m * m for r, m in congruences)
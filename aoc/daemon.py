@@ -0,0 +1,146 @@
+from contextlib import redirect_stdout
+from typing import Any, Dict, List, Tuple
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+import traceback
+
+from aoc import instrument, memo, progress
+from aoc.runner import ALL_DAYS, ROOT_DIR, Solver, load_solver
+
+# A long running solver process for tools that submit many small jobs. It imports every solver once
+# and keeps parsed inputs in memory, so a request pays neither interpreter startup nor, once its
+# input has been seen, parsing. Requests and responses are JSON objects, one per line, over a Unix
+# domain socket, and a connection can send any number of requests. Requests are handled one at a
+# time: solvers keep module level state, like IS_EXAMPLE, that concurrent requests would share.
+#
+# request:  {"day": 5, "part": "part1", "input_path": "/path/input.txt", "example": false}
+#           part is "part1", "part2", 1 or 2, both parts run without it. input_path defaults to the
+#           day's input.txt, or its example with "example": true.
+# response: {"day": 5, "answers": {"part1": "..."}, "time_ns": {"parse": ..., "part1": ...},
+#            "parse_cached": true, "handle_ns": ...}, answers as printed by `run`
+#           {"error": "..."} for a bad request or a solver that raised
+
+DEFAULT_SOCKET_PATH = os.path.join(ROOT_DIR, ".cache", "aoc.sock")
+# parsed inputs kept in memory, least recently used ones are dropped first
+MAX_CACHED_INPUTS = 64
+PARTS = ["part1", "part2"]
+
+class RequestError(Exception):
+    pass
+
+def input_signature(path: str) -> Tuple[int, int]:
+    # a parsed input is reused for as long as its file looks the same
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class SolverPool:
+    def __init__(self, days: List[int], use_cache: bool = True):
+        self.solvers = {day: load_solver(day, use_cache) for day in days}
+        # (day, input path, example) -> (input signature, parsed input)
+        self.parsed = memo.table("daemon parsed inputs", maxsize=MAX_CACHED_INPUTS)
+
+    def parse(self, solver: Solver, input_path: str, example: bool) -> (Any, bool):
+        key = (solver.day, input_path, example)
+        signature = input_signature(input_path)
+        cached = self.parsed.get(key)
+        if cached is not None and cached[0] == signature: return cached[1], True
+
+        input_data = solver.parse(input_path)
+        self.parsed[key] = (signature, input_data)
+        return input_data, False
+
+    def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        day = request.get("day")
+        if day not in self.solvers: raise RequestError(f"invalid day: {day!r}")
+        solver = self.solvers[day]
+        parts = request_parts(request.get("part"))
+        example = bool(request.get("example", False))
+        input_path = os.path.abspath(request.get("input_path") or solver.input_path(example))
+
+        solver.set_example(example)
+        response = {"day": day, "answers": {}, "time_ns": {}}
+        # solvers print debug output, which would end up in the daemon's log
+        with redirect_stdout(io.StringIO()), progress.disabled():
+            start = time.perf_counter_ns()
+            input_data, response["parse_cached"] = self.parse(solver, input_path, example)
+            response["time_ns"]["parse"] = time.perf_counter_ns() - start
+            for part in parts:
+                phase_run = instrument.run_phase(part, getattr(solver, part), input_data)
+                response["answers"][part] = str(phase_run.result)
+                response["time_ns"][part] = phase_run.time_ns
+        return response
+
+def request_parts(part: Any) -> List[str]:
+    match part:
+        case None | "both": return PARTS
+        case 1 | 2: return [PARTS[part - 1]]
+        case "part1" | "part2": return [part]
+    raise RequestError(f"invalid part: {part!r}")
+
+def handle_line(pool: SolverPool, line: bytes) -> Dict[str, Any]:
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict): raise RequestError("a request must be a JSON object")
+        return pool.solve(request)
+    except (ValueError, RequestError, OSError) as error:
+        return {"error": str(error)}
+    except Exception:
+        return {"error": traceback.format_exc()}
+
+def log_line(response: Dict[str, Any]) -> str:
+    if "error" in response: return f"error: {response['error'].strip().splitlines()[-1]}"
+    cached = ", parse cached" if response["parse_cached"] else ""
+    return f"day{response['day']:02} {'+'.join(response['answers'])}{cached}: {instrument.format_ns(response['handle_ns'])}"
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if len(line.strip()) == 0: continue
+            start = time.perf_counter_ns()
+            response = handle_line(self.server.pool, line)
+            response["handle_ns"] = time.perf_counter_ns() - start
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
+            print(log_line(response), flush=True)
+
+def remove_stale_socket(socket_path: str):
+    if not os.path.exists(socket_path): return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(socket_path) # left behind by a daemon that didn't shut down cleanly
+            return
+    raise RuntimeError(f"a daemon is already listening on {socket_path}")
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH, days: List[int] = ALL_DAYS, use_cache: bool = True):
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    remove_stale_socket(socket_path)
+    start = time.perf_counter_ns()
+    pool = SolverPool(days, use_cache)
+    print(f"loaded {len(pool.solvers)} solvers in {instrument.format_ns(time.perf_counter_ns() - start)}, "
+          f"listening on {socket_path}", flush=True)
+
+    # SIGTERM unwinds like Ctrl-C does, so the socket file gets removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        with socketserver.UnixStreamServer(socket_path, RequestHandler) as server:
+            server.pool = pool
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(socket_path): os.unlink(socket_path)
+
+def send_request(request: Dict[str, Any], socket_path: str = DEFAULT_SOCKET_PATH) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b"\n")
+        with client.makefile("rb") as reader:
+            return json.loads(reader.readline())
@@ -0,0 +1,207 @@
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, List
+import io
+import os
+
+from aoc import cache, generators, instrument, progress
+from aoc.lazy import lazy_import
+from aoc.runner import load_solver
+
+tempfile = lazy_import("tempfile")
+tracemalloc = lazy_import("tracemalloc")
+
+# Differential testing: fast implementations against the slow, obviously correct ones they
+# replace, on seeded random inputs from aoc.generators. A day keeps its reference implementation
+# behind a module flag, like day17's USE_HEURISTICS, or as a function of its own, and day_checks
+# says how to run each side. Every day also checks that all its ways of parsing give the same
+# answers. Every variant parses the input itself, so none of them sees what another one did to
+# the parsed input.
+
+# small enough that reference implementations finish in well under a second
+PARSE_SCALES = {
+    1: [50], 2: [50], 3: [20], 4: [50], 5: [5], 6: [1000], 7: [50], 8: [50], 9: [50], 10: [12],
+    11: [15], 12: [20], 13: [10], 14: [12], 15: [100], 16: [12], 17: [12], 18: [20], 19: [20], 20: [5],
+    21: [21], 22: [50], 23: [15], 24: [10], 25: [30],
+}
+PARTS = ["part1", "part2"]
+# day21's part2 walks 26501365 steps whatever the grid size and day24's searches for minutes, their
+# parse checks run part1 only. The day21 solvers are checked on shorter walks in day21_checks.
+PARSE_CHECK_PARTS = {21: ["part1"], 24: ["part1"]}
+# days whose parse_input returns a StreamedInput, at scales that make inputs of about 2MB
+STREAMED_SCALES = {1: [200000], 2: [30000], 4: [18000], 9: [20000], 15: [320000]}
+# traced peak a streamed day's parse and parts may reach, parse cache included, whatever the input's size
+STREAMED_MAX_PEAK_BYTES = 1 << 20
+# day15's part2 keeps every lens in its boxes, and generated inputs have more labels the bigger they are
+STREAMED_CHECK_PARTS = {15: ["part1"]}
+
+@dataclass
+class Variant:
+    name: str
+    # (day module, input text, input file) -> answers, compared with ==
+    run: Callable[[ModuleType, str, str], Any]
+
+@dataclass
+class Check:
+    day: int
+    name: str
+    reference: Variant
+    candidates: List[Variant]
+    scales: List[int]
+    # for checks that only depend on the size of their inputs
+    max_seeds: int = None
+
+@dataclass
+class Mismatch:
+    check: Check
+    scale: int
+    seed: int
+    variant: str
+    expected: Any
+    actual: Any
+
+def answers(module: ModuleType, input_data: Any, parts: List[str] = PARTS) -> List[Any]:
+    return [getattr(module, f"do_{part}")(input_data) for part in parts]
+
+def run_parts(module: ModuleType, text: str, path: str) -> List[Any]:
+    return answers(module, module.parse_text(text))
+
+def with_flag(name: str, value: Any, run: Callable[[ModuleType, str, str], Any]) -> Callable[[ModuleType, str, str], Any]:
+    def run_with_flag(module: ModuleType, text: str, path: str) -> Any:
+        previous = getattr(module, name)
+        setattr(module, name, value)
+        try:
+            return run(module, text, path)
+        finally:
+            setattr(module, name, previous)
+    return run_with_flag
+
+def flag_check(day: int, flag: str, reference_value: Any, fast_value: Any, scales: List[int]) -> Check:
+    return Check(day, flag, Variant(f"{flag}={reference_value}", with_flag(flag, reference_value, run_parts)),
+                 [Variant(f"{flag}={fast_value}", with_flag(flag, fast_value, run_parts))], scales)
+
+def parse_from_text(module: ModuleType, text: str, path: str) -> Any:
+    return module.parse_text(text)
+
+def parse_from_file(module: ModuleType, text: str, path: str) -> Any:
+    return module.parse_input(path)
+
+def parse_through_cache(module: ModuleType, text: str, path: str) -> Any:
+    # the whole cache round trip: encode, write, memory-map and decode
+    with tempfile.TemporaryDirectory() as directory:
+        cache_file = os.path.join(directory, "parsed.bin")
+        cache.write_arrays(cache_file, module.encode_input(module.parse_input(path)))
+        return module.decode_input(cache.read_arrays(cache_file))
+
+def parse_variant(name: str, parse: Callable[[ModuleType, str, str], Any], parts: List[str]) -> Variant:
+    return Variant(name, lambda module, text, path: answers(module, parse(module, text, path), parts))
+
+def parse_check(day: int) -> Check:
+    module = load_solver(day).module
+    parts = PARSE_CHECK_PARTS.get(day, PARTS)
+    candidates = [parse_variant("parse_input", parse_from_file, parts)]
+    if cache.supports_cache(module): candidates.append(parse_variant("parse cache", parse_through_cache, parts))
+    return Check(day, "parse", parse_variant("parse_text", parse_from_text, parts), candidates, PARSE_SCALES[day])
+
+def run_streamed(day: int, parts: List[str]) -> Callable[[ModuleType, str, str], List[Any]]:
+    # parsed the way run does it, through the parse cache when the day has one
+    def run(module: ModuleType, text: str, path: str) -> List[Any]:
+        solver = load_solver(day, use_cache=True)
+        tracemalloc.start()
+        try:
+            result = answers(module, solver.parse(path), parts)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        if peak > STREAMED_MAX_PEAK_BYTES:
+            raise MemoryError(f"peaked at {instrument.format_bytes(peak)} on a {instrument.format_bytes(len(text))} input")
+        return result
+    return run
+
+def streamed_check(day: int) -> Check:
+    parts = STREAMED_CHECK_PARTS.get(day, PARTS)
+    return Check(day, "streamed memory", parse_variant("parse_input", parse_from_file, parts),
+                 [Variant("traced run", run_streamed(day, parts))], STREAMED_SCALES[day], max_seeds=1)
+
+def day21_step_counts(module: ModuleType, text: str) -> (Any, List[int]):
+    # part2's step count is a whole number of grid widths plus half of one, like 26501365 = 202300 * 131 + 65
+    input_data = module.parse_text(text)
+    width = input_data.grid_size.x
+    return input_data, [k * width + width // 2 for k in (1, 2, 3)]
+
+def day21_reachable(solve: Callable[[ModuleType, Any, int], int]) -> Callable[[ModuleType, str, str], List[int]]:
+    def run(module: ModuleType, text: str, path: str) -> List[int]:
+        input_data, step_counts = day21_step_counts(module, text)
+        return [solve(module, input_data, steps) for steps in step_counts]
+    return run
+
+def day21_checks() -> List[Check]:
+    reference = Variant("solve_bruteforce", day21_reachable(lambda m, data, steps: len(m.solve_bruteforce(data, steps, True, False))))
+    candidates = [
+        Variant("solve_grid_based_bruteforce", day21_reachable(lambda m, data, steps: m.solve_grid_based_bruteforce(data, steps))),
+        Variant("solve_grid_based_optimized", day21_reachable(lambda m, data, steps: m.solve_grid_based_optimized(data, steps))),
+    ]
+    return [Check(21, "wrapped steps", reference, candidates, [11, 21, 31])]
+
+def day_checks(day: int) -> List[Check]:
+    checks = [parse_check(day)]
+    if day in STREAMED_SCALES: checks.append(streamed_check(day))
+    match day:
+        case 5: checks.append(flag_check(5, "USE_INTERVALS", False, True, [5, 20]))
+        case 6: checks.append(flag_check(6, "USE_CLOSED_FORM", False, True, [1000, 100000]))
+        case 8: checks.append(flag_check(8, "USE_CYCLES", False, True, [50, 200]))
+        case 14: checks.append(flag_check(14, "USE_CYCLES", False, True, [12, 20]))
+        case 16: checks.append(flag_check(16, "USE_PACKED_GRID", False, True, [12, 30]))
+        case 17: checks.append(flag_check(17, "USE_HEURISTICS", False, True, [12, 20]))
+        case 20: checks.append(flag_check(20, "USE_CYCLES", False, True, [5, 8]))
+        case 21: checks.extend(day21_checks())
+    return checks
+
+def run_variant(variant: Variant, module: ModuleType, text: str, path: str) -> Any:
+    # a variant that raises gets the exception as its answer, which never equals the reference's
+    try:
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()), progress.disabled():
+            return variant.run(module, text, path)
+    except Exception as error:
+        return error
+
+def run_check(check: Check, seeds: List[int]) -> (int, List[Mismatch]):
+    solver = load_solver(check.day)
+    solver.set_example(False)
+    inputs = 0
+    mismatches = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in check.scales:
+            for seed in seeds[:check.max_seeds]:
+                text = generators.generate(check.day, scale, seed)
+                path = os.path.join(directory, f"day{check.day:02}_{scale}_{seed}.txt")
+                with open(path, "w") as file:
+                    file.write(text)
+
+                inputs += 1
+                expected = run_variant(check.reference, solver.module, text, path)
+                for variant in check.candidates:
+                    actual = run_variant(variant, solver.module, text, path)
+                    if isinstance(expected, Exception) or isinstance(actual, Exception) or actual != expected:
+                        mismatches.append(Mismatch(check, scale, seed, variant.name, expected, actual))
+    return inputs, mismatches
+
+def format_answer(answer: Any) -> str:
+    if isinstance(answer, Exception): return f"raised {type(answer).__name__}: {answer}"
+    return repr(answer)
+
+def run_difftest(days: List[int], seeds: List[int]) -> bool:
+    ok = True
+    for day in days:
+        for check in day_checks(day):
+            inputs, mismatches = run_check(check, seeds)
+            names = ", ".join(variant.name for variant in check.candidates)
+            status = "ok" if len(mismatches) == 0 else f"{len(mismatches)} MISMATCHES"
+            print(f"day{day:02} {check.name}: {inputs} inputs, {names} vs {check.reference.name}: {status}", flush=True)
+            for mismatch in mismatches:
+                ok = False
+                print(f"  {mismatch.variant} on `python -m aoc gen {day} --scale {mismatch.scale} --seed {mismatch.seed}`:")
+                print(f"    expected {format_answer(mismatch.expected)}")
+                print(f"    got      {format_answer(mismatch.actual)}")
+    return ok
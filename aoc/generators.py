@@ -0,0 +1,503 @@
+from typing import Callable, Dict, List, Tuple
+import math
+import random
+import string
+
+# Every generator takes (rng, scale) and returns the text of a valid puzzle input.
+# What scale means differs per day, see SCALE_UNITS.
+
+def unique_names(rng: random.Random, count: int, min_len: int = 2, letters: str = string.ascii_lowercase, exclude=()) -> List[str]:
+    name_len = min_len
+    while len(letters) ** name_len < count * 2 + len(exclude):
+        name_len += 1
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choices(letters, k=name_len))
+        if name not in exclude: names.add(name)
+    names = sorted(names)
+    rng.shuffle(names)
+    return names
+
+def random_grid_rows(rng: random.Random, width: int, height: int, cells: str, weights: List[float]) -> List[List[str]]:
+    return [rng.choices(cells, weights, k=width) for _ in range(height)]
+
+def join_rows(rows: List[List[str]]) -> str:
+    return "\n".join("".join(row) for row in rows) + "\n"
+
+# scale: number of lines
+def gen_day01(rng: random.Random, scale: int) -> str:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+    lines = []
+    for _ in range(scale):
+        parts = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            match rng.randint(0, 2):
+                case 0: parts.append(str(rng.randint(1, 9)))
+                case 1: parts.append(rng.choice(words))
+                case 2: parts.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 4))))
+        rng.shuffle(parts)
+        lines.append("".join(parts))
+    return "\n".join(lines) + "\n"
+
+# scale: number of games
+def gen_day02(rng: random.Random, scale: int) -> str:
+    lines = []
+    for game_id in range(1, scale + 1):
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            sets.append(", ".join(f"{rng.randint(1, 20)} {color}" for color in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(sets))
+    return "\n".join(lines) + "\n"
+
+# scale: grid side length
+def gen_day03(rng: random.Random, scale: int) -> str:
+    rows = [["."] * scale for _ in range(scale)]
+    for y in range(scale):
+        x = 0
+        while x < scale:
+            roll = rng.random()
+            if roll < 0.02:
+                # a gear, unless a number in the row above or below touches it too
+                gear = f"{rng.randint(1, 999)}*{rng.randint(1, 999)}"[:scale - x]
+                rows[y][x:x + len(gear)] = list(gear)
+                x += len(gear) + 1
+            elif roll < 0.08:
+                digits = str(rng.randint(1, 999))[:scale - x]
+                rows[y][x:x + len(digits)] = list(digits)
+                x += len(digits) + 1
+            elif roll < 0.11:
+                rows[y][x] = rng.choice("*#+$/=@%&-")
+                x += 2
+            else:
+                x += 1
+    return join_rows(rows)
+
+def format_cols(nums: List[int]) -> str:
+    return " ".join(f"{n:2}" for n in nums)
+
+# scale: number of cards
+def gen_day04(rng: random.Random, scale: int) -> str:
+    lines = []
+    for card_id in range(1, scale + 1):
+        winning = rng.sample(range(1, 100), 10)
+        # fewer than one new copy per card on average, so copy counts stay bounded
+        match_count = min(rng.choice([0, 0, 0, 1, 1, 2, 4]), scale - card_id)
+        others = [n for n in range(1, 100) if n not in winning]
+        mine = rng.sample(winning, match_count) + rng.sample(others, 25 - match_count)
+        rng.shuffle(mine)
+        lines.append(f"Card {card_id:3}: {format_cols(winning)} | {format_cols(mine)}")
+    return "\n".join(lines) + "\n"
+
+# scale: seed range pairs and ranges per map
+def gen_day05(rng: random.Random, scale: int) -> str:
+    limit = 2 ** 32
+    seeds = []
+    for _ in range(max(1, scale)):
+        start = rng.randrange(limit // 2)
+        seeds.extend([start, rng.randrange(1, limit // 4)])
+
+    lines = ["seeds: " + " ".join(map(str, seeds)), ""]
+    types = ["seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location"]
+    for src_type, dst_type in zip(types, types[1:]):
+        cuts = sorted(rng.sample(range(1, limit), max(1, scale)))
+        bounds = [0] + cuts + [limit]
+        segments = [(bounds[i], bounds[i + 1] - bounds[i]) for i in range(len(bounds) - 1)]
+        dst_starts = [start for start, _ in segments]
+        rng.shuffle(dst_starts)
+
+        lines.append(f"{src_type}-to-{dst_type} map:")
+        for (src_start, count), dst_start in zip(segments, dst_starts):
+            # leave some numbers unmapped
+            if rng.random() < 0.1: continue
+            lines.append(f"{dst_start} {src_start} {count}")
+        lines.append("")
+    return "\n".join(lines)
+
+def best_distance(race_time: int) -> int:
+    hold = race_time // 2
+    return hold * (race_time - hold)
+
+# scale: part2 race time (the part2 loop is linear in it)
+def gen_day06(rng: random.Random, scale: int) -> str:
+    digits = str(max(10, scale))
+    # races of at least two digits, like the real input's, so every race has hold times that win
+    race_count = max(1, min(4, len(digits) // 2))
+    cuts = [len(digits) * i // race_count for i in range(race_count + 1)]
+    while True:
+        # the first race keeps the leading digits of scale, so the part2 race time stays close to it
+        times = [digits[:cuts[1]]] + [str(rng.randrange(10 ** (b - a - 1), 10 ** (b - a))) for a, b in zip(cuts[1:], cuts[2:])]
+        distances = [str(rng.randrange(best_distance(int(t)) // 2, best_distance(int(t)))) for t in times]
+        if int("".join(distances)) < best_distance(int("".join(times))): break
+
+    width = max(map(len, times + distances)) + 2
+    return "Time:    " + "".join(t.rjust(width) for t in times) + "\n" + \
+        "Distance:" + "".join(d.rjust(width) for d in distances) + "\n"
+
+# scale: number of hands
+def gen_day07(rng: random.Random, scale: int) -> str:
+    return "".join(f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}\n" for _ in range(scale))
+
+def is_prime(n: int) -> bool:
+    return n >= 2 and all(n % d != 0 for d in range(2, math.isqrt(n) + 1))
+
+# scale: number of nodes
+def gen_day08(rng: random.Random, scale: int) -> str:
+    instructions = "".join(rng.choices("LR", k=rng.randint(200, 300)))
+    ghost_count = 6
+    prefixes = unique_names(rng, ghost_count * 2, 2, string.ascii_uppercase, exclude={"AA", "ZZ"})
+    start_names = ["AAA"] + [prefix + "A" for prefix in prefixes[1:ghost_count]]
+    end_names = ["ZZZ"] + [prefix + "Z" for prefix in prefixes[ghost_count + 1:]]
+    names = unique_names(rng, max(scale, ghost_count * 4), 3, string.ascii_uppercase)
+    middle_names = [name for name in names if name[-1] not in "AZ"]
+
+    # every ghost walks a chain into its Z node and then loops with the same period.
+    # the solver's lcm needs the periods to share a factor, so they are factor * distinct primes
+    factor = rng.choice([2, 3, 5])
+    max_prime = max(2, len(middle_names) // ghost_count // factor)
+    primes = [n for n in range(max(2, max_prime // 2), max_prime + 1) if is_prime(n)] or [2]
+    period_primes = rng.sample(primes, ghost_count) if len(primes) >= ghost_count else rng.choices(primes, k=ghost_count)
+    nodes = {}
+    next_name = 0
+    for g in range(ghost_count):
+        chain_len = factor * period_primes[g] - 1
+        chain = middle_names[next_name:next_name + chain_len]
+        next_name += chain_len
+        path = [start_names[g]] + chain + [end_names[g]]
+        for src, dst in zip(path, path[1:]):
+            nodes[src] = (dst, dst)
+        nodes[end_names[g]] = (path[1], path[1])
+    lines = [instructions, ""] + [f"{src} = ({left}, {right})" for src, (left, right) in nodes.items()]
+    return "\n".join(lines) + "\n"
+
+# scale: number of histories
+def gen_day09(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(scale):
+        coeffs = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        values = [sum(c * x ** i for i, c in enumerate(coeffs)) for x in range(21)]
+        lines.append(" ".join(map(str, values)))
+    return "\n".join(lines) + "\n"
+
+def pipe_char(prev_dir: Tuple[int, int], next_dir: Tuple[int, int]) -> str:
+    dirs = {(-prev_dir[0], -prev_dir[1]), next_dir}
+    for char, char_dirs in {"|": {(0, -1), (0, 1)}, "-": {(-1, 0), (1, 0)}, "L": {(0, -1), (1, 0)},
+                            "J": {(-1, 0), (0, -1)}, "7": {(-1, 0), (0, 1)}, "F": {(1, 0), (0, 1)}}.items():
+        if dirs == char_dirs: return char
+
+# scale: grid side length
+def gen_day10(rng: random.Random, scale: int) -> str:
+    size = max(8, scale)
+    rows = random_grid_rows(rng, size, size, "|-LJ7F.", [1, 1, 1, 1, 1, 1, 3])
+    for i in range(size):
+        rows[0][i] = rows[size - 1][i] = rows[i][0] = rows[i][size - 1] = "."
+
+    # rectangle loop whose bottom edge has teeth reaching up into it
+    points = [(x, 1) for x in range(1, size - 2)]
+    points += [(size - 2, y) for y in range(1, size - 2)]
+    x = size - 2
+    while x - 4 >= 1:
+        top = rng.randint(3, size - 3)
+        points += [(x, size - 2), (x - 1, size - 2)]
+        points += [(x - 1, y) for y in range(size - 3, top - 1, -1)]
+        points += [(x - 2, y) for y in range(top, size - 1)]
+        x -= 3
+    points += [(x_, size - 2) for x_ in range(x, 0, -1)]
+    points += [(1, y) for y in range(size - 3, 1, -1)]
+
+    for i, (px, py) in enumerate(points):
+        prev_x, prev_y = points[i - 1]
+        next_x, next_y = points[(i + 1) % len(points)]
+        rows[py][px] = pipe_char((px - prev_x, py - prev_y), (next_x - px, next_y - py))
+    rows[1][1] = "S"
+    return join_rows(rows)
+
+# scale: grid side length
+def gen_day11(rng: random.Random, scale: int) -> str:
+    rows = random_grid_rows(rng, scale, scale, ".#", [60, 1])
+    for x in rng.sample(range(scale), scale // 10):
+        for row in rows: row[x] = "."
+    for y in rng.sample(range(scale), scale // 10):
+        rows[y] = ["."] * scale
+    return join_rows(rows)
+
+# scale: number of rows
+def gen_day12(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(scale):
+        springs = rng.choices(".#", k=rng.randint(5, 20))
+        groups = [len(g) for g in "".join(springs).split(".") if g]
+        if not groups:
+            springs[rng.randrange(len(springs))] = "#"
+            groups = [len(g) for g in "".join(springs).split(".") if g]
+        cells = "".join(c if rng.random() < 0.4 else "?" for c in springs)
+        lines.append(f"{cells} {','.join(map(str, groups))}")
+    return "\n".join(lines) + "\n"
+
+def count_reflections(rows: List[str], expected_diff: int) -> int:
+    count = 0
+    for start in range(1, len(rows)):
+        diff = 0
+        for offset in range(min(start, len(rows) - start)):
+            a, b = rows[start - 1 - offset], rows[start + offset]
+            diff += sum(1 for i in range(len(a)) if a[i] != b[i])
+        if diff == expected_diff: count += 1
+    return count
+
+# scale: number of patterns
+def gen_day13(rng: random.Random, scale: int) -> str:
+    patterns = []
+    while len(patterns) < scale:
+        width, height = rng.randint(7, 17), rng.randint(7, 17)
+        cols_line = rng.randint(1, width - 1)
+        rows_line = rng.choice([1, 2, height - 2, height - 1])
+
+        # mirror columns around cols_line, then rows around rows_line
+        rows = random_grid_rows(rng, width, height, ".#", [1, 1])
+        for row in rows:
+            for offset in range(min(cols_line, width - cols_line)):
+                row[cols_line + offset] = row[cols_line - 1 - offset]
+        for offset in range(min(rows_line, height - rows_line)):
+            rows[rows_line + offset] = list(rows[rows_line - 1 - offset])
+
+        # the smudge breaks the column mirror in a row the row mirror doesn't cover
+        mirrored_rows = set(range(max(0, 2 * rows_line - height), min(height, 2 * rows_line)))
+        free_rows = [y for y in range(height) if y not in mirrored_rows]
+        if not free_rows: continue
+        y = rng.choice(free_rows)
+        x = cols_line + rng.randrange(min(cols_line, width - cols_line))
+        rows[y][x] = "#" if rows[y][x] == "." else "."
+
+        row_strs = ["".join(row) for row in rows]
+        col_strs = ["".join(col) for col in zip(*rows)]
+        if count_reflections(row_strs, 0) + count_reflections(col_strs, 0) != 1: continue
+        if count_reflections(row_strs, 1) + count_reflections(col_strs, 1) != 1: continue
+        patterns.append("\n".join(row_strs))
+    return "\n\n".join(patterns) + "\n"
+
+# scale: grid side length
+def gen_day14(rng: random.Random, scale: int) -> str:
+    return join_rows(random_grid_rows(rng, scale, scale, ".#O", [10, 2, 3]))
+
+# scale: number of steps
+def gen_day15(rng: random.Random, scale: int) -> str:
+    labels = unique_names(rng, max(1, scale // 4), 2)
+    steps = []
+    for _ in range(scale):
+        label = rng.choice(labels)
+        steps.append(f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}")
+    return ",".join(steps) + "\n"
+
+# scale: grid side length
+def gen_day16(rng: random.Random, scale: int) -> str:
+    return join_rows(random_grid_rows(rng, scale, scale, ".|-/\\", [40, 1, 1, 1, 1]))
+
+# scale: grid side length
+def gen_day17(rng: random.Random, scale: int) -> str:
+    return join_rows(random_grid_rows(rng, scale, scale, "123456789", [1] * 9))
+
+def skyline_polygon(rng: random.Random, columns: int, max_step: int) -> List[Tuple[str, int]]:
+    # clockwise on screen: up the left side, along a skyline, down the right side, back left
+    heights = [rng.randint(1, max_step)]
+    while len(heights) < columns:
+        height = rng.randint(1, max_step)
+        if height != heights[-1]: heights.append(height)
+    widths = [rng.randint(1, max_step) for _ in range(columns)]
+
+    moves = [("U", heights[0])]
+    for i in range(columns):
+        moves.append(("R", widths[i]))
+        if i + 1 < columns:
+            delta = heights[i + 1] - heights[i]
+            moves.append(("U", delta) if delta > 0 else ("D", -delta))
+    moves.append(("D", heights[-1]))
+    moves.append(("L", sum(widths)))
+    return moves
+
+# scale: number of skyline columns, plans have 2 * scale + 2 instructions
+def gen_day18(rng: random.Random, scale: int) -> str:
+    columns = max(1, scale)
+    plan = skyline_polygon(rng, columns, 10)
+    color_plan = skyline_polygon(rng, columns, 0xfffff // (columns + 1))
+    dir_digits = {"R": "0", "D": "1", "L": "2", "U": "3"}
+    lines = [f"{d} {steps} (#{color_steps:05x}{dir_digits[color_dir]})" for (d, steps), (color_dir, color_steps) in zip(plan, color_plan)]
+    return "\n".join(lines) + "\n"
+
+# scale: number of workflows and parts
+def gen_day19(rng: random.Random, scale: int) -> str:
+    names = ["in"] + unique_names(rng, max(1, scale) - 1, 2, exclude={"in"})
+
+    # workflows form a tree rooted at "in"
+    children = {name: [] for name in names}
+    for i, name in enumerate(names[1:], 1):
+        children[names[rng.randrange(i)]].append(name)
+
+    lines = []
+    for name in names:
+        targets = children[name] + [rng.choice("AR") for _ in range(rng.randint(1, 2))]
+        rng.shuffle(targets)
+        rules = []
+        for target in targets[:-1]:
+            rules.append(f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}")
+        lines.append(f"{name}{{{','.join(rules + [targets[-1]])}}}")
+    lines.append("")
+    for _ in range(max(1, scale)):
+        lines.append("{" + ",".join(f"{attr}={rng.randint(1, 4000)}" for attr in "xmas") + "}")
+    return "\n".join(lines) + "\n"
+
+# scale: bits per counter, part2 needs about 2 ** scale presses per counter
+def gen_day20(rng: random.Random, scale: int) -> str:
+    bits = max(4, scale)
+    counter_count = 4
+    low, high = 2 ** (bits - 1) + 1, 2 ** bits - 1
+    periods = []
+    while len(periods) < counter_count:
+        n = rng.randrange(low, high + 1) | 1
+        if n > high or any(math.gcd(n, p) != 1 for p in periods): continue
+        periods.append(n)
+
+    names = unique_names(rng, counter_count * (bits + 2) + 1, 2, exclude={"rx", "broadcaster"})
+    final_name = names.pop()
+    modules = {"broadcaster": ("", [])}
+    modules[final_name] = ("&", ["rx"])
+
+    # each counter is a chain of flip-flops and a conjunction that fires and resets it at its period
+    for period in periods:
+        flip_flops = [names.pop() for _ in range(bits)]
+        counter_name, inverter_name = names.pop(), names.pop()
+        modules["broadcaster"][1].append(flip_flops[0])
+        counter_dsts = [inverter_name]
+        for i, ff in enumerate(flip_flops):
+            dsts = [flip_flops[i + 1]] if i + 1 < bits else []
+            if period >> i & 1:
+                dsts.append(counter_name)
+            if not period >> i & 1 or i == 0:
+                counter_dsts.append(ff)
+            modules[ff] = ("%", dsts)
+        modules[counter_name] = ("&", counter_dsts)
+        modules[inverter_name] = ("&", [final_name])
+
+    return "".join(f"{mod_type}{name} -> {', '.join(dsts)}\n" for name, (mod_type, dsts) in modules.items())
+
+# scale: grid side length (made odd)
+def gen_day21(rng: random.Random, scale: int) -> str:
+    size = max(5, scale) | 1
+    center = size // 2
+    rows = random_grid_rows(rng, size, size, ".#", [9, 1])
+    # the part2 solver relies on open border, middle row and middle column
+    for i in range(size):
+        rows[0][i] = rows[size - 1][i] = rows[i][0] = rows[i][size - 1] = "."
+        rows[center][i] = rows[i][center] = "."
+    rows[center][center] = "S"
+    return join_rows(rows)
+
+# scale: number of bricks
+def gen_day22(rng: random.Random, scale: int) -> str:
+    footprint = max(3, int(math.sqrt(scale)))
+    lines = []
+    z = 1
+    for _ in range(scale):
+        x, y = rng.randrange(footprint), rng.randrange(footprint)
+        length = rng.randint(1, 4) - 1
+        match rng.randint(0, 2):
+            case 0: end = (min(footprint - 1, x + length), y, z)
+            case 1: end = (x, min(footprint - 1, y + length), z)
+            case 2: end = (x, y, z + length)
+        lines.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+        # every brick gets its own z levels, so no two overlap
+        z = end[2] + rng.randint(1, 3)
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+# scale: grid side length
+def gen_day23(rng: random.Random, scale: int) -> str:
+    size = max(24, scale)
+    lattice = max(2, min(6, size // 12))
+    spacing = (size - 1) // (lattice + 1)
+    jitter = max(0, spacing // 4 - 1)
+
+    nodes = {(i, j): (spacing * (i + 1) + rng.randint(-jitter, jitter), spacing * (j + 1) + rng.randint(-jitter, jitter))
+             for i in range(lattice) for j in range(lattice)}
+    rows = [["#"] * size for _ in range(size)]
+
+    def carve_h(y, x1, x2):
+        for x in range(min(x1, x2), max(x1, x2) + 1): rows[y][x] = "."
+
+    def carve_v(x, y1, y2):
+        for y in range(min(y1, y2), max(y1, y2) + 1): rows[y][x] = "."
+
+    for (i, j), (x1, y1) in nodes.items():
+        if i + 1 < lattice:
+            x2, y2 = nodes[(i + 1, j)]
+            mid = (x1 + x2) // 2
+            carve_h(y1, x1, mid); carve_v(mid, y1, y2); carve_h(y2, mid, x2)
+        if j + 1 < lattice:
+            x2, y2 = nodes[(i, j + 1)]
+            mid = (y1 + y2) // 2
+            carve_v(x1, y1, mid); carve_h(mid, x1, x2); carve_v(x2, mid, y2)
+
+    start_x, start_y = nodes[(0, 0)]
+    carve_v(1, 0, start_y); carve_h(start_y, 1, start_x)
+    end_x, end_y = nodes[(lattice - 1, lattice - 1)]
+    carve_h(end_y, end_x, size - 2); carve_v(size - 2, end_y, size - 1)
+
+    # slopes around each node make the slippery graph flow right and down
+    for x, y in nodes.values():
+        for dx, dy, slope in [(-1, 0, ">"), (1, 0, ">"), (0, -1, "v"), (0, 1, "v")]:
+            if rows[y + dy][x + dx] == ".": rows[y + dy][x + dx] = slope
+    return join_rows(rows)
+
+# scale: number of hailstones (at least 20, part2 samples stones up to index 20)
+def gen_day24(rng: random.Random, scale: int) -> str:
+    rock_pos = [rng.randrange(100_000_000_000_000, 400_000_000_000_000) for _ in range(3)]
+    rock_vel = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(1, 1_000_000_000_000), max(20, scale))
+    lines = []
+    for t in times:
+        vel = [rng.randint(-300, 300) for _ in range(3)]
+        if vel == rock_vel: vel[0] += 1
+        pos = [rock_pos[i] + (rock_vel[i] - vel[i]) * t for i in range(3)]
+        lines.append(f"{pos[0]}, {pos[1]}, {pos[2]} @ {vel[0]}, {vel[1]}, {vel[2]}")
+    return "\n".join(lines) + "\n"
+
+# scale: number of nodes
+def gen_day25(rng: random.Random, scale: int) -> str:
+    names = unique_names(rng, max(16, scale), 3)
+    half = len(names) // 2
+    groups = [names[:half], names[half:]]
+
+    # a ring plus random chords keeps each group well above 3-edge-connected
+    # edges are dict keys, not a set, so the output only depends on the seed
+    edges = {}
+    for group in groups:
+        for i, name in enumerate(group):
+            edges.setdefault(frozenset((name, group[(i + 1) % len(group)])), (name, group[(i + 1) % len(group)]))
+            for _ in range(2):
+                other = rng.choice(group)
+                if other != name: edges.setdefault(frozenset((name, other)), (name, other))
+    cut_edges = {}
+    while len(cut_edges) < 3:
+        a, b = rng.choice(groups[0]), rng.choice(groups[1])
+        cut_edges[frozenset((a, b))] = (a, b)
+    edges.update(cut_edges)
+
+    by_src = {}
+    for src, dst in edges.values():
+        if rng.random() < 0.5: src, dst = dst, src
+        by_src.setdefault(src, []).append(dst)
+    return "".join(f"{src}: {' '.join(dsts)}\n" for src, dsts in by_src.items())
+
+GENERATORS: Dict[int, Callable[[random.Random, int], str]] = {
+    day: globals()[f"gen_day{day:02}"] for day in range(1, 26)
+}
+
+SCALE_UNITS = {
+    1: "lines", 2: "games", 3: "grid side", 4: "cards", 5: "ranges per map", 6: "part2 race time",
+    7: "hands", 8: "nodes", 9: "histories", 10: "grid side", 11: "grid side", 12: "rows",
+    13: "patterns", 14: "grid side", 15: "steps", 16: "grid side", 17: "grid side", 18: "polygon columns",
+    19: "workflows and parts", 20: "counter bits", 21: "grid side", 22: "bricks", 23: "grid side",
+    24: "hailstones", 25: "nodes",
+}
+
+def generate(day: int, scale: int, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(f"{day}:{scale}:{seed}"), scale)
@@ -0,0 +1,123 @@
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Cells live row-major in one flat bytearray, framed by a one cell wide border of
+# sentinel cells. A cell's index is (y + 1) * stride + (x + 1), so moving by one of
+# the offsets from an inside cell always lands on a valid index and bounds checks
+# become a comparison against the border value.
+
+BORDER = 0
+
+class Grid:
+    __slots__ = ["width", "height", "stride", "border", "cells", "offsets4", "offsets8"]
+
+    def __init__(self, width: int, height: int, cells: bytearray, border: int = BORDER):
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.border = border
+        self.cells = cells
+        # up, left, down, right, same order the solvers use for their direction lists
+        self.offsets4 = (-self.stride, -1, self.stride, 1)
+        self.offsets8 = (-self.stride - 1, -self.stride, -self.stride + 1, -1, 1, self.stride - 1, self.stride, self.stride + 1)
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def pos(self, idx: int) -> Tuple[int, int]:
+        y, x = divmod(idx, self.stride)
+        return x - 1, y - 1
+
+    def get(self, x: int, y: int) -> int:
+        return self.cells[(y + 1) * self.stride + x + 1]
+
+    def get_wrapped(self, x: int, y: int) -> int:
+        return self.cells[(y % self.height + 1) * self.stride + x % self.width + 1]
+
+    def set(self, x: int, y: int, value: int):
+        self.cells[(y + 1) * self.stride + x + 1] = value
+
+    def in_bounds(self, idx: int) -> bool:
+        # only meaningful for indexes at most one step outside the grid
+        return self.cells[idx] != self.border
+
+    def is_interior(self, idx: int) -> bool:
+        y, x = divmod(idx, self.stride)
+        return 1 <= x <= self.width and 1 <= y <= self.height
+
+    def row(self, y: int) -> bytes:
+        start = (y + 1) * self.stride + 1
+        return bytes(self.cells[start:start + self.width])
+
+    def row_starts(self) -> range:
+        # index of the first cell of every row
+        return range(self.stride + 1, (self.height + 1) * self.stride, self.stride)
+
+    def indexes(self) -> Iterator[int]:
+        for y in range(self.height):
+            start = (y + 1) * self.stride + 1
+            yield from range(start, start + self.width)
+
+    def find(self, value: str) -> int:
+        # row by row, so border cells never match
+        needle = value.encode()
+        for start in self.row_starts():
+            idx = self.cells.find(needle, start, start + self.width)
+            if idx >= 0: return idx
+        return None
+
+    def find_all(self, value: str) -> List[int]:
+        needle = value.encode()
+        found = []
+        for start in self.row_starts():
+            idx = self.cells.find(needle, start, start + self.width)
+            while idx >= 0:
+                found.append(idx)
+                idx = self.cells.find(needle, idx + 1, start + self.width)
+        return found
+
+    def count(self, value: str) -> int:
+        needle = value.encode()
+        return sum(self.cells.count(needle, start, start + self.width) for start in self.row_starts())
+
+    def neighbor_table(self, offsets: Sequence[int], passable: str) -> List[Tuple[int, ...]]:
+        # for every index, the neighbours reachable through one of the offsets whose cell is passable,
+        # never a border cell, even one with a passable value
+        passable_values = set(passable.encode())
+        is_passable = bytearray(len(self.cells))
+        for start in self.row_starts():
+            is_passable[start:start + self.width] = bytes(c in passable_values for c in self.cells[start:start + self.width])
+
+        table = [()] * len(self.cells)
+        for idx in self.indexes():
+            if not is_passable[idx]: continue
+            table[idx] = tuple(idx + o for o in offsets if is_passable[idx + o])
+        return table
+
+    def copy(self):
+        return Grid(self.width, self.height, bytearray(self.cells), self.border)
+
+    def to_lines(self) -> List[str]:
+        return [self.row(y).decode("latin-1") for y in range(self.height)]
+
+def parse_grid(lines: List[str], border: int = BORDER, translate: bytes = None) -> Grid:
+    width, height = len(lines[0]), len(lines)
+    stride = width + 2
+    border_char = bytes([border])
+
+    cells = bytearray(border_char * stride)
+    for line in lines:
+        row = line.encode()
+        if translate is not None: row = row.translate(translate)
+        cells += border_char + row + border_char
+    cells += border_char * stride
+
+    return Grid(width, height, cells, border)
+
+# for the parsed input cache, see aoc.cache
+def grid_to_arrays(grid: Grid, prefix: str = "grid") -> Dict[str, array]:
+    return {f"{prefix}_shape": array("q", [grid.width, grid.height, grid.border]), f"{prefix}_cells": grid.cells}
+
+def grid_from_arrays(arrays: Dict[str, memoryview], prefix: str = "grid") -> Grid:
+    width, height, border = arrays[f"{prefix}_shape"]
+    return Grid(width, height, bytearray(arrays[f"{prefix}_cells"]), border)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+import ast
+import json
+import os
+
+from aoc.lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+
+# State for `run --incremental`. A day's fingerprint covers its solver source, every module of
+# this repository the solver imports, directly or through other modules, its input file and
+# whether it ran as the example. Imports are found by reading the import statements, nothing is
+# executed. Answers and phase times are stored under that fingerprint in one JSON file, and a day
+# whose fingerprint hasn't changed since is not run again.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STATE_FILE = os.path.join(ROOT_DIR, ".cache", "runs.json")
+FORMAT_VERSION = 1
+
+@dataclass
+class StoredRun:
+    fingerprint: str
+    part1: str
+    part2: str
+    # phase -> ns, from the run that produced the answers
+    time_ns: Dict[str, int]
+
+@dataclass
+class DayState:
+    key: str
+    fingerprint: str
+    # None when the day has to run: never stored, or its fingerprint changed
+    unchanged: StoredRun = None
+
+def module_path(name: str) -> str:
+    # the file a module of this repository is loaded from, None for anything else
+    base = os.path.join(ROOT_DIR, *name.split("."))
+    for path in [base + ".py", os.path.join(base, "__init__.py")]:
+        if os.path.isfile(path): return path
+    return None
+
+def imported_names(path: str) -> List[str]:
+    with open(path, "rb") as file:
+        tree = ast.parse(file.read(), path)
+
+    names = []
+    # ast.walk also finds imports inside functions
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            # `from aoc import grid` imports a module, `from aoc.grid import Grid` only a name
+            names.append(node.module)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+def source_dependencies(path: str) -> List[str]:
+    # importing a.b.c runs a/__init__.py and a/b/__init__.py too
+    seen = {path}
+    pending = [path]
+    while len(pending) > 0:
+        for name in imported_names(pending.pop()):
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                dependency = module_path(".".join(parts[:i]))
+                if dependency is not None and dependency not in seen:
+                    seen.add(dependency)
+                    pending.append(dependency)
+    return sorted(seen)
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def fingerprint(solver_path: str, input_path: str, example: bool) -> str:
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{example}\n".encode())
+    for path in source_dependencies(solver_path):
+        digest.update(f"{os.path.relpath(path, ROOT_DIR)}:{file_digest(path)}\n".encode())
+    digest.update(f"input:{file_digest(input_path)}\n".encode())
+    return digest.hexdigest()[:32]
+
+def run_key(day_name: str, input_path: str, example: bool) -> str:
+    # one stored run per day and input file, the latest one
+    return f"{day_name}{' example' if example else ''}:{os.path.abspath(input_path)}"
+
+def read_runs(path: str) -> Dict[str, StoredRun]:
+    if not os.path.exists(path): return {}
+    try:
+        with open(path) as file:
+            data = json.load(file)
+        if data["version"] != FORMAT_VERSION: return {}
+        return {key: StoredRun(**run) for key, run in data["runs"].items()}
+    except (ValueError, KeyError, TypeError):
+        return {} # unreadable, every day runs again and the file gets rewritten
+
+def write_runs(path: str, runs: Dict[str, StoredRun]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file:
+        json.dump({"version": FORMAT_VERSION, "runs": {key: asdict(run) for key, run in runs.items()}}, file, indent=1)
+    os.replace(tmp_path, path)
+
+def day_state(runs: Dict[str, StoredRun], day_name: str, solver_path: str, input_path: str, example: bool) -> DayState:
+    state = DayState(run_key(day_name, input_path, example), fingerprint(solver_path, input_path, example))
+    stored = runs.get(state.key)
+    if stored is not None and stored.fingerprint == state.fingerprint: state.unchanged = stored
+    return state
+
+def store_run(runs: Dict[str, StoredRun], state: DayState, part1: object, part2: object, time_ns: Dict[str, int]):
+    # answers are kept as printed
+    runs[state.key] = StoredRun(state.fingerprint, str(part1), str(part2), dict(time_ns))
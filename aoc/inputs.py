@@ -0,0 +1,67 @@
+from typing import Any, Callable, Iterable, Iterator, List, Union
+import os
+
+from aoc.lazy import lazy_import
+
+mmap = lazy_import("mmap")
+
+# Lazy readers for parse_input. They yield one line, block or item at a time, so a parser never
+# holds the whole text, or a second stripped copy of it, next to what it builds. Lines come
+# without their line ending.
+#
+# A day whose parts fold over the input one item at a time can return a StreamedInput from
+# parse_input instead of a list. Every iteration reads the file again, so both parts run in
+# constant memory however big the input is, and the parse phase only opens the file lazily.
+# Such a day has no parse cache codec: encoding the input would read all of it into arrays.
+
+# every chunk becomes a list of items, keep that small
+READ_CHUNK_SIZE = 1 << 15
+
+class StreamedInput:
+    def __init__(self, read: Callable[[], Iterator[Any]]):
+        self.read = read
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.read())
+
+def iter_lines(path: str, binary: bool = False) -> Iterator[Union[str, bytes]]:
+    line_end = b"\r\n" if binary else "\r\n"
+    with open(path, "rb" if binary else "r") as file:
+        for line in file:
+            yield line.rstrip(line_end)
+
+def iter_mapped_lines(path: str) -> Iterator[bytes]:
+    # bytes lines sliced out of a read-only mmap of the file, the OS pages it in and out as needed
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0: return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start, size = 0, len(mapped)
+            while start < size:
+                end = mapped.find(b"\n", start)
+                if end < 0: end = size
+                yield mapped[start:end].rstrip(b"\r")
+                start = end + 1
+
+def split_blocks(lines: Iterable[str]) -> Iterator[List[str]]:
+    # groups of lines separated by blank lines
+    block = []
+    for line in lines:
+        if len(line) > 0:
+            block.append(line)
+        elif len(block) > 0:
+            yield block
+            block = []
+    if len(block) > 0: yield block
+
+def iter_blocks(path: str) -> Iterator[List[str]]:
+    return split_blocks(iter_lines(path))
+
+def iter_separated(path: str, separator: str = ",") -> Iterator[str]:
+    # the items of a file that is one long separated list, read in chunks. Line breaks are dropped.
+    with open(path, "r") as file:
+        rest = ""
+        while chunk := file.read(READ_CHUNK_SIZE):
+            items = (rest + chunk.replace("\n", "")).split(separator)
+            rest = items.pop()
+            yield from items
+        if len(rest) > 0: yield rest
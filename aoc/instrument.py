@@ -0,0 +1,235 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+import io
+import os
+import sys
+import threading
+import time
+
+from aoc import metrics
+from aoc.lazy import lazy_import
+
+cProfile = lazy_import("cProfile")
+pstats = lazy_import("pstats")
+tracemalloc = lazy_import("tracemalloc")
+
+PHASES = ["parse", "part1", "part2"]
+PROFILERS = ["cprofile", "sample"]
+DEFAULT_SAMPLE_INTERVAL_S = 0.001
+# the profile.disable() call at the end of a phase is recorded as a call of its own
+PROFILER_DISABLE_NAME = "<method 'disable' of '_lsprof.Profiler' objects>"
+# a new allocation snapshot is taken whenever traced memory grows this much past the last one
+SNAPSHOT_GROWTH = 1.25
+MIN_SNAPSHOT_BYTES = 64 * 1024
+
+@dataclass
+class PhaseRun:
+    phase: str
+    result: Any
+    time_ns: int
+    # "outer;inner;leaf" stack -> microseconds (cprofile) or samples (sample), when profiled
+    collapsed: Dict[str, int] = None
+    stats: "pstats.Stats" = None
+    # allocations made during the phase, when memory was traced
+    peak_bytes: int = None
+    top_allocations: List["tracemalloc.Statistic"] = None
+    # what the solver recorded with aoc.metrics during the phase
+    metrics: Dict[str, Dict[str, Any]] = None
+
+def format_ns(ns: int) -> str:
+    if ns >= 1_000_000_000: return f"{ns / 1_000_000_000:.3f}s"
+    if ns >= 1_000_000: return f"{ns / 1_000_000:.3f}ms"
+    if ns >= 1_000: return f"{ns / 1_000:.1f}us"
+    return f"{ns}ns"
+
+def parse_phases(arg: str) -> List[str]:
+    if arg is None: return []
+    phases = PHASES if arg == "all" else arg.split(",")
+    for phase in phases:
+        if phase not in PHASES: raise ValueError(f"invalid phase: {phase}")
+    return phases
+
+def frame_name(filename: str, lineno: int, func_name: str) -> str:
+    if filename == "~": return func_name # builtins
+    return f"{func_name} ({os.path.basename(filename)}:{lineno})"
+
+class StackSampler:
+    # samples the calling thread's stack from a background thread. The sampler only gets the GIL
+    # at the interpreter's switch interval, so the real sampling rate can be below 1 / interval_s.
+    def __init__(self, interval_s: float = DEFAULT_SAMPLE_INTERVAL_S):
+        self.interval_s = interval_s
+        self.samples = defaultdict(int)
+
+    def _sample(self):
+        while not self.stop_event.wait(self.interval_s):
+            frame = sys._current_frames().get(self.target_id)
+            stack = []
+            # only frames below profile_phase belong to the phase
+            while frame is not None and frame.f_code is not profile_phase.__code__:
+                code = frame.f_code
+                stack.append(frame_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            if stack: self.samples[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self.target_id = threading.get_ident()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+
+def collapse_profile(stats: "pstats.Stats") -> Dict[str, int]:
+    # cProfile only records caller -> callee edges, not whole stacks, so a function's time is split
+    # between its callers in proportion to the time each edge accounts for. Recursive calls are folded
+    # into the outermost call.
+    raw = stats.stats
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees[caller].append((func, edge_ct))
+
+    collapsed = defaultdict(int)
+    def walk(func, stack, on_stack, share):
+        _, _, tt, _, _ = raw[func]
+        stack = stack + [frame_name(*func)]
+        self_us = int(tt * share * 1_000_000)
+        if self_us > 0: collapsed[";".join(stack)] += self_us
+
+        for callee, edge_ct in callees[func]:
+            callee_ct = raw[callee][3]
+            if callee in on_stack or callee_ct <= 0: continue
+            walk(callee, stack, on_stack | {callee}, share * min(1.0, edge_ct / callee_ct))
+
+    for func, (_, _, _, _, callers) in raw.items():
+        if len(callers) > 0 or func[2] == PROFILER_DISABLE_NAME: continue
+        walk(func, [], {func}, 1.0)
+    return dict(collapsed)
+
+class MemoryTracer:
+    # traces allocations with tracemalloc. Whatever a phase frees before returning is gone from a
+    # snapshot taken at the end, so a background thread also snapshots whenever traced memory
+    # reaches a new high, and the allocation sites are read from the snapshot closest to the peak.
+    def __init__(self, interval_s: float = DEFAULT_SAMPLE_INTERVAL_S):
+        self.interval_s = interval_s
+        self.snapshot = None
+        self.snapshot_bytes = 0
+
+    def _take_snapshot(self, current_bytes: int):
+        self.snapshot = tracemalloc.take_snapshot()
+        self.snapshot_bytes = current_bytes
+
+    def _watch(self):
+        while not self.stop_event.wait(self.interval_s):
+            current_bytes, _ = tracemalloc.get_traced_memory()
+            if current_bytes >= max(MIN_SNAPSHOT_BYTES, self.snapshot_bytes * SNAPSHOT_GROWTH):
+                self._take_snapshot(current_bytes)
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        current_bytes, self.peak_bytes = tracemalloc.get_traced_memory()
+        if current_bytes >= self.snapshot_bytes:
+            self._take_snapshot(current_bytes)
+        tracemalloc.stop()
+
+    def top_allocations(self, count: int = 10) -> List["tracemalloc.Statistic"]:
+        snapshot = self.snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        return snapshot.statistics("lineno")[:count]
+
+def format_bytes(size: int) -> str:
+    if size >= 1024 * 1024: return f"{size / (1024 * 1024):.1f}MiB"
+    if size >= 1024: return f"{size / 1024:.1f}KiB"
+    return f"{size}B"
+
+def run_phase(phase: str, func: Callable[[Any], Any], arg: Any, profiler: str = None, trace_memory: bool = False) -> PhaseRun:
+    metrics.collect() # left over from code that ran outside a phase
+    if trace_memory:
+        # timings of a memory traced phase include the tracemalloc overhead
+        with MemoryTracer() as tracer:
+            phase_run = profile_phase(phase, func, arg, profiler)
+        phase_run.peak_bytes = tracer.peak_bytes
+        phase_run.top_allocations = tracer.top_allocations()
+    else:
+        phase_run = profile_phase(phase, func, arg, profiler)
+    phase_run.metrics = metrics.collect()
+    return phase_run
+
+def profile_phase(phase: str, func: Callable[[Any], Any], arg: Any, profiler: str = None) -> PhaseRun:
+    match profiler:
+        case None:
+            start = time.perf_counter_ns()
+            result = func(arg)
+            return PhaseRun(phase, result, time.perf_counter_ns() - start)
+        case "cprofile":
+            profile = cProfile.Profile()
+            start = time.perf_counter_ns()
+            profile.enable()
+            result = func(arg)
+            profile.disable()
+            time_ns = time.perf_counter_ns() - start
+            stats = pstats.Stats(profile)
+            return PhaseRun(phase, result, time_ns, collapse_profile(stats), stats)
+        case "sample":
+            with StackSampler() as sampler:
+                start = time.perf_counter_ns()
+                result = func(arg)
+                time_ns = time.perf_counter_ns() - start
+            return PhaseRun(phase, result, time_ns, dict(sampler.samples))
+    raise ValueError(f"invalid profiler: {profiler}")
+
+def write_collapsed(path: str, collapsed: Dict[str, int]):
+    # one "frame;frame;frame count" line per stack, the input format of flamegraph.pl and speedscope
+    with open(path, "w") as file:
+        for stack, count in sorted(collapsed.items()):
+            file.write(f"{stack} {count}\n")
+
+def top_frames(phase_run: PhaseRun, count: int = 10) -> str:
+    if phase_run.stats is not None:
+        out = io.StringIO()
+        phase_run.stats.stream = out
+        phase_run.stats.sort_stats("tottime").print_stats(count)
+        return out.getvalue()
+
+    # self samples per leaf frame
+    leaf_samples = defaultdict(int)
+    for stack, samples in phase_run.collapsed.items():
+        leaf_samples[stack.rsplit(";", 1)[-1]] += samples
+    total = max(1, sum(leaf_samples.values()))
+    lines = [f"{samples:>8} {samples * 100 / total:5.1f}%  {frame}" for frame, samples in
+             sorted(leaf_samples.items(), key=lambda item: -item[1])[:count]]
+    return "\n".join(lines) + "\n"
+
+def short_path(path: str) -> str:
+    # every day has a solve.py, keep the directory name too
+    return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+
+def format_allocations(phase_run: PhaseRun) -> str:
+    lines = []
+    for stat in phase_run.top_allocations:
+        frame = stat.traceback[0]
+        lines.append(f"{format_bytes(stat.size):>10} {stat.count:>9} blocks  {short_path(frame.filename)}:{frame.lineno}")
+    return "".join(line + "\n" for line in lines)
+
+def save_profile(profile_dir: str, name: str, phase_run: PhaseRun) -> str:
+    os.makedirs(profile_dir, exist_ok=True)
+    base_path = os.path.join(profile_dir, f"{name}_{phase_run.phase}")
+    write_collapsed(base_path + ".collapsed", phase_run.collapsed)
+    if phase_run.stats is not None:
+        phase_run.stats.dump_stats(base_path + ".prof")
+    return base_path
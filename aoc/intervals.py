@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Tuple
+import functools
+import operator
+
+# Intervals are half open, [start, end). An IntervalSet keeps its intervals sorted, disjoint
+# and non-touching, so results of the set operations never grow past what they cover.
+
+@dataclass(slots=True, frozen=True)
+class IntervalSet:
+    intervals: Tuple[Tuple[int, int], ...] = ()
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.intervals)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def __bool__(self) -> bool:
+        return len(self.intervals) > 0
+
+    def min(self) -> int:
+        return self.intervals[0][0]
+
+    def max(self) -> int:
+        # last value in the set, inclusive
+        return self.intervals[-1][1] - 1
+
+    def size(self) -> int:
+        return sum(end - start for start, end in self.intervals)
+
+    def shift(self, delta: int) -> "IntervalSet":
+        return IntervalSet(tuple((start + delta, end + delta) for start, end in self.intervals))
+
+    def intersect(self, other: "IntervalSet") -> "IntervalSet":
+        result = []
+        a, b = self.intervals, other.intervals
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i][0], b[j][0])
+            end = min(a[i][1], b[j][1])
+            if start < end: result.append((start, end))
+            if a[i][1] < b[j][1]: i += 1
+            else: j += 1
+        return IntervalSet(tuple(result))
+
+    def subtract(self, other: "IntervalSet") -> "IntervalSet":
+        result = []
+        b = other.intervals
+        j = 0
+        for start, end in self.intervals:
+            while j < len(b) and b[j][1] <= start: j += 1
+            k = j
+            while k < len(b) and b[k][0] < end:
+                if b[k][0] > start: result.append((start, b[k][0]))
+                start = max(start, b[k][1])
+                k += 1
+            if start < end: result.append((start, end))
+        return IntervalSet(tuple(result))
+
+    def split_at(self, at: int) -> ("IntervalSet", "IntervalSet"):
+        # values below at, values at or above at
+        below, above = [], []
+        for start, end in self.intervals:
+            if end <= at: below.append((start, end))
+            elif start >= at: above.append((start, end))
+            else:
+                below.append((start, at))
+                above.append((at, end))
+        return IntervalSet(tuple(below)), IntervalSet(tuple(above))
+
+def interval_set(intervals: Iterable[Tuple[int, int]]) -> IntervalSet:
+    # sorts and merges any (start, end) pairs, empty ones are dropped
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(i for i in intervals if i[0] < i[1]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]: merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return IntervalSet(tuple(merged))
+
+def interval(start: int, end: int) -> IntervalSet:
+    return IntervalSet(((start, end),) if start < end else ())
+
+def union_all(sets: Iterable[IntervalSet]) -> IntervalSet:
+    return interval_set(i for s in sets for i in s.intervals)
+
+@dataclass(slots=True, frozen=True)
+class Box:
+    # one half open [start, end) interval per dimension
+    dims: Tuple[Tuple[int, int], ...]
+
+    def volume(self) -> int:
+        return functools.reduce(operator.mul, [end - start for start, end in self.dims], 1)
+
+    def with_dim(self, dim: int, start: int, end: int) -> "Box":
+        return Box(self.dims[:dim] + ((start, end),) + self.dims[dim + 1:])
+
+    def split_at(self, dim: int, at: int) -> ("Box", "Box"):
+        # the parts below and at or above at along dim, None where a part is empty
+        start, end = self.dims[dim]
+        if at <= start: return None, self
+        if at >= end: return self, None
+        return self.with_dim(dim, start, at), self.with_dim(dim, at, end)
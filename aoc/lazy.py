@@ -0,0 +1,24 @@
+from types import ModuleType
+import importlib.util
+import sys
+
+# Deferred imports for modules only some commands need (profilers, process pools, hashing), so that
+# they don't add to the startup time of every run. The module is executed on the first attribute
+# access, its parent packages are imported right away. Anything evaluated at import time, like
+# annotations, must not touch a lazy module, so annotate with strings there.
+
+def lazy_import(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None: return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None: raise ModuleNotFoundError(f"no module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    # a regular import also binds the submodule on its parent package, code like asyncio relies on it
+    parent_name, _, child_name = name.rpartition(".")
+    if parent_name: setattr(sys.modules[parent_name], child_name, module)
+    return module
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List
+import os
+import sys
+
+from aoc import instrument
+from aoc.lazy import lazy_import
+
+hashlib = lazy_import("hashlib")
+pickle = lazy_import("pickle")
+
+# Memo tables for solvers. table() returns a dict with a name, and while stats are being collected
+# every lookup with get counts as a hit or a miss under that name. Tables created under the same
+# name, like day12's one per row, add up. A table with a maxsize drops its least recently used
+# entries to stay within it. A table given a persist key is read from and written back to
+# .cache/memo/ while persistence is enabled, so its entries outlive the run. The key has to change
+# whenever the stored results would, a digest of the input the results depend on usually.
+#
+# Tables are closed when the solver is done with them, which records their size and writes
+# persistent ones. `with memo.table(...) as results:` does that.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PERSIST_DIR = os.path.join(ROOT_DIR, ".cache", "memo")
+FORMAT_VERSION = 1
+
+# sentinel for lookups, stored values can be None
+MISSING = object()
+
+@dataclass
+class MemoStats:
+    name: str
+    maxsize: int = None
+    # tables created under this name
+    tables: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # entries read from persisted tables
+    loaded: int = 0
+    # of the largest closed table
+    peak_entries: int = 0
+    peak_bytes: int = None
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+# name -> counters of every table created under that name since the last reset_stats
+_stats: Dict[str, MemoStats] = {}
+# None while persistence is disabled
+_persist_dir: str = None
+# counting lookups makes a cheap recursion like day12's half again slower, so only when asked to
+_collect_stats = False
+
+class Table:
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        stats = self.stats
+        stats.peak_entries = max(stats.peak_entries, len(self))
+        if _collect_stats: stats.peak_bytes = max(stats.peak_bytes or 0, table_bytes(self))
+        if self.path is not None:
+            write_table(self.path, self)
+            self.path = None
+
+class Memo(Table, dict):
+    # unbounded and not counting, lookups are the dict's own
+    __slots__ = ["stats", "path"]
+
+class CountedMemo(Memo):
+    __slots__ = []
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = dict.get(self, key, MISSING)
+        if value is MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        return value
+
+class LruMemo(Table, OrderedDict):
+    # dicts keep insertion order too, but popping their first key gets slower the more were removed before it
+    __slots__ = ["stats", "path", "maxsize"]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = OrderedDict.get(self, key, MISSING)
+        if value is MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        OrderedDict.__setitem__(self, key, value)
+        # replacing a value counts as using it
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+            self.stats.evictions += 1
+
+def table(name: str, maxsize: int = None, persist_key: str = None) -> Table:
+    stats = _stats.get(name)
+    if stats is None: stats = _stats[name] = MemoStats(name, maxsize)
+    stats.tables += 1
+
+    if maxsize is not None:
+        result = LruMemo()
+        result.maxsize = maxsize
+    else:
+        result = CountedMemo() if _collect_stats else Memo()
+    result.stats = stats
+    result.path = None
+
+    if persist_key is not None and _persist_dir is not None:
+        result.path = os.path.join(_persist_dir, f"{name.replace(' ', '_')}-{persist_key}.pickle")
+        result.update(read_table(result.path))
+        stats.loaded += len(result)
+    return result
+
+def table_bytes(data: Dict) -> int:
+    # the table, its keys and its values, but not what those refer to in turn
+    return sys.getsizeof(data) + sum(sys.getsizeof(key) + sys.getsizeof(value) for key, value in data.items())
+
+def digest(*parts: Any) -> str:
+    # a persist key for tables whose results depend on these
+    hasher = hashlib.sha256(f"{FORMAT_VERSION}".encode())
+    for part in parts:
+        hasher.update(part if isinstance(part, (bytes, bytearray)) else repr(part).encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()[:32]
+
+def read_table(path: str) -> Dict:
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return {} # unreadable, the table starts empty and the file gets rewritten
+
+def write_table(path: str, data: Dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        pickle.dump(dict(data), file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def enable_persistence(persist_dir: str = DEFAULT_PERSIST_DIR):
+    global _persist_dir
+    _persist_dir = persist_dir
+
+def collect_stats(enabled: bool = True):
+    # for the tables created from now on, their sizes are summed up when they close
+    global _collect_stats
+    _collect_stats = enabled
+
+def stats() -> List[MemoStats]:
+    return list(_stats.values())
+
+def reset_stats():
+    _stats.clear()
+
+def format_stats(stats: MemoStats) -> str:
+    line = (f"{stats.name}: {stats.hit_rate:.1%} hits ({stats.hits} hits, {stats.misses} misses), "
+            f"{stats.tables} table{'s' if stats.tables != 1 else ''}, largest {stats.peak_entries} entries")
+    if stats.peak_bytes is not None: line += f" ~{instrument.format_bytes(stats.peak_bytes)}"
+    if stats.maxsize is not None: line += f", max {stats.maxsize}, {stats.evictions} evicted"
+    if stats.loaded > 0: line += f", {stats.loaded} loaded from disk"
+    return line
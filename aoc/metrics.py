@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+# Work counters for the hot loops of solvers, so a change can be judged by how much work it does
+# and not only by how long it took. A solver adds its counts up in local variables, or takes the
+# ones a search from aoc.search keeps, and records them once per search, never per iteration, so
+# recording is cheap enough to always be on. instrument.run_phase collects what each phase
+# recorded, and `run --metrics` writes it out as JSON.
+#
+# Counters recorded under the same name and key add up over a phase, samples are kept in order.
+
+# name -> key -> count, or list of samples
+_recorded: Dict[str, Dict[str, Any]] = {}
+
+def count(name: str, **counts: int):
+    recorded = _recorded.setdefault(name, {})
+    for key, value in counts.items():
+        recorded[key] = recorded.get(key, 0) + value
+
+def sample(name: str, key: str, value: Any):
+    _recorded.setdefault(name, {}).setdefault(key, []).append(value)
+
+def collect() -> Dict[str, Dict[str, Any]]:
+    # everything recorded since the last collect
+    global _recorded
+    recorded, _recorded = _recorded, {}
+    return recorded
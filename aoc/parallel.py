@@ -0,0 +1,154 @@
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+import io
+import os
+import time
+import traceback
+
+from aoc import bench, instrument
+from aoc.lazy import lazy_import
+from aoc.runner import load_solver
+
+futures = lazy_import("concurrent.futures")
+sharedmap = lazy_import("aoc.sharedmap")
+incremental = lazy_import("aoc.incremental")
+
+# Runs the calendar across a process pool. A job is a whole day, or a single part of a day: every
+# job parses its own input in its own process, so the parts of a day never share state and can
+# run side by side. Jobs are started longest expected first (LPT scheduling) using the medians
+# from a bench results file, so the slowest days don't end up starting last.
+
+DEFAULT_HISTORY_FILE = bench.DEFAULT_OUTPUT_FILE
+PARTS = ["part1", "part2"]
+
+@dataclass
+class Job:
+    day: int
+    parts: Tuple[str, ...]
+    # None when there is no history for the day
+    expected_ns: int = None
+
+    @property
+    def name(self) -> str:
+        return f"day{self.day:02}" + ("" if len(self.parts) == len(PARTS) else f" {self.parts[0]}")
+
+@dataclass
+class JobResult:
+    job: Job
+    answers: Dict[str, Any] = field(default_factory=dict)
+    time_ns: Dict[str, int] = field(default_factory=dict)
+    error: str = None
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.time_ns.values())
+
+def read_history(path: str) -> Dict[int, Dict[str, int]]:
+    # day -> phase -> median ns, empty if there is no usable bench results file
+    if path is None or not os.path.exists(path): return {}
+    try:
+        results = bench.read_results(path)
+    except (ValueError, KeyError, TypeError):
+        return {}
+    return {r.day: {phase: s.median_ns for phase, s in r.phases.items()} for r in results}
+
+def plan_jobs(days: List[int], history: Dict[int, Dict[str, int]]) -> List[Job]:
+    jobs = []
+    for day in days:
+        medians = history.get(day)
+        if medians is None or any(phase not in medians for phase in instrument.PHASES):
+            jobs.append(Job(day, tuple(PARTS)))
+            continue
+        # splitting costs one more parse, worth it when both parts take longer than that
+        if min(medians[part] for part in PARTS) > medians["parse"]:
+            jobs.extend(Job(day, (part,), medians["parse"] + medians[part]) for part in PARTS)
+        else:
+            jobs.append(Job(day, tuple(PARTS), sum(medians[phase] for phase in instrument.PHASES)))
+
+    # unknown jobs first, they may well be the longest
+    return sorted(jobs, key=lambda job: -1 if job.expected_ns is None else -job.expected_ns)
+
+def run_job(job: Job, input_path: str, example: bool, use_cache: bool) -> JobResult:
+    result = JobResult(job)
+    try:
+        solver = load_solver(job.day, use_cache)
+        solver.set_example(example)
+        # solvers print debug output and progress bars, keep them from interleaving with other jobs
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            parse = instrument.run_phase("parse", solver.parse, input_path or solver.input_path(example))
+            result.time_ns["parse"] = parse.time_ns
+            for part in job.parts:
+                phase_run = instrument.run_phase(part, getattr(solver, part), parse.result)
+                result.answers[part] = phase_run.result
+                result.time_ns[part] = phase_run.time_ns
+    except Exception:
+        result.error = traceback.format_exc()
+    return result
+
+def day_states(days: List[int], runs: Dict[str, "incremental.StoredRun"], input_path: str,
+                   example: bool) -> Dict[int, "incremental.DayState"]:
+    states = {}
+    for day in days:
+        solver = load_solver(day)
+        states[day] = incremental.day_state(runs, solver.name, solver.module.__file__, input_path or solver.input_path(example), example)
+    return states
+
+def run_days(days: List[int], jobs: int, input_path: str = None, example: bool = False, use_cache: bool = True,
+             history_path: str = DEFAULT_HISTORY_FILE, incremental_state: str = None) -> bool:
+    if input_path is not None and len(days) != 1:
+        raise ValueError("--input can only be used with a single day")
+
+    answers_by_day = {day: {} for day in days}
+    runs, states = None, {}
+    if incremental_state is not None:
+        runs = incremental.read_runs(incremental_state)
+        states = day_states(days, runs, input_path, example)
+        for day, state in states.items():
+            if state.unchanged is None: continue
+            answers_by_day[day] = {"part1": state.unchanged.part1, "part2": state.unchanged.part2}
+            print(f"day{day:02} unchanged, not run", flush=True)
+
+    planned = plan_jobs([day for day in days if len(answers_by_day[day]) == 0], read_history(history_path))
+    start = time.perf_counter_ns()
+    results = []
+    # a job's own parallel maps run inline, the pool already has a process per CPU it may use
+    with futures.ProcessPoolExecutor(max_workers=jobs, initializer=sharedmap.set_default_jobs, initargs=(1,)) as pool:
+        submitted = [pool.submit(run_job, job, input_path, example, use_cache) for job in planned]
+        for future in futures.as_completed(submitted):
+            result = future.result()
+            status = "failed" if result.error is not None else instrument.format_ns(result.total_ns)
+            print(f"{result.job.name} done: {status}", flush=True)
+            results.append(result)
+    wall_ns = time.perf_counter_ns() - start
+
+    time_ns_by_day = {day: {} for day in days}
+    for result in results:
+        answers_by_day[result.job.day].update(result.answers)
+        # a split day parsed once per job, keep the slower parse
+        for phase, time_ns in result.time_ns.items():
+            time_ns_by_day[result.job.day][phase] = max(time_ns, time_ns_by_day[result.job.day].get(phase, 0))
+    for day, answers in answers_by_day.items():
+        for part in PARTS:
+            if part in answers: print(f"day{day:02} {part}: {answers[part]}")
+
+    failed = [result for result in results if result.error is not None]
+    for result in failed:
+        print(f"{result.job.name} failed:\n{result.error}", end="")
+
+    if runs is not None:
+        for day, state in states.items():
+            # days with a failed job have no answer for that part and run again next time
+            if state.unchanged is not None or any(part not in answers_by_day[day] for part in PARTS): continue
+            incremental.store_run(runs, state, answers_by_day[day]["part1"], answers_by_day[day]["part2"], time_ns_by_day[day])
+        incremental.write_runs(incremental_state, runs)
+
+    if len(results) == 0:
+        print("wall time: nothing to run, every day is unchanged")
+        return True
+    cpu_ns = sum(result.total_ns for result in results)
+    slowest = max(results, key=lambda result: result.total_ns)
+    print(f"wall time: {timedelta(microseconds=wall_ns // 1000)}  (sum of jobs {instrument.format_ns(cpu_ns)}, "
+          f"slowest {slowest.job.name} {instrument.format_ns(slowest.total_ns)}, {jobs} processes)")
+    return len(failed) == 0
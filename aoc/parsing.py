@@ -0,0 +1,58 @@
+from array import array
+from typing import List, Tuple, Union
+import re
+
+# Bulk integer extraction for parsers. Every function takes a line, a block or a whole file's
+# text, as str or bytes, and finds all the numbers in it in one pass: everything that can't be part
+# of a number is translated to a space, and the rest is split and converted by int() in C. Only when
+# that leaves a '-' that isn't a sign ("seed-to-soil", "1-3") does it fall back to a regex.
+# A '-' directly in front of digits is read as a sign, so "1-3" is 1 and -3; pass signed=False to
+# ignore signs. Numbers have to fit in a signed 64-bit int.
+
+Text = Union[str, bytes]
+
+INT_RE = re.compile(r"-?\d+")
+UNSIGNED_INT_RE = re.compile(r"\d+")
+INT_BYTES_RE = re.compile(rb"-?\d+")
+UNSIGNED_INT_BYTES_RE = re.compile(rb"\d+")
+def number_chars_table(keep: str) -> (dict, bytes):
+    # str.translate leaves characters missing from the table alone, non-ASCII ones end up in the regex path
+    str_table = {c: " " for c in range(128) if chr(c) not in keep}
+    bytes_table = bytes(c if chr(c) in keep else ord(" ") for c in range(256))
+    return str_table, bytes_table
+
+INT_TABLES = number_chars_table("-0123456789")
+UNSIGNED_INT_TABLES = number_chars_table("0123456789")
+# also keeps the characters str.splitlines breaks lines at
+LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e"
+INT_LINE_TABLES = number_chars_table("-0123456789" + LINE_BREAKS)
+UNSIGNED_INT_LINE_TABLES = number_chars_table("0123456789" + LINE_BREAKS)
+
+def int_pattern(text: Text, signed: bool) -> re.Pattern:
+    if isinstance(text, str): return INT_RE if signed else UNSIGNED_INT_RE
+    return INT_BYTES_RE if signed else UNSIGNED_INT_BYTES_RE
+
+def ints(text: Text, signed: bool = True) -> array:
+    # int() takes str and bytes alike, so nothing gets decoded
+    str_table, bytes_table = INT_TABLES if signed else UNSIGNED_INT_TABLES
+    try:
+        return array('q', map(int, text.translate(str_table if isinstance(text, str) else bytes_table).split()))
+    except ValueError:
+        return array('q', map(int, int_pattern(text, signed).findall(text)))
+
+def int_records(text: Text, width: int, signed: bool = True) -> List[Tuple[int, ...]]:
+    # for inputs made of fixed-size records, like "x,y,z~x,y,z" per line: every width numbers,
+    # in order, make one record
+    values = ints(text, signed)
+    if len(values) % width != 0:
+        raise ValueError(f"{len(values)} numbers don't split into records of {width}")
+    return list(zip(*[iter(values)] * width))
+
+def ints_per_line(text: Text, signed: bool = True) -> List[array]:
+    # one translate over the whole text instead of one per line
+    str_table, bytes_table = INT_LINE_TABLES if signed else UNSIGNED_INT_LINE_TABLES
+    try:
+        translated = text.translate(str_table if isinstance(text, str) else bytes_table)
+        return [array('q', map(int, line.split())) for line in translated.splitlines()]
+    except ValueError:
+        return [ints(line, signed) for line in text.splitlines()]
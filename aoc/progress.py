@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+import sys
+import time
+
+# Progress reporting for long solver loops. When stderr is not a terminal, or while progress is
+# disabled (bench does that), track() hands back the iterable itself, so a tracked loop runs
+# exactly like an untracked one. Otherwise the clock is only read every `stride` items, with the
+# stride doubling for as long as the loop is faster than the redraw interval.
+
+REDRAW_INTERVAL_S = 0.2
+MAX_STRIDE = 1 << 16
+
+T = TypeVar("T")
+
+_disabled_depth = 0
+
+@contextmanager
+def disabled():
+    global _disabled_depth
+    _disabled_depth += 1
+    try:
+        yield
+    finally:
+        _disabled_depth -= 1
+
+def is_enabled() -> bool:
+    return _disabled_depth == 0 and sys.stderr.isatty()
+
+def format_line(desc: str, count: int, total: int, elapsed_s: float) -> str:
+    rate = f"{count / elapsed_s:.0f}/s" if elapsed_s > 0 else "?/s"
+    prefix = f"{desc}: " if desc else ""
+    if total is None: return f"{prefix}{count} [{elapsed_s:.1f}s, {rate}]"
+    return f"{prefix}{count}/{total} {count * 100 // max(1, total):3}% [{elapsed_s:.1f}s, {rate}]"
+
+def _track(iterable: Iterable[T], total: int, desc: str) -> Iterator[T]:
+    start = last_draw = time.monotonic()
+    drawn = False
+    count = 0
+    next_check = stride = 1
+    for item in iterable:
+        yield item
+        count += 1
+        if count < next_check: continue
+
+        now = time.monotonic()
+        if now - last_draw >= REDRAW_INTERVAL_S:
+            sys.stderr.write("\r" + format_line(desc, count, total, now - start))
+            sys.stderr.flush()
+            last_draw = now
+            drawn = True
+        elif stride < MAX_STRIDE:
+            stride *= 2
+        next_check = count + stride
+
+    # loops that finish before the first redraw leave nothing behind
+    if drawn:
+        sys.stderr.write("\r" + format_line(desc, count, total, time.monotonic() - start) + "\n")
+        sys.stderr.flush()
+
+def track(iterable: Iterable[T], total: int = None, desc: str = None) -> Iterable[T]:
+    if not is_enabled(): return iterable
+    if total is None and hasattr(iterable, "__len__"): total = len(iterable)
+    return _track(iterable, total, desc)
@@ -0,0 +1,231 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+import traceback
+
+from aoc import cache, instrument
+from aoc.lazy import lazy_import
+
+incremental = lazy_import("aoc.incremental")
+memo = lazy_import("aoc.memo")
+multiprocessing = lazy_import("multiprocessing")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROFILE_DIR = os.path.join(ROOT_DIR, "profiles")
+ALL_DAYS = list(range(1, 26))
+SOLVER_MODULE_NAMES = ["solve", "prob"]
+
+@dataclass
+class Solver:
+    day: int
+    module: ModuleType
+    parse: Callable[[str], Any]
+    part1: Callable[[Any], Any]
+    part2: Callable[[Any], Any]
+    parse_text: Callable[[str], Any] = None
+
+    @property
+    def name(self) -> str:
+        return f"day{self.day:02}"
+
+    @property
+    def dir(self) -> str:
+        return os.path.join(ROOT_DIR, self.name)
+
+    def input_path(self, example: bool = False) -> str:
+        return os.path.join(self.dir, self.module.EXAMPLE_FILE if example else "input.txt")
+
+    def set_example(self, example: bool):
+        # a few days pick different puzzle constants for the example input
+        self.module.IS_EXAMPLE = example
+
+    def solve(self, text: str) -> (Any, Any):
+        # no files and no parse cache, the input text is all it reads besides IS_EXAMPLE
+        input_data = self.parse_text(text)
+        return self.part1(input_data), self.part2(input_data)
+
+@dataclass
+class RunResult:
+    day: int
+    part1: Any
+    part2: Any
+    phases: Dict[str, instrument.PhaseRun] = field(default_factory=dict)
+    # wall time of running part1 and part2 at the same time in two processes, fork included
+    concurrent_parts_ns: int = None
+    # answers and times were taken from the last run of an unchanged day, see aoc.incremental
+    unchanged: bool = False
+
+    @property
+    def time_ns(self) -> int:
+        if self.concurrent_parts_ns is not None:
+            return self.phases["parse"].time_ns + self.concurrent_parts_ns
+        return sum(phase.time_ns for phase in self.phases.values())
+
+def day_dir_name(day: int) -> str:
+    return f"day{day:02}"
+
+def find_solver_path(day: int) -> str:
+    for module_name in SOLVER_MODULE_NAMES:
+        path = os.path.join(ROOT_DIR, day_dir_name(day), f"{module_name}.py")
+        if os.path.exists(path): return path
+    raise FileNotFoundError(f"no solver found for day {day}")
+
+def load_solver(day: int, use_cache: bool = False) -> Solver:
+    module_name = os.path.splitext(os.path.basename(find_solver_path(day)))[0]
+    module = importlib.import_module(f"{day_dir_name(day)}.{module_name}")
+    parse = module.parse_input
+    if use_cache and cache.supports_cache(module):
+        parse = functools.partial(cache.cached_parse, module)
+    return Solver(day, module, parse=parse, part1=module.do_part1, part2=module.do_part2, parse_text=module.parse_text)
+
+def parse_days(day_args: List[str]) -> List[int]:
+    days = []
+    for arg in day_args:
+        for item in arg.split(","):
+            if item == "all":
+                days.extend(ALL_DAYS)
+            elif "-" in item:
+                first, last = item.split("-")
+                days.extend(range(int(first), int(last) + 1))
+            else:
+                days.append(int(item.removeprefix("day")))
+
+    for day in days:
+        if day not in ALL_DAYS: raise ValueError(f"invalid day: {day}")
+    return list(dict.fromkeys(days))
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+def run_part_in_child(connection, part: str, func: Callable[[Any], Any], input_data: Any, trace_memory: bool):
+    try:
+        connection.send((instrument.run_phase(part, func, input_data, trace_memory=trace_memory), None))
+    except Exception:
+        connection.send((None, traceback.format_exc()))
+    finally:
+        connection.close()
+
+def run_parts_concurrently(solver: Solver, input_data: Any, trace_memory: bool = False) -> (instrument.PhaseRun, instrument.PhaseRun):
+    # part2 runs in a forked child, which sees the parsed input without it being copied or pickled,
+    # while part1 runs here. Only part2's PhaseRun is sent back.
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    child = context.Process(target=run_part_in_child, args=(sender, "part2", solver.part2, input_data, trace_memory))
+    # the child would print whatever is still buffered a second time
+    sys.stdout.flush()
+    sys.stderr.flush()
+    child.start()
+    sender.close()
+    try:
+        part1 = instrument.run_phase("part1", solver.part1, input_data, trace_memory=trace_memory)
+        part2, error = receiver.recv()
+    finally:
+        child.join()
+    if error is not None: raise RuntimeError(f"{solver.name} part2 failed in the worker process:\n{error}")
+    return part1, part2
+
+def run_solver(solver: Solver, input_path: str, profile_phases: List[str] = (), profiler: str = "cprofile", trace_memory: bool = False,
+               concurrent_parts: bool = False) -> RunResult:
+    profiler_for = lambda phase: profiler if phase in profile_phases else None
+    parse = instrument.run_phase("parse", solver.parse, input_path, profiler_for("parse"), trace_memory)
+    if concurrent_parts and can_fork():
+        start = time.perf_counter_ns()
+        part1, part2 = run_parts_concurrently(solver, parse.result, trace_memory)
+        parts_ns = time.perf_counter_ns() - start
+        return RunResult(solver.day, part1.result, part2.result, {p.phase: p for p in [parse, part1, part2]}, parts_ns)
+
+    part1 = instrument.run_phase("part1", solver.part1, parse.result, profiler_for("part1"), trace_memory)
+    part2 = instrument.run_phase("part2", solver.part2, parse.result, profiler_for("part2"), trace_memory)
+    return RunResult(solver.day, part1.result, part2.result, {p.phase: p for p in [parse, part1, part2]})
+
+def unchanged_result(day: int, stored: "incremental.StoredRun") -> RunResult:
+    phases = {phase: instrument.PhaseRun(phase, None, time_ns) for phase, time_ns in stored.time_ns.items()}
+    return RunResult(day, stored.part1, stored.part2, phases, unchanged=True)
+
+def print_profiles(solver: Solver, result: RunResult, profile_dir: str):
+    for phase_run in result.phases.values():
+        if phase_run.collapsed is None: continue
+        base_path = instrument.save_profile(profile_dir, solver.name, phase_run)
+        print(f"{solver.name} {phase_run.phase} profile: {base_path}.collapsed")
+        print(instrument.top_frames(phase_run), end="")
+
+def print_memory(solver: Solver, result: RunResult):
+    for phase_run in result.phases.values():
+        if phase_run.peak_bytes is None: continue
+        print(f"{solver.name} {phase_run.phase} peak memory: {instrument.format_bytes(phase_run.peak_bytes)}")
+        print(instrument.format_allocations(phase_run), end="")
+
+def format_metric_value(value: Any) -> str:
+    return f"{len(value)} samples" if isinstance(value, list) else str(value)
+
+def print_metrics(solver: Solver, result: RunResult):
+    for phase_run in result.phases.values():
+        for name, values in (phase_run.metrics or {}).items():
+            print(f"{solver.name} {phase_run.phase} {name}: " + ", ".join(f"{key} {format_metric_value(value)}" for key, value in values.items()))
+
+def metrics_record(result: RunResult) -> Dict[str, Any]:
+    return {
+        "day": result.day,
+        "time_ns": {phase: phase_run.time_ns for phase, phase_run in result.phases.items()},
+        "metrics": {phase: phase_run.metrics or {} for phase, phase_run in result.phases.items()},
+    }
+
+def print_memo_stats(solver: Solver):
+    for stats in memo.stats():
+        print(f"{solver.name} memo {memo.format_stats(stats)}")
+
+def run_days(days: List[int], input_path: str = None, example: bool = False, use_cache: bool = True,
+             profile_phases: List[str] = (), profiler: str = "cprofile", profile_dir: str = DEFAULT_PROFILE_DIR,
+             trace_memory: bool = False, concurrent_parts: bool = False, incremental_state: str = None,
+             memo_stats: bool = False, metrics_path: str = None) -> List[RunResult]:
+    if input_path is not None and len(days) != 1:
+        raise ValueError("--input can only be used with a single day")
+
+    runs = incremental.read_runs(incremental_state) if incremental_state is not None else None
+    if memo_stats: memo.collect_stats()
+    # one JSON line per day that ran, written as each day finishes
+    if metrics_path is not None: open(metrics_path, "w").close()
+    results = []
+    for day in days:
+        solver = load_solver(day, use_cache)
+        solver.set_example(example)
+        day_input_path = input_path or solver.input_path(example)
+
+        state = None
+        if runs is not None:
+            state = incremental.day_state(runs, solver.name, solver.module.__file__, day_input_path, example)
+
+        if memo_stats: memo.reset_stats()
+        if state is not None and state.unchanged is not None:
+            result = unchanged_result(day, state.unchanged)
+        else:
+            result = run_solver(solver, day_input_path, profile_phases, profiler, trace_memory, concurrent_parts)
+
+        print(f"{solver.name} part1: {result.part1}")
+        print(f"{solver.name} part2: {result.part2}")
+        print(f"{solver.name} run time: {timedelta(microseconds=result.time_ns // 1000)}  (" +
+              ("unchanged, from the last run: " if result.unchanged else "") +
+              ", ".join(f"{p.phase} {instrument.format_ns(p.time_ns)}" for p in result.phases.values()) + ")")
+        print_profiles(solver, result, profile_dir)
+        print_memory(solver, result)
+        if metrics_path is not None: print_metrics(solver, result)
+        if memo_stats: print_memo_stats(solver)
+        results.append(result)
+
+        if metrics_path is not None and not result.unchanged:
+            with open(metrics_path, "a") as file:
+                file.write(json.dumps(metrics_record(result)) + "\n")
+
+        if state is not None and not result.unchanged:
+            incremental.store_run(runs, state, result.part1, result.part2, {p.phase: p.time_ns for p in result.phases.values()})
+            # after every day, so an interrupted calendar run keeps the days it finished
+            incremental.write_runs(incremental_state, runs)
+
+    return results
@@ -0,0 +1,157 @@
+from dataclasses import dataclass, asdict, field
+from typing import Dict, List
+import json
+import math
+import os
+
+from aoc import bench, generators
+from aoc.lazy import lazy_import
+from aoc.runner import load_solver
+
+tempfile = lazy_import("tempfile")
+
+DEFAULT_TOLERANCE = 0.3
+DEFAULT_TIME_LIMIT_S = 30.0
+
+# scales are in each generator's own unit, see generators.SCALE_UNITS
+DEFAULT_SWEEPS = {
+    1: [1000, 2000, 4000, 8000],
+    2: [1000, 2000, 4000, 8000],
+    3: [50, 100, 200, 400],
+    4: [1000, 2000, 4000, 8000],
+    5: [10, 20, 40, 80],
+    6: [100000, 200000, 400000, 800000],
+    7: [1000, 2000, 4000, 8000],
+    8: [1000, 2000, 4000, 8000],
+    9: [500, 1000, 2000, 4000],
+    10: [16, 24, 32, 40],
+    11: [25, 50, 100, 200],
+    12: [100, 200, 400, 800],
+    13: [50, 100, 200, 400],
+    14: [20, 40, 60, 80],
+    15: [1000, 2000, 4000, 8000],
+    16: [20, 40, 60, 80],
+    17: [20, 30, 40, 60],
+    18: [50, 100, 200, 400],
+    19: [100, 200, 400, 800],
+    20: [6, 7, 8, 9],
+    21: [101, 131, 161, 201],
+    22: [250, 500, 1000, 2000],
+    23: [30, 45, 60, 90],
+    24: [20, 40, 80, 160],
+    25: [50, 100, 200, 400],
+}
+
+@dataclass
+class ScalePoint:
+    scale: int
+    input_bytes: int
+    time_ns: Dict[str, int]
+    peak_bytes: Dict[str, int]
+
+@dataclass
+class DayScaling:
+    day: int
+    points: List[ScalePoint]
+    time_exponents: Dict[str, float] = field(default_factory=dict)
+    memory_exponents: Dict[str, float] = field(default_factory=dict)
+    stopped: str = None
+
+@dataclass
+class ExponentRegression:
+    day: int
+    phase: str
+    baseline: float
+    current: float
+
+def fit_exponent(xs: List[float], ys: List[float]) -> float:
+    # least squares slope of log(y) over log(x), i.e. k in y ~ x^k
+    if len(xs) < 2: return None
+    log_xs = [math.log(x) for x in xs]
+    log_ys = [math.log(max(y, 1)) for y in ys]
+    mean_x = sum(log_xs) / len(log_xs)
+    mean_y = sum(log_ys) / len(log_ys)
+    var_x = sum((x - mean_x) ** 2 for x in log_xs)
+    if var_x == 0: return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(log_xs, log_ys)) / var_x
+
+def profile_day(day: int, scales: List[int], repeat: int, time_limit_s: float, seed: int = 0) -> DayScaling:
+    solver = load_solver(day)
+    result = DayScaling(day, [])
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales:
+            text = generators.generate(day, scale, seed)
+            input_path = os.path.join(tmp_dir, f"day{day:02}_{scale}.txt")
+            with open(input_path, "w") as file:
+                file.write(text)
+
+            try:
+                timings = bench.benchmark_solver(solver, input_path, repeat, warmup=0)
+                peaks = bench.measure_peak_memory(solver, input_path)
+            except Exception as e:
+                result.stopped = f"scale {scale}: {type(e).__name__}: {e}"
+                break
+
+            point = ScalePoint(scale, len(text), {phase: s.min_ns for phase, s in timings.phases.items()}, peaks)
+            result.points.append(point)
+            print(f"day{day:02} scale {scale:>8} ({len(text)} bytes)  " + "  ".join(
+                f"{phase} {bench.format_ns(point.time_ns[phase])} {point.peak_bytes[phase] // 1024}KiB" for phase in bench.PHASES))
+
+            if sum(point.time_ns.values()) > time_limit_s * 1_000_000_000:
+                result.stopped = f"scale {scale}: over the {time_limit_s}s time limit"
+                break
+
+    xs = [p.input_bytes for p in result.points]
+    for phase in bench.PHASES:
+        result.time_exponents[phase] = fit_exponent(xs, [p.time_ns[phase] for p in result.points])
+        result.memory_exponents[phase] = fit_exponent(xs, [p.peak_bytes[phase] for p in result.points])
+    return result
+
+def format_exponent(k: float) -> str:
+    return "n/a" if k is None else f"n^{k:.2f}"
+
+def print_day_scaling(result: DayScaling):
+    cols = [f"{phase} time {format_exponent(result.time_exponents[phase])} mem {format_exponent(result.memory_exponents[phase])}" for phase in bench.PHASES]
+    print(f"day{result.day:02}  " + "  |  ".join(cols))
+    if result.stopped is not None:
+        print(f"day{result.day:02}  sweep stopped at {result.stopped}")
+
+def write_results(path: str, results: List[DayScaling]):
+    with open(path, "w") as file:
+        json.dump({"days": {f"day{r.day:02}": asdict(r) for r in results}}, file, indent=2)
+
+def read_exponents(path: str) -> Dict[int, Dict[str, float]]:
+    with open(path, "r") as file:
+        data = json.load(file)
+    return {int(name.removeprefix("day")): day["time_exponents"] for name, day in data["days"].items()}
+
+def find_regressions(baseline: Dict[int, Dict[str, float]], results: List[DayScaling], tolerance: float) -> List[ExponentRegression]:
+    regressions = []
+    for result in results:
+        for phase, k in result.time_exponents.items():
+            base_k = baseline.get(result.day, {}).get(phase)
+            if k is None or base_k is None: continue
+            if k > base_k + tolerance:
+                regressions.append(ExponentRegression(result.day, phase, base_k, k))
+    return regressions
+
+def run_scaling(days: List[int], scales: List[int], repeat: int, time_limit_s: float, seed: int,
+                output_path: str, baseline_path: str, save_baseline_path: str, tolerance: float) -> bool:
+    results = []
+    for day in days:
+        result = profile_day(day, scales or DEFAULT_SWEEPS[day], repeat, time_limit_s, seed)
+        print_day_scaling(result)
+        results.append(result)
+
+    if output_path is not None:
+        write_results(output_path, results)
+    if save_baseline_path is not None:
+        write_results(save_baseline_path, results)
+
+    if baseline_path is None: return True
+
+    regressions = find_regressions(read_exponents(baseline_path), results, tolerance)
+    for reg in regressions:
+        print(f"REGRESSION day{reg.day:02} {reg.phase}: time {format_exponent(reg.baseline)} -> {format_exponent(reg.current)}")
+    return len(regressions) == 0
@@ -0,0 +1,149 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple
+import heapq
+
+# Searches over integer state ids, e.g. grid indexes or states packed into one int.
+# neighbors(state) yields next states for bfs, edges(state) yields (weight, next_state)
+# pairs for the weighted searches. A search stops at the first expanded state for which
+# is_goal returns True, or once every reachable state has been expanded.
+
+Neighbors = Callable[[int], Iterable[int]]
+Edges = Callable[[int], Iterable[Tuple[int, int]]]
+Goal = Callable[[int], bool]
+
+@dataclass
+class SearchResult:
+    # cost of every expanded state, for bfs also of every discovered state
+    dist: Dict[int, int]
+    # only filled when searching with track_path=True
+    parents: Dict[int, int] = field(default_factory=dict)
+    goal: int = None
+    expanded: int = 0
+    pushed: int = 0
+    # popped states that had already been expanded at a lower cost
+    stale: int = 0
+
+    @property
+    def cost(self) -> int:
+        return None if self.goal is None else self.dist[self.goal]
+
+    def path(self, state: int = None) -> List[int]:
+        # states from a start to state (the goal by default), start first
+        state = self.goal if state is None else state
+        path = [state]
+        while (state := self.parents.get(state)) is not None:
+            path.append(state)
+        path.reverse()
+        return path
+
+    def counts(self) -> Dict[str, int]:
+        # for aoc.metrics.count
+        return {"searches": 1, "pushed": self.pushed, "popped": self.expanded + self.stale, "stale": self.stale, "expanded": self.expanded}
+
+def bfs(starts: Iterable[int], neighbors: Neighbors, is_goal: Goal = None, track_path: bool = False) -> SearchResult:
+    result = SearchResult({})
+    dist, parents = result.dist, result.parents
+
+    queue = deque()
+    for start in starts:
+        dist[start] = 0
+        queue.append(start)
+    result.pushed = len(queue)
+
+    while queue:
+        state = queue.popleft()
+        result.expanded += 1
+        if is_goal is not None and is_goal(state):
+            result.goal = state
+            break
+
+        next_dist = dist[state] + 1
+        for next_state in neighbors(state):
+            if next_state in dist: continue
+            dist[next_state] = next_dist
+            if track_path: parents[next_state] = state
+            queue.append(next_state)
+            result.pushed += 1
+
+    return result
+
+def dijkstra(starts: Iterable[int], edges: Edges, is_goal: Goal = None, track_path: bool = False) -> SearchResult:
+    return astar(starts, edges, None, is_goal, track_path)
+
+def astar(starts: Iterable[int], edges: Edges, heuristic: Callable[[int], int] = None,
+          is_goal: Goal = None, track_path: bool = False) -> SearchResult:
+    # heuristic must never overestimate the remaining cost, None makes this plain dijkstra
+    result = SearchResult({})
+    dist, parents = result.dist, result.parents
+    best = {}
+
+    search_queue = []
+    for start in starts:
+        best[start] = 0
+        search_queue.append((heuristic(start) if heuristic else 0, 0, start))
+    heapq.heapify(search_queue)
+    result.pushed = len(search_queue)
+
+    while search_queue:
+        (_, cur_cost, state) = heapq.heappop(search_queue)
+        if state in dist:
+            result.stale += 1
+            continue
+        dist[state] = cur_cost
+        result.expanded += 1
+        if is_goal is not None and is_goal(state):
+            result.goal = state
+            break
+
+        for weight, next_state in edges(state):
+            next_cost = cur_cost + weight
+            if next_cost >= best.get(next_state, next_cost + 1): continue
+            best[next_state] = next_cost
+            if track_path: parents[next_state] = state
+            estimate = next_cost + heuristic(next_state) if heuristic else next_cost
+            heapq.heappush(search_queue, (estimate, next_cost, next_state))
+            result.pushed += 1
+
+    return result
+
+def dial(starts: Iterable[int], edges: Edges, max_weight: int, is_goal: Goal = None, track_path: bool = False) -> SearchResult:
+    # dijkstra with a ring of max_weight + 1 buckets instead of a heap, for small integer weights.
+    # All queued costs lie in [cost, cost + max_weight], so bucket cost % ring only ever holds cost.
+    result = SearchResult({})
+    dist, parents = result.dist, result.parents
+    best = {}
+
+    ring = max_weight + 1
+    buckets = [[] for _ in range(ring)]
+    for start in starts:
+        best[start] = 0
+        buckets[0].append(start)
+    queued = result.pushed = len(buckets[0])
+
+    cur_cost = 0
+    while queued > 0:
+        bucket = buckets[cur_cost % ring]
+        while bucket:
+            state = bucket.pop()
+            queued -= 1
+            if state in dist:
+                result.stale += 1
+                continue
+            dist[state] = cur_cost
+            result.expanded += 1
+            if is_goal is not None and is_goal(state):
+                result.goal = state
+                return result
+
+            for weight, next_state in edges(state):
+                next_cost = cur_cost + weight
+                if next_cost >= best.get(next_state, next_cost + 1): continue
+                best[next_state] = next_cost
+                if track_path: parents[next_state] = state
+                buckets[next_cost % ring].append(next_state)
+                queued += 1
+                result.pushed += 1
+        cur_cost += 1
+
+    return result
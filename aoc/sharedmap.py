@@ -0,0 +1,125 @@
+from typing import Any, Callable, Dict, List
+import os
+import time
+
+from aoc import cache, progress
+from aoc.lazy import lazy_import
+
+futures = lazy_import("concurrent.futures")
+shared_memory = lazy_import("multiprocessing.shared_memory")
+
+# Parallel map over one parsed input. The input is encoded once with the day's parse cache codec
+# (encode_input, in aoc.cache's array layout) into a multiprocessing.shared_memory block, and the
+# tasks sent to the workers are just index ranges. A worker attaches the block and decodes it
+# once per map, then runs func(decoded input, index) for every index it gets. Workers stay up for
+# the next map, which attaches its own block.
+#
+# Chunk sizes adapt to the work: the first chunks hold a single index, later ones are sized from
+# the measured time per index to take about TARGET_CHUNK_S, but never more than a share of the
+# indexes left, so the workers finish together.
+
+TARGET_CHUNK_S = 0.05
+# chunks queued per worker, so a worker never waits for the next one
+CHUNKS_IN_FLIGHT = 2
+
+# processes for maps that don't ask for a number, every CPU when None. The pools of aoc.batch and
+# aoc.parallel set 1 in their workers, which use every CPU between them already, so their maps run
+# inline instead of each worker starting a pool of its own.
+_default_jobs: int = None
+
+_pool: "futures.ProcessPoolExecutor" = None
+_pool_jobs = 0
+
+# in a worker: (block name, block, decoded input) of the last map it took part in
+_attached = None
+
+def set_default_jobs(jobs: int):
+    global _default_jobs
+    _default_jobs = jobs
+
+def get_pool(jobs: int) -> "futures.ProcessPoolExecutor":
+    global _pool, _pool_jobs
+    if _pool is None or _pool_jobs != jobs:
+        if _pool is not None: _pool.shutdown()
+        _pool, _pool_jobs = futures.ProcessPoolExecutor(max_workers=jobs), jobs
+    return _pool
+
+def attach(name: str, decode: Callable[[Dict[str, memoryview]], Any]) -> Any:
+    global _attached
+    if _attached is not None and _attached[0] == name: return _attached[2]
+
+    if _attached is not None:
+        previous = _attached[1]
+        _attached = None
+        try:
+            previous.close()
+        except BufferError:
+            pass # the previous decoded input still has views into it, it goes when they do
+
+    block = shared_memory.SharedMemory(name=name)
+    _attached = (name, block, decode(cache.unpack_arrays(block.buf)))
+    return _attached[2]
+
+def run_chunk(name: str, decode: Callable[[Dict[str, memoryview]], Any], func: Callable[[Any, int], Any],
+              start: int, end: int) -> (List[Any], int):
+    input_data = attach(name, decode)
+    chunk_start = time.perf_counter_ns()
+    results = [func(input_data, index) for index in range(start, end)]
+    return results, time.perf_counter_ns() - chunk_start
+
+def chunk_size(remaining: int, jobs: int, done: int, done_ns: int) -> int:
+    if done == 0 or done_ns == 0: return 1
+    target = int(TARGET_CHUNK_S * 1_000_000_000 * done / done_ns)
+    return max(1, min(target, -(-remaining // (jobs * CHUNKS_IN_FLIGHT))))
+
+def shared_map(func: Callable[[Any, int], Any], input_data: Any, count: int,
+               encode: Callable[[Any], Dict[str, Any]], decode: Callable[[Dict[str, memoryview]], Any],
+               jobs: int = None) -> List[Any]:
+    # func and decode are sent to the workers by name, so they have to be module level functions
+    jobs = jobs or _default_jobs or os.cpu_count()
+    if jobs == 1 or count <= 1:
+        return [func(input_data, index) for index in progress.track(range(count))]
+
+    arrays = encode(input_data)
+    _, _, _, size = cache.layout(arrays)
+    block = shared_memory.SharedMemory(create=True, size=max(1, size))
+    try:
+        cache.pack_arrays(block.buf, arrays)
+        return map_chunks(get_pool(jobs), block.name, func, decode, count, jobs)
+    finally:
+        block.close()
+        block.unlink()
+
+def map_chunks(pool: "futures.ProcessPoolExecutor", name: str, func: Callable[[Any, int], Any],
+               decode: Callable[[Dict[str, memoryview]], Any], count: int, jobs: int) -> List[Any]:
+    results = [None] * count
+    next_index = 0
+    done, done_ns = 0, 0
+    running = {}
+
+    def completed():
+        # one item per finished index, for the progress bar
+        nonlocal next_index, done, done_ns
+        while next_index < count or len(running) > 0:
+            while next_index < count and len(running) < jobs * CHUNKS_IN_FLIGHT:
+                end = next_index + chunk_size(count - next_index, jobs, done, done_ns)
+                end = min(end, count)
+                running[pool.submit(run_chunk, name, decode, func, next_index, end)] = next_index
+                next_index = end
+
+            finished, _ = futures.wait(running, return_when=futures.FIRST_COMPLETED)
+            for future in finished:
+                start = running.pop(future)
+                chunk_results, chunk_ns = future.result()
+                results[start:start + len(chunk_results)] = chunk_results
+                done += len(chunk_results)
+                done_ns += chunk_ns
+                yield from chunk_results
+
+    try:
+        for _ in progress.track(completed(), total=count):
+            pass
+    finally:
+        # left over when a chunk raised
+        for future in running: future.cancel()
+    return results
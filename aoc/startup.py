@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import List
+import re
+import subprocess
+import sys
+import time
+
+from aoc.instrument import format_ns
+from aoc.runner import ROOT_DIR
+
+# Startup cost of a day: a fresh interpreter importing the runtime and loading the day's solver,
+# which is what every `python -m aoc run` pays before parsing starts.
+
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+@dataclass
+class ImportRecord:
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+def load_solver_code(day: int) -> str:
+    return f"from aoc import cli, runner; runner.load_solver({day})"
+
+def python_command(code: str, *options: str) -> List[str]:
+    return [sys.executable, *options, "-c", code]
+
+def cold_start_ns(day: int) -> int:
+    start = time.perf_counter_ns()
+    subprocess.run(python_command(load_solver_code(day)), cwd=ROOT_DIR, check=True)
+    return time.perf_counter_ns() - start
+
+def parse_import_times(text: str) -> List[ImportRecord]:
+    records = []
+    for line in text.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if match is None: continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(ImportRecord(name, len(indent) // 2, int(self_us), int(cumulative_us)))
+    return records
+
+def import_profile(day: int) -> List[ImportRecord]:
+    # -X importtime writes one line per module to stderr, children before their parent
+    process = subprocess.run(python_command(load_solver_code(day), "-X", "importtime"), cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True)
+    return parse_import_times(process.stderr)
+
+def print_import_profile(day: int, records: List[ImportRecord], count: int = 15):
+    total_us = sum(record.cumulative_us for record in records if record.depth == 0)
+    print(f"day{day:02} imports: {format_ns(total_us * 1000)} over {len(records)} modules")
+    print("  slowest to import, including their own imports:")
+    for record in sorted(records, key=lambda r: -r.cumulative_us)[:count]:
+        print(f"{format_ns(record.cumulative_us * 1000):>12}  {record.name}")
+    print("  most time in the module itself:")
+    for record in sorted(records, key=lambda r: -r.self_us)[:count]:
+        print(f"{format_ns(record.self_us * 1000):>12}  {record.name}")
@@ -1,32 +1,30 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
-IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
-
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+from aoc import inputs
 
-    return lines
+IS_EXAMPLE = False
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-start_time = datetime.now()
+def parse_text(text: str):
+    return text.splitlines()
 
-input_lines = parse_input()
+def parse_input(input_file=INPUT_FILE):
+    return inputs.StreamedInput(functools.partial(inputs.iter_lines, input_file))
 
-def do_part1():
+def do_part1(input_lines):
     total = 0
     for line in input_lines:
         first = next(c for c in line if c.isdigit())
         last = next(c for c in reversed(line) if c.isdigit())
         num = int(first + last)
         total += num
-    print(total)
+    return total
 
-def do_part2():
+def do_part2(input_lines):
     digit_name_map = {
         "one": "1", 
         "two": "2", 
@@ -58,10 +56,5 @@ def do_part2():
         num = int(first + last)
         total += num
 
-    print(total)    
-
-do_part1()
-do_part2()
+    return total
 
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
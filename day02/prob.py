@@ -1,67 +1,42 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
-IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
-
-def parse_until(input: str, stop_at: str) -> (str, str):
-    parsed = ""
-    while len(input) > 0 and not input.startswith(stop_at):
-        parsed += input[0]
-        input = input[1:]
-    return input, parsed
-
-def parse_int(input: str) -> (str, int):
-    parsed = ""
-    while len(input) > 0 and input[0].isdigit():
-        parsed += input[0]
-        input = input[1:]
-    return input, int(parsed)
-
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
-
-    games = []
+from aoc import inputs
 
-    for line in lines:
-        line, _ = parse_until(line, " ")
-        line = line[1:]
-        line, game_id = parse_int(line)
-        line = line[2:]
-        sets = []
-        for set_input in line.split("; "):
-            cube_inputs = set_input.split(", ")
-            cube_counts = {}
-            for cube_input in cube_inputs:
-                cube_input, cube_count = parse_int(cube_input)
-                cube_color = cube_input[1:]
-                # print(f"{cube_color}: {cube_count}")
-                cube_counts[cube_color] = cube_count
-            sets.append(cube_counts)
-        games.append({
-            "id": game_id, 
-            "sets": sets
-        })
-
-    return games
+IS_EXAMPLE = False
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+
+def parse_game(line: str):
+    game_input, sets_input = line.split(": ")
+    sets = []
+    for set_input in sets_input.split("; "):
+        cube_counts = {}
+        for cube_input in set_input.split(", "):
+            cube_count, cube_color = cube_input.split(" ")
+            cube_counts[cube_color] = int(cube_count)
+        sets.append(cube_counts)
+    return {
+        "id": int(game_input.removeprefix("Game ")), 
+        "sets": sets
+    }
 
-start_time = datetime.now()
+def parse_text(text: str):
+    return [parse_game(line) for line in text.splitlines()]
 
-input_games = parse_input()
-# print(input_games)
+def parse_input(input_file=INPUT_FILE):
+    return inputs.StreamedInput(lambda: map(parse_game, inputs.iter_lines(input_file)))
 
-def do_part1():
+def do_part1(input_games):
     max_counts = {
         "red": 12, 
         "green": 13, 
         "blue": 14
     }
 
-    possible_games = []
+    possible_ids_sum = 0
     for game in input_games:
         possible = True
         for set in game["sets"]:
@@ -69,12 +44,12 @@ def do_part1():
                 if count > max_counts[color]:
                     possible = False
         if possible:
-            possible_games.append(game)
+            possible_ids_sum += game["id"]
 
-    print(sum(map(lambda game: game["id"], possible_games)))
+    return possible_ids_sum
 
-def do_part2():
-    powers = []
+def do_part2(input_games):
+    powers_sum = 0
     for game in input_games:
         min_counts = {
             "red": 0, 
@@ -86,12 +61,6 @@ def do_part2():
             for color, count in set.items():
                 if count > min_counts[color]:
                     min_counts[color] = count
-        powers.append(math.prod(min_counts.values()))
-
-    print(sum(powers))
-
-do_part1()
-do_part2()
+        powers_sum += math.prod(min_counts.values())
 
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return powers_sum
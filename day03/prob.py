@@ -1,30 +1,56 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
+from dataclasses import dataclass
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
-    return lines
+@dataclass
+class InputData:
+    lines: [str]
+    grid_width: int
+    grid_height: int
+    number_id_map: dict
+    coord_id_map: dict
 
-start_time = datetime.now()
+    def get(self, coord) -> str:
+        x, y = coord
+        return self.lines[y][x]
 
-input_lines = parse_input()
-grid_width = len(input_lines[0])
-grid_height = len(input_lines)
+def parse_text(text: str):
+    lines = text.splitlines()
 
-next_number_id = 0
-number_id_map = {}
-coord_id_map = {}
+    grid_width = len(lines[0])
+    grid_height = len(lines)
 
-def input_grid_get(coord) -> str:
-    x, y = coord
-    return input_lines[y][x]
+    next_number_id = 0
+    number_id_map = {}
+    coord_id_map = {}
+
+    for y in range(0, grid_height):
+        for x in range(0, grid_width):
+            if (x, y) in coord_id_map: continue
+
+            if lines[y][x].isdigit():
+                number_id = next_number_id
+                next_number_id += 1
+                digits = ""
+                nx = x
+                for nx in range(x, grid_width):
+                    ch = lines[y][nx]
+                    if not ch.isdigit(): break
+                    digits += ch
+                    coord_id_map[(nx, y)] = number_id
+                number_id_map[number_id] = int(digits)
+
+    return InputData(lines, grid_width, grid_height, number_id_map, coord_id_map)
+
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
 def get_neighbor_coords(coord) -> (int, int):
     x, y = coord
@@ -34,56 +60,33 @@ def get_neighbor_coords(coord) -> (int, int):
         (x - 1, y + 1), (x - 0, y + 1), (x + 1, y + 1), 
     ]
 
-for y in range(0, grid_height):
-    for x in range(0, grid_width):
-        if (x, y) in coord_id_map: continue
-
-        if input_grid_get((x, y)).isdigit(): 
-            number_id = next_number_id
-            next_number_id += 1
-            digits = ""
-            nx = x
-            for nx in range(x, grid_width):
-                ch = input_grid_get((nx, y))
-                if not ch.isdigit(): break
-                digits += ch
-                coord_id_map[(nx, y)] = number_id
-            number_id_map[number_id] = int(digits)
-
-def do_part1():
+def do_part1(input_data: InputData):
     num_ids = set()
-    for y in range(0, grid_height):
-        for x in range(0, grid_width):
-            ch = input_grid_get((x, y))
+    for y in range(0, input_data.grid_height):
+        for x in range(0, input_data.grid_width):
+            ch = input_data.get((x, y))
             if ch.isdigit() or ch == '.': continue
 
             for nc in get_neighbor_coords((x, y)):
-                if nc in coord_id_map:
-                    num_ids.add(coord_id_map[nc])
+                if nc in input_data.coord_id_map:
+                    num_ids.add(input_data.coord_id_map[nc])
 
-    print(f"part1: {sum(map(lambda id: number_id_map[id], num_ids))}")
+    return sum(map(lambda id: input_data.number_id_map[id], num_ids))
 
-def do_part2():
+def do_part2(input_data: InputData):
     ratios = []
-    for y in range(0, grid_height):
-        for x in range(0, grid_width):
-            ch = input_grid_get((x, y))
+    for y in range(0, input_data.grid_height):
+        for x in range(0, input_data.grid_width):
+            ch = input_data.get((x, y))
             if ch != '*': continue
 
             num_ids = set()
             for nc in get_neighbor_coords((x, y)):
-                if nc in coord_id_map:
-                    num_ids.add(coord_id_map[nc])
+                if nc in input_data.coord_id_map:
+                    num_ids.add(input_data.coord_id_map[nc])
             if len(num_ids) != 2: continue
 
-            nums = list(map(lambda id: number_id_map[id], num_ids))
+            nums = list(map(lambda id: input_data.number_id_map[id], num_ids))
             ratios.append(nums[0] * nums[1])
 
-    print(f"part2: {sum(ratios)}")
-
-
-do_part1()
-do_part2()
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return sum(ratios)
@@ -1,30 +1,25 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
+from collections import deque
 
-IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
-
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+from aoc import inputs, parsing
 
-    cards = []
-    for line in lines:
-        set_inputs = line.split(':')[1].split('|')
-        sets = []
-        for set_input in set_inputs:
-            nums = [int(c.strip()) for c in set_input.split(' ') if len(c) > 0]
-            sets.append(nums)
-        cards.append(sets)
+IS_EXAMPLE = False
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-    return cards
+def parse_card(line: bytes):
+    # winning numbers, then my numbers
+    set_inputs = line.split(b':')[1].split(b'|')
+    return [parsing.ints(set_input) for set_input in set_inputs]
 
-start_time = datetime.now()
+def parse_text(text: str):
+    return [parse_card(line) for line in text.encode().splitlines()]
 
-input_cards = parse_input()
+def parse_input(input_file=INPUT_FILE):
+    return inputs.StreamedInput(lambda: map(parse_card, inputs.iter_mapped_lines(input_file)))
 
 def get_winning_number_count(card):
     winning_nums = set(card[0])
@@ -35,27 +30,26 @@ def get_winning_number_count(card):
             count += 1
     return count
 
-def do_part1():
-    scores = []
+def do_part1(input_cards):
+    total_score = 0
+    for card in input_cards:
+        winning_count = get_winning_number_count(card)
+        total_score += pow(2, winning_count - 1) if winning_count > 0 else 0
+
+    return total_score
+
+def do_part2(input_cards):
+    # copies won for the next cards, won_copies[i] is for the card i + 1 after the current one.
+    # Copies won past the last card are never read.
+    won_copies = deque()
+    total_count = 0
     for card in input_cards:
+        how_many = 1 + (won_copies.popleft() if len(won_copies) > 0 else 0)
+        total_count += how_many
         winning_count = get_winning_number_count(card)
-        score = pow(2, winning_count - 1) if winning_count > 0 else 0
-        scores.append(score)
-
-    print(f"part1: {sum(scores)}")
-
-def do_part2():
-    how_many_per = [1 for _ in range(0, len(input_cards))]
-    for idx in range(0, len(input_cards)):
-        winning_count = get_winning_number_count(input_cards[idx])
-        how_many = how_many_per[idx]
-        for i in range(idx + 1, min(len(input_cards), idx + 1 + winning_count)):
-            how_many_per[i] += how_many
-       
-    print(f"part2: {sum(how_many_per)}")
-
-do_part1()
-do_part2()
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+        while len(won_copies) < winning_count:
+            won_copies.append(0)
+        for i in range(winning_count):
+            won_copies[i] += how_many
+
+    return total_count
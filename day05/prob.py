@@ -1,30 +1,31 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
+from aoc import parsing
+from aoc.intervals import interval, interval_set, union_all
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+
+# the (start, count) range splitting is kept as the reference, see aoc.difftest
+USE_INTERVALS = True
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    blocks = [block.strip() for block in text.split("\n\n")]
 
-    seeds = [int(x) for x in lines[0][7:].split(' ')]
-    lines = lines[2:]
+    seeds = parsing.ints(blocks[0]).tolist()
 
     maps = {}
-    while len(lines) > 0:
-        src_type, _, dst_type = lines[0].split(' ')[0].split('-')
+    for block in blocks[1:]:
+        if len(block) == 0: continue
+        header, _, ranges_input = block.partition("\n")
+        src_type, _, dst_type = header.split(' ')[0].split('-')
         print(f"{src_type} -> {dst_type}")
-        lines = lines[1:]
-        ranges = []
-        while len(lines) > 0 and len(lines[0]) > 0:
-            dst_start, src_start, count = [int(x) for x in lines[0].split(' ')]
-            lines = lines[1:]
-            ranges.append((dst_start, src_start, count))
-        lines = lines[1:]
+        # dst_start, src_start, count per line
+        ranges = parsing.int_records(ranges_input, 3)
         maps[src_type] = {
             'dst_type': dst_type, 
             'ranges': ranges
@@ -32,11 +33,13 @@ def parse_input():
 
     return seeds, maps
 
-start_time = datetime.now()
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-input_seeds, input_maps = parse_input()
+def do_part1(input_data):
+    input_seeds, input_maps = input_data
 
-def do_part1():
     cur_type = 'seed'
     cur_numbers = list(input_seeds)
     while True:
@@ -56,15 +59,32 @@ def do_part1():
         cur_type = cur_map['dst_type']
         cur_numbers = new_numbers
     
-    print(f"part1: {min(cur_numbers)}")
+    return min(cur_numbers)
+
+def lowest_location_intervals(input_seeds, input_maps):
+    cur_type = 'seed'
+    cur_ranges = interval_set((input_seeds[i], input_seeds[i] + input_seeds[i + 1]) for i in range(0, len(input_seeds), 2))
+
+    while True:
+        cur_map = input_maps.get(cur_type)
+        if cur_map is None: break
+        map_ranges = cur_map['ranges']
+
+        unmapped_ranges = cur_ranges
+        mapped_ranges = []
+        for map_dst, map_src, map_len in map_ranges:
+            map_range = interval(map_src, map_src + map_len)
+            mapped_ranges.append(unmapped_ranges.intersect(map_range).shift(map_dst - map_src))
+            unmapped_ranges = unmapped_ranges.subtract(map_range)
 
-def do_part2():
-    input_ranges = []
-    for i in range(0, len(input_seeds), 2):
-        input_ranges.append((input_seeds[i + 0], input_seeds[i + 1]))
+        cur_ranges = union_all([unmapped_ranges] + mapped_ranges)
+        cur_type = cur_map['dst_type']
+
+    return cur_ranges.min()
 
+def lowest_location_ranges(input_seeds, input_maps):
     cur_type = 'seed'
-    cur_ranges = list(input_ranges)
+    cur_ranges = [(input_seeds[i], input_seeds[i + 1]) for i in range(0, len(input_seeds), 2)]
 
     while True:
         cur_map = input_maps.get(cur_type)
@@ -88,16 +108,15 @@ def do_part2():
                 intersect_len = min(start + count, map_src + map_len) - intersect_start
                 if intersect_len > 0:
                     mapped_ranges.append((intersect_start + (map_dst - map_src), intersect_len))
-           
+
             unmapped_ranges = new_unmapped_ranges
 
         cur_ranges = unmapped_ranges + mapped_ranges
         cur_type = cur_map['dst_type']
 
-    print(f"part2: {min([r[0] for r in cur_ranges])}")
-
-do_part1()
-do_part2()
+    return min(r[0] for r in cur_ranges)
 
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+def do_part2(input_data):
+    input_seeds, input_maps = input_data
+    if USE_INTERVALS: return lowest_location_intervals(input_seeds, input_maps)
+    return lowest_location_ranges(input_seeds, input_maps)
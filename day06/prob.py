@@ -1,56 +1,60 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
+from aoc import parsing
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-def parse_ints(line):
-    return [int(x) for x in line.split(' ') if len(x) > 0]
+# the loop over every hold time is kept as the reference, see aoc.difftest
+USE_CLOSED_FORM = True
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
-    times = parse_ints(lines[0][len('Time:'):])
-    distances = parse_ints(lines[1][len('Distances:'):])
+    times = parsing.ints(lines[0]).tolist()
+    distances = parsing.ints(lines[1]).tolist()
     return list(zip(times, distances))
 
-start_time = datetime.now()
-
-input_races = parse_input()
-
-def do_part1():
-    ways_to_win_array = []
-    for race_time, race_distance in input_races:
-        ways_to_win = 0
-        for ms_held in range(0, race_time + 1):
-            distance_moved = ms_held * (race_time - ms_held)
-            if distance_moved > race_distance:
-                ways_to_win += 1
-        ways_to_win_array.append(ways_to_win)
-        
-    print(f"part1: {functools.reduce(lambda y, x: y * x, ways_to_win_array)}")
-
-def do_part2():
-    def combine_ints(ints):
-        return int(''.join(map(str, ints)))
-
-    race_time = combine_ints([race[0] for race in input_races])
-    race_distance = combine_ints([race[1] for race in input_races])
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
+def count_ways_to_win_bruteforce(race_time, race_distance):
     ways_to_win = 0
     for ms_held in range(0, race_time + 1):
         distance_moved = ms_held * (race_time - ms_held)
         if distance_moved > race_distance:
             ways_to_win += 1
+    return ways_to_win
+
+def count_ways_to_win_closed_form(race_time, race_distance):
+    # the winning hold times are the integers strictly between the roots of h * (race_time - h) = race_distance
+    discriminant = race_time * race_time - 4 * race_distance
+    if discriminant <= 0: return 0
+    min_held = (race_time - math.isqrt(discriminant)) // 2
+    # isqrt rounds down, so the first winning hold time is at most a step or two away
+    while min_held <= race_time // 2 and min_held * (race_time - min_held) <= race_distance: min_held += 1
+    while min_held > 0 and (min_held - 1) * (race_time - min_held + 1) > race_distance: min_held -= 1
+    # winning hold times are symmetric around race_time / 2
+    return max(0, race_time - 2 * min_held + 1)
+
+def count_ways_to_win(race_time, race_distance):
+    if USE_CLOSED_FORM: return count_ways_to_win_closed_form(race_time, race_distance)
+    return count_ways_to_win_bruteforce(race_time, race_distance)
+
+def do_part1(input_races):
+    ways_to_win_array = [count_ways_to_win(race_time, race_distance) for race_time, race_distance in input_races]
+    return functools.reduce(lambda y, x: y * x, ways_to_win_array)
+
+def do_part2(input_races):
+    def combine_ints(ints):
+        return int(''.join(map(str, ints)))
 
-    print(f"part2: {ways_to_win}")
-
-do_part1()
-do_part2()
+    race_time = combine_ints([race[0] for race in input_races])
+    race_distance = combine_ints([race[1] for race in input_races])
 
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return count_ways_to_win(race_time, race_distance)
@@ -1,11 +1,14 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
+from typing import Iterable
+
+from aoc import inputs
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 def card_value(c):
     match c:
@@ -16,10 +19,8 @@ def card_value(c):
         case 'T': return 10
     return int(c)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
-
+def parse_lines(lines: Iterable[str]):
+    # ranking sorts every hand, so they all have to be in memory anyway
     hands_and_bids = []
     for line in lines:
         cols = line.split(' ')
@@ -29,9 +30,11 @@ def parse_input():
 
     return hands_and_bids
 
-start_time = datetime.now()
+def parse_text(text: str):
+    return parse_lines(text.splitlines())
 
-input_hands_and_bids = parse_input()
+def parse_input(input_file=INPUT_FILE):
+    return parse_lines(inputs.iter_lines(input_file))
 
 def count_cards(cards):
     counts = [0 for _ in range(0, 15)]
@@ -78,21 +81,15 @@ def calculate_winnings(hands_and_bids):
         total_winnings += (rank + 1) * bid
     return total_winnings
 
-def do_part1():
+def do_part1(input_hands_and_bids):
     total_winnings = calculate_winnings(input_hands_and_bids)
-    print(f"part1: {total_winnings}")
+    return total_winnings
 
-def do_part2():
+def do_part2(input_hands_and_bids):
     new_input_hands_and_bids = []
     for cards, bid in input_hands_and_bids:
         new_cards = [c if c != 11 else 1 for c in cards]
         new_input_hands_and_bids.append((new_cards, bid))
 
     total_winnings = calculate_winnings(new_input_hands_and_bids)
-    print(f"part2: {total_winnings}")
-
-do_part1()
-do_part2()
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return total_winnings
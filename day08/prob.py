@@ -1,15 +1,20 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
+from aoc.cycles import brent, first_common_step, iterate
+
 IS_EXAMPLE = False
-INPUT_FILE = "example3.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example3.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+
+# the lcm of each ghost's first steps to a Z node is kept as the reference, see aoc.difftest.
+# it assumes every ghost loops back to its Z node with the same period, which generated inputs do
+USE_CYCLES = True
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     instructions = lines[0]
 
@@ -22,10 +27,12 @@ def parse_input():
 
     return instructions, map
 
-start_time = datetime.now()
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-def do_part1():
-    input_instructions, input_map = parse_input()
+def do_part1(input_data):
+    input_instructions, input_map = input_data
 
     instruction_idx = 0
     current_node = 'AAA'
@@ -45,11 +52,9 @@ def do_part1():
         if current_node == 'ZZZ':
             break
 
-    print(f"part1: {total_steps}")
-
-def do_part2():
-    input_instructions, input_map = parse_input()
+    return total_steps
 
+def ghost_steps_first_ends(input_instructions, input_map):
     instruction_idx = 0
     current_nodes = [n for n in input_map.keys() if n.endswith('A')]
     nodes_finished_at = [0 for _ in range(0, len(current_nodes))]
@@ -74,25 +79,36 @@ def do_part2():
 
         if not 0 in nodes_finished_at: break
 
-    def calc_gcd(a, b):
-        greatest = 0
-        for n in range(2, min(a, b) + 1):
-            if a % n == 0 and b % n == 0:
-                greatest = n
-        return greatest
-    
-    def calc_lcm(a, b):
-        gcd = calc_gcd(a, b)
-        return int(a * b / gcd)
-
-    total_lcm = nodes_finished_at[0]
-    for n in nodes_finished_at[1:]:
-        total_lcm = calc_lcm(total_lcm, n)
-
-    print(f"part2: {total_lcm}")
-
-do_part1()
-do_part2()
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return math.lcm(*nodes_finished_at)
+
+def ghost_steps_cycles(input_instructions, input_map):
+    # a ghost's state is its node and its position in the instructions, packed into one int
+    node_names = list(input_map.keys())
+    node_ids = {name: i for i, name in enumerate(node_names)}
+    lefts = [node_ids[input_map[name][0]] for name in node_names]
+    rights = [node_ids[input_map[name][1]] for name in node_names]
+    is_end = [name.endswith('Z') for name in node_names]
+    node_count = len(node_names)
+    instructions = [instruction == 'L' for instruction in input_instructions]
+
+    def step(state):
+        instruction_idx, node = divmod(state, node_count)
+        next_node = lefts[node] if instructions[instruction_idx] else rights[node]
+        return (instruction_idx + 1) % len(instructions) * node_count + next_node
+
+    # ghosts don't have to loop back right after their first Z, so find each one's cycle
+    # and the steps within it where the ghost is on a Z node
+    cycles = []
+    for name in node_names:
+        if not name.endswith('A'): continue
+        cycle = brent(node_ids[name], step)
+        states = itertools.islice(iterate(cycle.start, step), cycle.tail + cycle.period)
+        end_steps = {i for i, state in enumerate(states) if is_end[state % node_count]}
+        cycles.append((cycle, end_steps))
+
+    return first_common_step(cycles)
+
+def do_part2(input_data):
+    input_instructions, input_map = input_data
+    if USE_CYCLES: return ghost_steps_cycles(input_instructions, input_map)
+    return ghost_steps_first_ends(input_instructions, input_map)
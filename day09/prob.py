@@ -1,21 +1,19 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
-IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+from aoc import inputs, parsing
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+IS_EXAMPLE = False
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-    histories = []
-    for line in lines:
-        histories.append([int(x) for x in line.split()])
+def parse_text(text: str):
+    return parsing.ints_per_line(text)
 
-    return histories
+def parse_input(input_file=INPUT_FILE):
+    return inputs.StreamedInput(lambda: map(parsing.ints, inputs.iter_lines(input_file, binary=True)))
 
 def calculate_deltas(values):
     all_deltas = [values]
@@ -33,34 +31,25 @@ def calculate_deltas(values):
     return all_deltas
 
 def do_part1(input_histories):
-    all_extrapolated_values = []
+    extrapolated_sum = 0
     for values in input_histories:
         all_deltas = calculate_deltas(values)
 
         extrapolated_value = 0
         for deltas in reversed(all_deltas):
             extrapolated_value = deltas[-1] + extrapolated_value
-        all_extrapolated_values.append(extrapolated_value)
+        extrapolated_sum += extrapolated_value
 
-    print(f"part1: {sum(all_extrapolated_values)}")
+    return extrapolated_sum
 
 def do_part2(input_histories):
-    all_extrapolated_values = []
+    extrapolated_sum = 0
     for values in input_histories:
         all_deltas = calculate_deltas(values)
 
         extrapolated_value = 0
         for deltas in reversed(all_deltas):
             extrapolated_value = deltas[0] - extrapolated_value
-        all_extrapolated_values.append(extrapolated_value)
-
-    print(f"part2: {sum(all_extrapolated_values)}")
-
-start_time = datetime.now()
-input_histories = parse_input()
-
-do_part1(input_histories)
-do_part2(input_histories)
+        extrapolated_sum += extrapolated_value
 
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return extrapolated_sum
@@ -1,12 +1,14 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
-IS_EXAMPLE = False
+from aoc import search
+from aoc.coords import PackedCoords
 
-INPUT_FILE = "example2_4.txt" if IS_EXAMPLE else "input.txt"
+IS_EXAMPLE = False
+EXAMPLE_FILE = "example2_4.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 def v_check(a, b):
     if isinstance(b, tuple):
@@ -19,12 +21,15 @@ def v_sub(a, b): return tuple(map(lambda x, y: x - y, a, b)) if v_check(a, b) el
 def v_turn_cw(a): return (-a[1], a[0])
 def v_turn_ccw(a): return (a[1], -a[0])
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     return lines
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 def get_connected_offsets(tile):
     match tile:
         case '|': offsets = ((0, -1), (0, 1))
@@ -65,6 +70,13 @@ def get_start_pos(map):
                 start_pos = (x, y)
     return start_pos
 
+def get_loop_neighbors(map, pos):
+    # the start tile doesn't say how it connects, so look for neighbors connecting back to it
+    if get_map_tile(map, pos) == 'S':
+        return [n_pos for n_pos in (v_add(pos, offset) for offset in [(-1, 0), (0, -1), (1, 0), (0, 1)])
+                if pos in get_connected_neighbors(map, n_pos)]
+    return get_connected_neighbors(map, pos)
+
 def get_loop_edges(map, start_pos):
     start_edges = []
     for offset in [(-1, 0), (0, -1), (1, 0), (0, 1)]:
@@ -88,9 +100,15 @@ def get_loop_edges(map, start_pos):
     return loop_edges
 
 def do_part1(map):
-    start_pos = get_start_pos(map)
-    loop_edges = get_loop_edges(map, start_pos)
-    print(f"part1: {loop_edges[-1][2]}")
+    map_w, _ = get_map_dims(map)
+    coords = PackedCoords(map_w)
+
+    def neighbors(state):
+        return [coords.pack(*n_pos) for n_pos in get_loop_neighbors(map, coords.unpack(state))]
+
+    # the farthest point is where the walks in both directions around the loop meet
+    result = search.bfs([coords.pack(*get_start_pos(map))], neighbors)
+    return max(result.dist.values())
 
 def do_part2(map):
     start_pos = get_start_pos(map)
@@ -143,13 +161,4 @@ def do_part2(map):
     #         line += c
     #     print(line)
 
-    print(f"part2: {len(inner_points)}")
-
-start_time = datetime.now()
-input_lines = parse_input()
-
-do_part1(input_lines)
-do_part2(input_lines)
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return len(inner_points)
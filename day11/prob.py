@@ -1,16 +1,15 @@
-from datetime import datetime
 import functools
 import itertools
 import time
 import math
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     galaxies = []
     for y, line in enumerate(lines):
@@ -19,6 +18,10 @@ def parse_input():
                 galaxies.append((x, y))
     return galaxies
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 def calc_expanded_1d_distance(all_positions, start_pos, end_pos, expansion_multiplier):
     if end_pos < start_pos:
         tmp = end_pos
@@ -52,17 +55,8 @@ def calc_total_expanded_distance(input_galaxies, expansion_multiplier):
 
 def do_part1(input_galaxies):
     total_expanded_distance = calc_total_expanded_distance(input_galaxies, 2)
-    print(f"part1: {total_expanded_distance}")
+    return total_expanded_distance
 
-def do_part2(lines):
+def do_part2(input_galaxies):
     total_expanded_distance = calc_total_expanded_distance(input_galaxies, 1000000)
-    print(f"part2: {total_expanded_distance}")
-
-start_time = datetime.now()
-input_galaxies = parse_input()
-
-do_part1(input_galaxies)
-do_part2(input_galaxies)
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return total_expanded_distance
@@ -1,24 +1,25 @@
-from datetime import datetime
 import dataclasses;
 from dataclasses import dataclass
+from array import array
 import functools
 import itertools
 import time
 import math
-from tqdm import tqdm
-from tqdm.contrib.concurrent import process_map
+
+from aoc import memo, sharedmap
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 @dataclass(slots=True)
 class SpringDataRow:
     cells: str
     broken_group_lengths: list
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     data_rows = []
     for line in lines:
@@ -28,6 +29,31 @@ def parse_input():
 
     return data_rows
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
+def encode_input(data_rows):
+    # rows as runs of one string of cells and one array of group lengths
+    return {
+        "cells": "".join(data_row.cells for data_row in data_rows).encode(),
+        "cell_counts": array('q', [len(data_row.cells) for data_row in data_rows]),
+        "group_lengths": array('q', [x for data_row in data_rows for x in data_row.broken_group_lengths]),
+        "group_counts": array('q', [len(data_row.broken_group_lengths) for data_row in data_rows]),
+    }
+
+def decode_input(arrays):
+    cells = bytes(arrays["cells"]).decode()
+    group_lengths = arrays["group_lengths"].tolist()
+    data_rows = []
+    cells_start, groups_start = 0, 0
+    for cell_count, group_count in zip(arrays["cell_counts"], arrays["group_counts"]):
+        data_rows.append(SpringDataRow(cells=cells[cells_start:cells_start + cell_count],
+                                       broken_group_lengths=group_lengths[groups_start:groups_start + group_count]))
+        cells_start += cell_count
+        groups_start += group_count
+    return data_rows
+
 def solve_rec(data_row: SpringDataRow, cell_idx, group_idx, broken_count, results_cache):
     params_key = (cell_idx, group_idx, broken_count)
     result = results_cache.get(params_key)
@@ -67,7 +93,8 @@ def solve_rec(data_row: SpringDataRow, cell_idx, group_idx, broken_count, result
     return total_comb_count
 
 def solve(data_row):
-    return solve_rec(data_row, 0, 0, 0, {})
+    with memo.table("day12 arrangements") as results_cache:
+        return solve_rec(data_row, 0, 0, 0, results_cache)
 
 def do_part1(data_rows):
     total_comb_count = 0
@@ -75,33 +102,20 @@ def do_part1(data_rows):
         comb_count = solve(data_row)
         total_comb_count += comb_count
 
-    print(f"part1: {total_comb_count}")
-
-def do_part2(input_data_rows):
-    data_rows = []
-    for input_data_row in input_data_rows:
-        data_rows.append(SpringDataRow(
-            cells = '?'.join([input_data_row.cells for _ in range(5)]), 
-            broken_group_lengths = input_data_row.broken_group_lengths * 5
-        ))
-
-    # total_comb_count = 0
-    # for data_row in tqdm(data_rows):
-    #     # print(data_row)
-    #     comb_count = solve(data_row)
-    #     total_comb_count += comb_count
-
-    comb_counts = process_map(solve, data_rows) #, max_workers=8)
-    total_comb_count = sum(comb_counts)
+    return total_comb_count
 
-    print(f"part2: {total_comb_count}")
+def unfold(data_row):
+    return SpringDataRow(
+        cells = '?'.join([data_row.cells for _ in range(5)]),
+        broken_group_lengths = data_row.broken_group_lengths * 5
+    )
 
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data_rows = parse_input()
+def solve_unfolded(input_data_rows, row_idx):
+    return solve(unfold(input_data_rows[row_idx]))
 
-    do_part1(input_data_rows)
-    do_part2(input_data_rows)
+def do_part2(input_data_rows):
+    # the rows go to the worker processes once, in shared memory, each task is a row index
+    comb_counts = sharedmap.shared_map(solve_unfolded, input_data_rows, len(input_data_rows), encode_input, decode_input)
+    total_comb_count = sum(comb_counts)
 
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return total_comb_count
@@ -1,14 +1,14 @@
-from datetime import datetime
+from aoc import inputs
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    return list(inputs.split_blocks(text.splitlines()))
 
-    grids = [grid.split('\n') for grid in '\n'.join(lines).split('\n\n')]
-    return grids
+def parse_input(input_file=INPUT_FILE):
+    return list(inputs.iter_blocks(input_file))
 
 def transpose_grid(rows):
     grid_w, grid_h = (len(rows[0]), len(rows))
@@ -66,17 +66,8 @@ def summarize_reflections(grids, expected_diff):
 
 def do_part1(grids):
     summary = summarize_reflections(grids, 0)
-    print(f"part1: {summary}")
+    return summary
 
 def do_part2(grids):
     summary = summarize_reflections(grids, 1)
-    print(f"part2: {summary}")
-
-start_time = datetime.now()
-input_grids = parse_input()
-
-do_part1(input_grids)
-do_part2(input_grids)
-
-end_time = datetime.now()
-print(f"run time: {end_time - start_time}")
+    return summary
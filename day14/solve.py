@@ -1,14 +1,20 @@
-from datetime import datetime
 from dataclasses import dataclass
-from typing import Dict, Set
+from typing import Dict, FrozenSet, Set
 import operator
 import functools
 import itertools
 import math
-from tqdm import tqdm
+from array import array
+
+from aoc.cycles import find_cycle, iterate
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
+
+# matching repeats in the sequence of loads is kept as the reference, see aoc.difftest
+USE_CYCLES = True
 
 @dataclass(slots=True, eq=True, frozen=True)
 class Vector2:
@@ -27,9 +33,8 @@ class InputData:
     cube_rocks: Set[Vector2]
     round_rocks: Set[Vector2]
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     grid_size = Vector2(len(lines[0]), len(lines))
     cube_rocks = []
@@ -43,6 +48,24 @@ def parse_input():
 
     return InputData(grid_size, cube_rocks=set(cube_rocks), round_rocks=set(round_rocks))
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
+# rocks are stored as y * width + x
+def encode_input(input_data: InputData):
+    width = input_data.grid_size.x
+    return {
+        "grid_size": array('q', [input_data.grid_size.x, input_data.grid_size.y]),
+        "cube_rocks": array('q', sorted(p.y * width + p.x for p in input_data.cube_rocks)),
+        "round_rocks": array('q', sorted(p.y * width + p.x for p in input_data.round_rocks)),
+    }
+
+def decode_input(arrays) -> InputData:
+    grid_size = Vector2(*arrays["grid_size"])
+    to_vectors = lambda packed: set(Vector2(p % grid_size.x, p // grid_size.x) for p in packed)
+    return InputData(grid_size, cube_rocks=to_vectors(arrays["cube_rocks"]), round_rocks=to_vectors(arrays["round_rocks"]))
+
 def pretty_print(grid_size: Vector2, cube_rocks, round_rocks):
     for y in range(grid_size.y):
         line = ""
@@ -82,7 +105,7 @@ def do_part1(input_data: InputData):
 
     load = calc_load(tilted_rocks, input_data.grid_size)
 
-    print(f"part1: {load}")
+    return load
 
 def rotated_pos(pos: Vector2, grid_size) -> Vector2:
     return Vector2(grid_size.y - 1 - pos.y, pos.x)
@@ -90,12 +113,21 @@ def rotated_pos(pos: Vector2, grid_size) -> Vector2:
 def rotated_pos_set(pos_set: Set[Vector2], grid_size: Vector2) -> Set[Vector2]:
     return set(map(lambda pos: rotated_pos(pos, grid_size), pos_set))
 
-def do_part2(input_data: InputData):
+def spin_cycle(input_data: InputData, cube_rocks_by_rotation, round_rocks: FrozenSet[Vector2]) -> FrozenSet[Vector2]:
+    for rot in range(4):
+        round_rocks = tilt(input_data.grid_size, cube_rocks_by_rotation[rot], round_rocks)
+        round_rocks = rotated_pos_set(round_rocks, input_data.grid_size)
+    return frozenset(round_rocks)
 
-    cube_rocks_by_rotation = [input_data.cube_rocks]
-    for _ in range(3):
-        cube_rocks_by_rotation.append(rotated_pos_set(cube_rocks_by_rotation[-1], input_data.grid_size))
+def load_after_cycles(input_data: InputData, cube_rocks_by_rotation) -> int:
+    # the rock positions after each spin cycle are compared exactly, so a repeat is a real cycle
+    start_rocks = frozenset(input_data.round_rocks)
+    cycle = find_cycle(iterate(start_rocks, lambda rocks: spin_cycle(input_data, cube_rocks_by_rotation, rocks)))
+
+    tilted_rocks = cycle.state_at(1000000000)
+    return calc_load(tilted_rocks, input_data.grid_size)
 
+def load_after_load_repeats(input_data: InputData, cube_rocks_by_rotation) -> int:
     tilted_rocks = input_data.round_rocks
 
     loads = []
@@ -126,24 +158,17 @@ def do_part2(input_data: InputData):
             prev_load_indexes[load] = load_idx
 
             if repeating_cycle_interval is not None:
-                new_cycle = cycle + int((max_cycle - 1 - cycle) / repeating_cycle_interval) * repeating_cycle_interval
-                print(f"Repeating cycle found at {cycle} with interval {repeating_cycle_interval}, skipping to cycle {new_cycle}")
-                cycle = new_cycle
+                cycle += (max_cycle - 1 - cycle) // repeating_cycle_interval * repeating_cycle_interval
 
         cycle += 1
-        # print(f"After {cycle} cycles:")
-        # pretty_print(input_data.grid_size, input_data.cube_rocks, tilted_rocks)
-
-    load = calc_load(tilted_rocks, input_data.grid_size)
 
-    print(f"part2: {load}")
+    return calc_load(tilted_rocks, input_data.grid_size)
 
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
+def do_part2(input_data: InputData):
 
-    do_part1(input_data)
-    do_part2(input_data)
+    cube_rocks_by_rotation = [input_data.cube_rocks]
+    for _ in range(3):
+        cube_rocks_by_rotation.append(rotated_pos_set(cube_rocks_by_rotation[-1], input_data.grid_size))
 
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    if USE_CYCLES: return load_after_cycles(input_data, cube_rocks_by_rotation)
+    return load_after_load_repeats(input_data, cube_rocks_by_rotation)
@@ -1,24 +1,26 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import Dict, Set
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
 
+from aoc import inputs
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 @dataclass
 class InputData:
     steps: [str]
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    return InputData(steps=text.replace("\n", "").split(","))
 
-    steps = lines[0].split(",")
+def parse_input(input_file=INPUT_FILE):
+    # one long comma separated line, both parts go through the steps once in order
+    steps = inputs.StreamedInput(lambda: inputs.iter_separated(input_file, ","))
 
     return InputData(steps=steps)
 
@@ -35,7 +37,7 @@ def do_part1(input_data: InputData):
     for step_str in input_data.steps:
         hash_sum += calc_hash(step_str)
 
-    print(f"part1: {hash_sum}")
+    return hash_sum
 
 def parse_step(step_str: str) -> (str, str, int):
     sep_idx = max(step_str.find("="), step_str.find("-"))
@@ -72,14 +74,4 @@ def do_part2(input_data: InputData):
         for item_idx, item, in enumerate(slot_list):
             focusing_power += (slot_idx + 1) * (item_idx + 1) * item[1]
 
-    print(f"part2: {focusing_power}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return focusing_power
@@ -1,145 +1,150 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
-import sys
 
-sys.setrecursionlimit(100000)
+from aoc import sharedmap
+from aoc.coords import UP, LEFT, DOWN, RIGHT
+from aoc.grid import Grid, grid_from_arrays, grid_to_arrays, parse_grid
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
-
-@dataclass(slots=True, eq=True, frozen=True)
-class Vector2:
-    x: int
-    y: int
-    def __neg__(a): return Vector2(-a.x, -a.y)
-    def __add__(a, b): return Vector2(a.x + b.x, a.y + b.y)
-    def __sub__(a, b): return Vector2(a.x - b.x, a.y - b.y)
-    def rotated_ccw(a): return Vector2(a.y, -a.x)
-
-@dataclass
-class InputData:
-    grid_size: Vector2
-    rows: [str]
-
-    def get(self, pos: Vector2) -> str:
-        return self.rows[pos.y][pos.x]
-    
-    def in_bounds(self, pos: Vector2) -> bool:
-        if pos.x < 0 or pos.x >= self.grid_size.x: return False
-        if pos.y < 0 or pos.y >= self.grid_size.y: return False
-        return True
-
-@dataclass(slots=True, eq=True, frozen=True)
-class BeamState:
-    pos: Vector2
-    dir: Vector2
-
-    def next_beam(self, dir: Vector2):
-        return BeamState(self.pos + dir, dir)
-
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
-
-    grid_size = Vector2(len(lines[0]), len(lines))
-
-    return InputData(grid_size=grid_size, rows=lines)
-
-def get_beams_by_pos(beams: Set[BeamState]) -> Dict[Vector2, List[Vector2]]:
-    beams_by_pos = {}
-    for beam in beams:
-        if not beam.pos in beams_by_pos:
-            beams_by_pos[beam.pos] = []
-        beams_by_pos[beam.pos].append(beam.dir)
-    return beams_by_pos
-
-def pretty_print(input_data: InputData, beams_set=set()):
-    beams_by_pos = get_beams_by_pos(beams_set)
-
-    for y in range(input_data.grid_size.y):
-        line = ""
-        for x in range(input_data.grid_size.x):
-            cell = input_data.get(Vector2(x, y))
-            if cell == '.':
-                if beams := beams_by_pos.get(Vector2(x, y)):
-                    if len(beams) > 1:
-                        cell = str(int(len(beams)))
-                    else:
-                        match beams[0]:
-                            case Vector2(0, -1): cell = '^'
-                            case Vector2(-1, 0): cell = '<'
-                            case Vector2(0, 1): cell = 'v'
-                            case Vector2(1, 0): cell = '>'
-            line += cell
-        print(line)
-    print()
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
-def solve_rec(input_data: InputData, seen_beams: Set[BeamState], cur_beam: BeamState):
-    if not input_data.in_bounds(cur_beam.pos): return
-
-    if cur_beam in seen_beams: return
-    seen_beams.add(cur_beam)
-
-    split = False
-    reflect_dir = None
-    match input_data.get(cur_beam.pos):
-        case '|': 
-            if cur_beam.dir.x != 0: split = True
-        case '-': 
-            if cur_beam.dir.y != 0: split = True
-        case '/':
-            if cur_beam.dir.x != 0: reflect_dir = Vector2(0, -cur_beam.dir.x)
-            else: reflect_dir = Vector2(-cur_beam.dir.y, 0)
-        case '\\':
-            if cur_beam.dir.x != 0: reflect_dir = Vector2(0, cur_beam.dir.x)
-            else: reflect_dir = Vector2(cur_beam.dir.y, 0)
-
-    if split:
-        solve_rec(input_data, seen_beams, cur_beam.next_beam(cur_beam.dir.rotated_ccw()))
-        solve_rec(input_data, seen_beams, cur_beam.next_beam(-cur_beam.dir.rotated_ccw()))
-    elif reflect_dir is not None:
-        solve_rec(input_data, seen_beams, cur_beam.next_beam(reflect_dir))
-    else:
-        solve_rec(input_data, seen_beams, cur_beam.next_beam(cur_beam.dir))
-
-def solve(input_data, start_beam) -> int:
-    seen_beams = set()
-    solve_rec(input_data, seen_beams, start_beam)
-    # pretty_print(input_data, seen_beams)
-    return len(list(get_beams_by_pos(seen_beams).keys()))
+# the walk over (position, direction) beam states in a set is kept as the reference, see aoc.difftest
+USE_PACKED_GRID = True
+
+SPLITTER_V = ord('|')
+SPLITTER_H = ord('-')
+MIRROR_SLASH = ord('/')
+MIRROR_BACKSLASH = ord('\\')
 
-def do_part1(input_data: InputData):
-    energized = solve(input_data, BeamState(Vector2(0, 0), Vector2(1, 0)))
-    print(f"part1: {energized}")
+# new beam direction after a mirror, indexed by the incoming direction
+SLASH_DIRS = (RIGHT, DOWN, LEFT, UP)
+BACKSLASH_DIRS = (LEFT, UP, RIGHT, DOWN)
+# (x, y) step of each direction
+DIR_STEPS = ((0, -1), (-1, 0), (0, 1), (1, 0))
 
-def do_part2(input_data: InputData):
-    start_beams = []
-    for x in range(input_data.grid_size.x):
-        start_beams.append(BeamState(Vector2(x, 0), Vector2(0, 1)))
-        start_beams.append(BeamState(Vector2(x, input_data.grid_size.y - 1), Vector2(0, -1)))
+def parse_text(text: str):
+    lines = text.splitlines()
 
-    for y in range(input_data.grid_size.y):
-        start_beams.append(BeamState(Vector2(0, y), Vector2(1, 0)))
-        start_beams.append(BeamState(Vector2(input_data.grid_size.x - 1, y), Vector2(-1, 0)))
+    return parse_grid(lines)
 
-    most_energized = 0
-    for start_beam in tqdm(start_beams):
-        most_energized = max(most_energized, solve(input_data, start_beam))
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-    print(f"part2: {most_energized}")
+def encode_input(grid: Grid):
+    return grid_to_arrays(grid)
 
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
+def decode_input(arrays) -> Grid:
+    return grid_from_arrays(arrays)
 
-    do_part1(input_data)
-    do_part2(input_data)
+def pretty_print(grid: Grid, seen_dirs: bytearray):
+    for y in range(grid.height):
+        line = ""
+        for x in range(grid.width):
+            cell = chr(grid.get(x, y))
+            dirs = seen_dirs[grid.index(x, y)]
+            if cell == '.' and dirs != 0:
+                dir_count = bin(dirs).count("1")
+                if dir_count > 1: cell = str(dir_count)
+                else: cell = "^<v>"[dirs.bit_length() - 1]
+            line += cell
+        print(line)
+    print()
+
+def solve(grid: Grid, start_idx: int, start_dir: int) -> int:
+    cells = grid.cells
+    offsets = grid.offsets4
+    border = grid.border
+
+    # bit d of seen_dirs[idx] is set once a beam has passed idx going in direction d
+    seen_dirs = bytearray(len(cells))
+    beams = [(start_idx, start_dir)]
+
+    while beams:
+        idx, dir = beams.pop()
+        while True:
+            cell = cells[idx]
+            if cell == border: break
+
+            dir_bit = 1 << dir
+            if seen_dirs[idx] & dir_bit: break
+            seen_dirs[idx] |= dir_bit
+
+            if cell == SPLITTER_V:
+                if dir == LEFT or dir == RIGHT:
+                    beams.append((idx + offsets[DOWN], DOWN))
+                    dir = UP
+            elif cell == SPLITTER_H:
+                if dir == UP or dir == DOWN:
+                    beams.append((idx + offsets[RIGHT], RIGHT))
+                    dir = LEFT
+            elif cell == MIRROR_SLASH:
+                dir = SLASH_DIRS[dir]
+            elif cell == MIRROR_BACKSLASH:
+                dir = BACKSLASH_DIRS[dir]
+
+            idx += offsets[dir]
+
+    # pretty_print(grid, seen_dirs)
+    return len(seen_dirs) - seen_dirs.count(0)
+
+def solve_bruteforce(grid: Grid, start_idx: int, start_dir: int) -> int:
+    start_x, start_y = grid.pos(start_idx)
+    start_dx, start_dy = DIR_STEPS[start_dir]
 
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    seen_beams = set()
+    beams = [(start_x, start_y, start_dx, start_dy)]
+    while beams:
+        beam = beams.pop()
+        x, y, dx, dy = beam
+        if x < 0 or x >= grid.width or y < 0 or y >= grid.height: continue
+
+        if beam in seen_beams: continue
+        seen_beams.add(beam)
+
+        match chr(grid.get(x, y)):
+            case '|' if dx != 0: next_dirs = [(dy, -dx), (-dy, dx)]
+            case '-' if dy != 0: next_dirs = [(dy, -dx), (-dy, dx)]
+            case '/': next_dirs = [(0, -dx) if dx != 0 else (-dy, 0)]
+            case '\\': next_dirs = [(0, dx) if dx != 0 else (dy, 0)]
+            case _: next_dirs = [(dx, dy)]
+
+        for next_dx, next_dy in next_dirs:
+            beams.append((x + next_dx, y + next_dy, next_dx, next_dy))
+
+    return len({(x, y) for x, y, _, _ in seen_beams})
+
+def solve_start(grid: Grid, start_idx: int, start_dir: int) -> int:
+    if USE_PACKED_GRID: return solve(grid, start_idx, start_dir)
+    return solve_bruteforce(grid, start_idx, start_dir)
+
+def do_part1(grid: Grid):
+    energized = solve_start(grid, grid.index(0, 0), RIGHT)
+    return energized
+
+def get_start_beam(grid: Grid, beam_idx: int) -> (int, int):
+    # down from the top row, up from the bottom row, right from the left column, left from the right column
+    if beam_idx < grid.width: return grid.index(beam_idx, 0), DOWN
+    beam_idx -= grid.width
+    if beam_idx < grid.width: return grid.index(beam_idx, grid.height - 1), UP
+    beam_idx -= grid.width
+    if beam_idx < grid.height: return grid.index(0, beam_idx), RIGHT
+    return grid.index(grid.width - 1, beam_idx - grid.height), LEFT
+
+def solve_start_beam(grid: Grid, beam_idx: int) -> int:
+    start_idx, start_dir = get_start_beam(grid, beam_idx)
+    return solve_start(grid, start_idx, start_dir)
+
+def do_part2(grid: Grid):
+    if not USE_PACKED_GRID:
+        return max(solve_start_beam(grid, beam_idx) for beam_idx in range(2 * (grid.width + grid.height)))
+
+    # the grid goes to the worker processes once, in shared memory, each task is a start beam index
+    beam_count = 2 * (grid.width + grid.height)
+    return max(sharedmap.shared_map(solve_start_beam, grid, beam_count, encode_input, decode_input))
@@ -1,158 +1,116 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
-import heapq
+
+from aoc import metrics, search
+from aoc.coords import RIGHT, rotated_ccw_dir, rotated_cw_dir
+from aoc.grid import BORDER, Grid, grid_from_arrays, grid_to_arrays, parse_grid
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 USE_HEURISTICS = False
 
-@dataclass(slots=True, frozen=True, eq=True, order=True)
-class Vector2:
-    x: int
-    y: int
-    def __neg__(a): return Vector2(-a.x, -a.y)
-    def __add__(a, b): return Vector2(a.x + b.x, a.y + b.y)
-    def __sub__(a, b): return Vector2(a.x - b.x, a.y - b.y)
-    def rotated_ccw(a): return Vector2(a.y, -a.x)
+# digits are stored as their values 1-9, so the border value 0 can't be mistaken for a cell
+DIGIT_VALUES = bytes.maketrans(b"123456789", bytes(range(1, 10)))
 
 @dataclass
 class InputData:
-    grid_size: Vector2
-    heat_loss_grid: [[int]]
+    heat_loss_grid: Grid
 
-    def get_heat_loss(self, pos: Vector2) -> int:
-        return self.heat_loss_grid[pos.y][pos.x]
-    
-    def in_bounds(self, pos: Vector2) -> bool:
-        if pos.x < 0 or pos.x >= self.grid_size.x: return False
-        if pos.y < 0 or pos.y >= self.grid_size.y: return False
-        return True
+def parse_text(text: str):
+    lines = text.splitlines()
 
+    heat_loss_grid = parse_grid(lines, translate=DIGIT_VALUES)
 
-@dataclass(slots=True, frozen=True, eq=True, order=True)
-class SearchState:
-    pos: Vector2
-    dir: Vector2
-    straight_moves: int
+    return InputData(heat_loss_grid=heat_loss_grid)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-    grid_size = Vector2(len(lines[0]), len(lines))
-    heat_loss_grid = []
-    for line in lines:
-        heat_loss_grid.append([int(c) for c in line])
+def encode_input(input_data: InputData):
+    return grid_to_arrays(input_data.heat_loss_grid)
 
-    return InputData(grid_size, heat_loss_grid=heat_loss_grid)
+def decode_input(arrays) -> InputData:
+    return InputData(heat_loss_grid=grid_from_arrays(arrays))
 
 # heuristic function for a-star, minimum heat loss when ignoring straight move requirements
-def search_min_heat_loss_per_pos(input_data: InputData) -> Dict[Vector2, int]:
-    search_start_pos = Vector2(0, 0)
-
-    min_heat_loss_per_pos = {}
-    search_queue = [(0, search_start_pos)]
-    heapq.heapify(search_queue)
-
-    while len(search_queue) > 0:
-        (cur_heat_loss, cur_pos) = heapq.heappop(search_queue)
-        if cur_pos in min_heat_loss_per_pos: continue
-        min_heat_loss_per_pos[cur_pos] = cur_heat_loss
+def search_min_heat_loss_per_pos(input_data: InputData) -> Dict[int, int]:
+    grid = input_data.heat_loss_grid
+    cells = grid.cells
 
-        if len(min_heat_loss_per_pos.keys()) == input_data.grid_size.x * input_data.grid_size.y:
-            break
+    def edges(pos):
+        for offset in grid.offsets4:
+            next_pos = pos + offset
+            if cells[next_pos] != BORDER: yield cells[next_pos], next_pos
 
-        possible_dirs = [Vector2(0, -1), Vector2(-1, 0), Vector2(0, 1), Vector2(1, 0)]
-        for dir in possible_dirs:
-            next_pos = cur_pos + dir
-            if not input_data.in_bounds(next_pos): continue
-            next_heat_loss = cur_heat_loss + input_data.get_heat_loss(next_pos)
-            heapq.heappush(search_queue, (next_heat_loss, next_pos))
-
-    return min_heat_loss_per_pos
+    result = search.dijkstra([grid.index(0, 0)], edges)
+    metrics.count("day17 heuristic search", **result.counts())
+    return result.dist
 
+# a search state (pos, dir, straight_moves) is packed into one int: pos is a grid index,
+# dir one of the coords direction indexes
+def pack_state(pos: int, dir: int, straight_moves: int, max_straight_moves: int) -> int:
+    return (pos * 4 + dir) * (max_straight_moves + 1) + straight_moves
 
 def search_best_path(input_data: InputData, min_straight_moves: int, max_straight_moves: int) -> int:
-    search_start_pos = Vector2(0, 0)
-    search_end_pos = input_data.grid_size - Vector2(1, 1)
-
-    if USE_HEURISTICS:
-        min_heat_loss_per_pos = search_min_heat_loss_per_pos(input_data)
-
-    search_visited = set()
-    if USE_HEURISTICS:
-        search_queue = [(0, (0, SearchState(pos=search_start_pos, dir=Vector2(1, 0), straight_moves=0)))]
-    else:
-        search_queue = [(0, SearchState(pos=search_start_pos, dir=Vector2(1, 0), straight_moves=0))]
+    grid = input_data.heat_loss_grid
+    cells = grid.cells
+    offsets = grid.offsets4
+    straight_range = max_straight_moves + 1
 
-    heapq.heapify(search_queue)
+    search_start_pos = grid.index(0, 0)
+    search_end_pos = grid.index(grid.width - 1, grid.height - 1)
 
-    min_total_heat_loss = None
-    with tqdm(total=input_data.grid_size.x * input_data.grid_size.y * 4 * max_straight_moves) as progress_bar:
+    def is_goal(state):
+        pos_dir, straight_moves = divmod(state, straight_range)
+        return pos_dir // 4 == search_end_pos and straight_moves >= min_straight_moves
 
-        while len(search_queue) > 0:
-            if USE_HEURISTICS:
-                (_, (cur_heat_loss, cur_state)) = heapq.heappop(search_queue)
-            else:
-                (cur_heat_loss, cur_state) = heapq.heappop(search_queue)
+    def edges(state):
+        pos_dir, straight_moves = divmod(state, straight_range)
+        pos, dir = divmod(pos_dir, 4)
 
-            if cur_state in search_visited: continue
-            search_visited.add(cur_state)
-            progress_bar.update(1)
+        possible_dirs = []
 
-            if cur_state.pos == search_end_pos and cur_state.straight_moves >= min_straight_moves:
-                min_total_heat_loss = cur_heat_loss
-                break
+        if straight_moves == 0 or straight_moves >= min_straight_moves:
+            possible_dirs.append(rotated_ccw_dir(dir))
+            possible_dirs.append(rotated_cw_dir(dir))
 
-            possible_dirs = []
+        if straight_moves == 0 or straight_moves < max_straight_moves:
+            possible_dirs.append(dir)
 
-            if cur_state.straight_moves == 0 or cur_state.straight_moves >= min_straight_moves:
-                possible_dirs.append(cur_state.dir.rotated_ccw())
-                possible_dirs.append(-cur_state.dir.rotated_ccw())
+        for next_dir in possible_dirs:
+            next_pos = pos + offsets[next_dir]
+            heat_loss = cells[next_pos]
+            if heat_loss == BORDER: continue
 
-            if cur_state.straight_moves == 0 or cur_state.straight_moves < max_straight_moves:
-                possible_dirs.append(cur_state.dir)
+            next_moved_straight = straight_moves + 1 if next_dir == dir else 1
+            yield heat_loss, (next_pos * 4 + next_dir) * straight_range + next_moved_straight
 
-            for next_dir in possible_dirs:
-                next_pos = cur_state.pos + next_dir
-                if not input_data.in_bounds(next_pos): continue
+    start_states = [pack_state(search_start_pos, RIGHT, 0, max_straight_moves)]
 
-                next_heat_loss = cur_heat_loss + input_data.get_heat_loss(next_pos)
-                next_moved_straight = cur_state.straight_moves + 1 if next_dir == cur_state.dir else 1
-
-                next_state = SearchState(next_pos, next_dir, next_moved_straight)
+    if USE_HEURISTICS:
+        min_heat_loss_per_pos = search_min_heat_loss_per_pos(input_data)
+        heuristic = lambda state: min_heat_loss_per_pos[search_end_pos] - min_heat_loss_per_pos[state // straight_range // 4]
+        result = search.astar(start_states, edges, heuristic, is_goal)
+    else:
+        # heat loss per move is a single digit, small enough for a bucket queue
+        result = search.dial(start_states, edges, 9, is_goal)
 
-                if USE_HEURISTICS:
-                    heuristics_value = min_heat_loss_per_pos[search_end_pos] - min_heat_loss_per_pos[next_pos]                    
-                    next_heat_loss_estimate = next_heat_loss + heuristics_value
-                    heapq.heappush(search_queue, (next_heat_loss_estimate, (next_heat_loss, next_state)))
-                else:
-                    heapq.heappush(search_queue, (next_heat_loss, next_state))
+    metrics.count("day17 path search", **result.counts())
+    return result.cost
 
-    return min_total_heat_loss
-    
 
 def do_part1(input_data: InputData):
     min_total_heat_loss = search_best_path(input_data, 1, 3)
-    print(f"part1: {min_total_heat_loss}")
+    return min_total_heat_loss
 
 def do_part2(input_data: InputData):
     min_total_heat_loss = search_best_path(input_data, 4, 10)
-    print(f"part2: {min_total_heat_loss}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return min_total_heat_loss
@@ -1,7 +1,5 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set
-from tqdm import tqdm
 import operator
 import functools
 import itertools
@@ -11,7 +9,8 @@ import sys
 sys.setrecursionlimit(100000)
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector2:
@@ -31,9 +30,8 @@ class Instruction:
     steps: int
     color: str
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     instructions = []
 
@@ -50,6 +48,10 @@ def parse_input():
 
     return instructions
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 def pretty_print(digged_positions = Set[Vector2]):
     bounds_min = functools.reduce(Vector2.min, digged_positions, next(iter(digged_positions)))
     bounds_max = functools.reduce(Vector2.max, digged_positions, next(iter(digged_positions)))
@@ -88,7 +90,7 @@ def do_part1(input_data: [Instruction]):
         floodfill(a + n_dir, digged_pos_set)
         floodfill(b + n_dir, digged_pos_set)
 
-    print(f"part1: {len(digged_pos_set)}")
+    return len(digged_pos_set)
 
 def decode_color_instruction(instruction: Instruction) -> Instruction:
     steps = int(instruction.color[:5], 16)
@@ -120,14 +122,4 @@ def do_part2(input_data: [Instruction]):
     perimeter = sum([i.steps for i in instructions])
     total_area += perimeter // 2 + 1
 
-    print(f"part2: {total_area}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return total_area
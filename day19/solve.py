@@ -1,14 +1,16 @@
-from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
+from typing import List, Dict, Set, Tuple, Any, Iterable, Self
 import operator
 import functools
 import itertools
 import math
 
+from aoc import inputs, memo
+from aoc.intervals import Box
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Condition:
@@ -37,10 +39,7 @@ def attr_to_int(attr: str) -> int:
         case "a": return 2
         case "s": return 3
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
-
+def parse_lines(lines: Iterable[str]):
     parsing_workflows = True
     workflows = {}
     parts = []
@@ -73,6 +72,12 @@ def parse_input():
 
     return InputData(workflows, parts)
 
+def parse_text(text: str):
+    return parse_lines(text.splitlines())
+
+def parse_input(input_file=INPUT_FILE):
+    return parse_lines(inputs.iter_lines(input_file))
+
 def check_part_condition(part: Part, condition: Condition):
     part_value = part.attrs[condition.attr]
     return part_value < condition.value if condition.is_less else part_value > condition.value
@@ -98,65 +103,38 @@ def do_part1(input_data: InputData):
             cur_workflow = input_data.workflows[target_name]
 
     accepted_sums = [sum(part.attrs) for part in accepted_parts]
-    print(f"part1: {sum(accepted_sums)}")
-
-@dataclass(slots=True, frozen=True, eq=True, order=True)
-class InclusiveRange:
-    min: int
-    max: int
-
-    def split_less(self, at: int) -> (Self, Self):
-        return (
-            InclusiveRange(self.min, min(self.max, at - 1)) if self.min < at else None, 
-            InclusiveRange(max(self.min, at), self.max) if self.max >= at else None
-        )
+    return sum(accepted_sums)
 
-@dataclass(slots=True, frozen=True, eq=True, order=True)
-class PartsRange:
-    attrs: Tuple[InclusiveRange]
-
-    def get_combinations_count(self):
-        return functools.reduce(operator.mul, [r.max - r.min + 1 for r in self.attrs], 1)
-    
-    def with_attr_range(self, attr: int, range: InclusiveRange):
-        return PartsRange(self.attrs[:attr] + (range,) + self.attrs[attr + 1:])
+def rec_solve_part2(workflows: Dict[str, Workflow], cur_workflow_name: str, cur_range: Box, accepted_cache: Dict) -> int:
+    # workflows sending the same range to the same workflow share its subtree
+    params_key = (cur_workflow_name, cur_range)
+    result = accepted_cache.get(params_key)
+    if result is not None: return result
 
-def rec_solve_part2(workflows: Dict[str, Workflow], cur_workflow_name: str, cur_range: PartsRange) -> int:
     cur_workflow = workflows[cur_workflow_name]
     total_accepted = 0
 
-    for condition, target_name in cur_workflow.rules + [(Condition(0, False, -1), cur_workflow.default_rule)]:
-        attr_range = cur_range.attrs[condition.attr]
+    for condition, target_name in cur_workflow.rules + [(Condition(0, False, 0), cur_workflow.default_rule)]:
         if condition.is_less:
-            true_attr_range, false_attr_range = attr_range.split_less(condition.value)
+            true_range, false_range = cur_range.split_at(condition.attr, condition.value)
         else:
-            false_attr_range, true_attr_range = attr_range.split_less(condition.value + 1)
-
-        if true_attr_range is not None:
-            true_range = cur_range.with_attr_range(condition.attr, true_attr_range)
+            false_range, true_range = cur_range.split_at(condition.attr, condition.value + 1)
 
+        if true_range is not None:
             if target_name == "A":
-                total_accepted += true_range.get_combinations_count()
+                total_accepted += true_range.volume()
             elif target_name != "R":
-                total_accepted += rec_solve_part2(workflows, target_name, true_range)
+                total_accepted += rec_solve_part2(workflows, target_name, true_range, accepted_cache)
             
-        if false_attr_range is None: 
+        if false_range is None: 
             break
-        cur_range = cur_range.with_attr_range(condition.attr, false_attr_range)
+        cur_range = false_range
 
+    accepted_cache[params_key] = total_accepted
     return total_accepted
 
 def do_part2(input_data: InputData):
-    start_range = PartsRange(tuple([InclusiveRange(1, 4000)] * 4))
-    total_accepted = rec_solve_part2(input_data.workflows, "in", start_range)
-    print(f"part2: {total_accepted}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    start_range = Box(((1, 4001),) * 4)
+    with memo.table("day19 accepted") as accepted_cache:
+        total_accepted = rec_solve_part2(input_data.workflows, "in", start_range, accepted_cache)
+    return total_accepted
@@ -1,14 +1,19 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
 
+from aoc.cycles import Cycle, find_cycle, first_common_step
+
 IS_EXAMPLE = False
-INPUT_FILE = "example2.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example2.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+
+# pressing until each target gets its signal and multiplying the presses is kept as the reference,
+# see aoc.difftest. It assumes coprime periods with no tail, which generated inputs have
+USE_CYCLES = True
 
 @dataclass(slots=True)
 class Module:
@@ -21,9 +26,8 @@ class Module:
 class InputData:
     modules: Module
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     modules = {}
     all_dst_names = []
@@ -49,6 +53,10 @@ def parse_input():
 
     return InputData(modules=modules)
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class ModuleState:
     values: Tuple[bool]
@@ -118,46 +126,68 @@ def do_part1(input_data: InputData):
 
             process_signal(modules, mod_states, signals, signal)
 
-    print(f"part1: {low_signals_popped * high_signals_popped}")
-
-def button_presses_for_signal(modules, target_dst, target_value):
+    return low_signals_popped * high_signals_popped
+
+def upstream_module_names(modules, name) -> List[str]:
+    # every module that can affect the signals name receives
+    names = set()
+    pending = list(modules[name].src_names)
+    while len(pending) > 0:
+        src_name = pending.pop()
+        if src_name in names: continue
+        names.add(src_name)
+        pending.extend(modules[src_name].src_names)
+    return sorted(names)
+
+def press_button(modules, mod_states, target_dst, target_value) -> bool:
+    # returns whether target_dst received target_value during the press
+    target_hit = False
+    signals = [Signal("button", "broadcaster", False)]
+
+    while len(signals) > 0:
+        signal = signals.pop(0)
+        if signal.dst == target_dst and signal.value == target_value:
+            target_hit = True
+        process_signal(modules, mod_states, signals, signal)
+
+    return target_hit
+
+def button_press_cycle_for_signal(modules, target_dst, target_value) -> (Cycle, Set[int]):
     mod_states = { mod.name: ModuleState.new_state(mod) for mod in modules.values() }
+    upstream_names = upstream_module_names(modules, target_dst)
 
-    button_presses = None
-    for step in range(10000000000):
-        signals = [Signal("button", "broadcaster", False)]
+    # only the upstream modules decide when target_dst gets the signal, so they cycle
+    # much sooner than the whole machine
+    hits = set()
+    def upstream_states():
+        for presses in itertools.count():
+            yield tuple(mod_states[name] for name in upstream_names)
+            if press_button(modules, mod_states, target_dst, target_value):
+                hits.add(presses)
 
-        while len(signals) > 0:
-            signal = signals.pop(0)
-            if signal.dst == target_dst:
-                if signal.value == target_value:
-                    button_presses = step + 1
-                    break
-            process_signal(modules, mod_states, signals, signal)
-        
-        if button_presses is not None:
-            break
-    return button_presses
+    cycle = find_cycle(upstream_states())
+    return cycle, hits
+
+def button_presses_for_signal(modules, target_dst, target_value) -> int:
+    mod_states = { mod.name: ModuleState.new_state(mod) for mod in modules.values() }
+
+    presses = 0
+    while True:
+        presses += 1
+        if press_button(modules, mod_states, target_dst, target_value): return presses
 
 def do_part2(input_data: InputData):
     modules = input_data.modules
 
     target_modules = modules[modules["rx"].src_names[0]].src_names
 
-    press_counts = []
-    for name in target_modules:
-        press_counts.append(button_presses_for_signal(modules, name, False))
-
-    needed_presses = functools.reduce(operator.mul, press_counts, 1)
-
-    print(f"part2: {needed_presses}")
+    if not USE_CYCLES:
+        press_counts = [button_presses_for_signal(modules, name, False) for name in target_modules]
+        return functools.reduce(operator.mul, press_counts, 1)
 
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
+    cycles = [button_press_cycle_for_signal(modules, name, False) for name in target_modules]
 
-    do_part1(input_data)
-    do_part2(input_data)
+    # the press after state n is press number n + 1
+    needed_presses = first_common_step(cycles) + 1
 
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return needed_presses
@@ -1,14 +1,19 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
+from array import array
 import operator
 import functools
 import itertools
 import math
 
+from aoc import memo, metrics, progress, search
+from aoc.coords import grid_coords, plane_coords
+from aoc.grid import Grid, grid_from_arrays, grid_to_arrays, parse_grid
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector2:
@@ -28,39 +33,41 @@ class Vector2:
     def __str__(a): return f"({a.x}, {a.y})"
     def __repr__(a): return str(a)
 
+OPEN = ord('.')
+
 @dataclass
 class InputData:
     grid_size: Vector2
     start_pos: Vector2
-    rows: [str]
+    grid: Grid
 
-    def get(self, pos: Vector2) -> str:
-        return self.rows[pos.y][pos.x]
-    
     def in_bounds(self, pos: Vector2) -> bool:
         if pos.x < 0 or pos.x >= self.grid_size.x: return False
         if pos.y < 0 or pos.y >= self.grid_size.y: return False
         return True
-    
-    def wrap(self, pos: Vector2) -> Vector2:
-        return Vector2(pos.x % self.grid_size.x, pos.y % self.grid_size.y)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     grid_size = Vector2(len(lines[0]), len(lines))
-    rows = []
+    grid = parse_grid(lines)
 
-    for y, line in enumerate(lines):
-        x = line.find("S")
-        if x >= 0:
-            start_pos = Vector2(x, y)
-            rows.append(line[:x] + "." + line[x + 1:])
-        else:
-            rows.append(line)
-        
-    return InputData(grid_size=grid_size, start_pos=start_pos, rows=rows)
+    start_idx = grid.find("S")
+    start_pos = Vector2(*grid.pos(start_idx))
+    grid.cells[start_idx] = OPEN
+
+    return InputData(grid_size=grid_size, start_pos=start_pos, grid=grid)
+
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
+def encode_input(input_data: InputData):
+    return grid_to_arrays(input_data.grid) | {"start_pos": array("q", [input_data.start_pos.x, input_data.start_pos.y])}
+
+def decode_input(arrays) -> InputData:
+    grid = grid_from_arrays(arrays)
+    return InputData(grid_size=Vector2(grid.width, grid.height), start_pos=Vector2(*arrays["start_pos"]), grid=grid)
 
 def get_neighbors(pos: Vector2) -> [Vector2]:
     return [pos + offset for offset in [Vector2(0, -1), Vector2(-1, 0), Vector2(0, 1), Vector2(1, 0)]]
@@ -82,7 +89,7 @@ def pretty_format(input_data: InputData, positions: Set[Vector2], draw_bounds: (
             elif y_border: line += "-"
             elif x_border: line += "|"
             else: 
-                c = input_data.get(input_data.wrap(pos))
+                c = chr(input_data.grid.get_wrapped(pos.x, pos.y))
                 if c == "#": line += "#"
                 elif c == ".": line += " "
                 else: line += c
@@ -90,27 +97,53 @@ def pretty_format(input_data: InputData, positions: Set[Vector2], draw_bounds: (
     return result_str
 
 def solve_bruteforce(input_data: InputData, target_steps_count: int, wraps: bool, show_progress: bool) -> [Vector2]:
-    even_positions = set([input_data.start_pos])
+    grid = input_data.grid
+    if wraps:
+        # the plane is unbounded, so pack positions relative to the start with enough room for every step
+        coords = plane_coords(target_steps_count)
+        start_offset = input_data.start_pos
+        def is_open(pos):
+            x, y = coords.unpack(pos)
+            return grid.get_wrapped(x + start_offset.x, y + start_offset.y) == OPEN
+        start_pos = coords.pack(0, 0)
+    else:
+        # the border cells aren't open, so grid indexes never leave the grid
+        coords = grid_coords(grid)
+        is_open = lambda pos: grid.cells[pos] == OPEN
+        start_pos = coords.pack(input_data.start_pos.x, input_data.start_pos.y)
+        start_offset = Vector2(0, 0)
+
+    even_positions = set([start_pos])
     odd_positions = set()
 
+    # positions first reached at each step
+    frontier_sizes = []
+
     steps_range = range(target_steps_count)
-    if show_progress: steps_range = tqdm(steps_range)
+    if show_progress: steps_range = progress.track(steps_range)
     for step in steps_range:
         cur_positions = even_positions if step % 2 == 0 else odd_positions
         next_positions = odd_positions if step % 2 == 0 else even_positions
+        reached_count = len(next_positions)
 
         for cur_pos in cur_positions:
-            for next_pos in get_neighbors(cur_pos):
-                if not wraps and not input_data.in_bounds(next_pos): continue
-                if input_data.get(input_data.wrap(next_pos)) != ".": continue
+            for offset in coords.dirs4:
+                next_pos = cur_pos + offset
+                if next_pos in next_positions: continue
+                if not is_open(next_pos): continue
                 next_positions.add(next_pos)
 
+        frontier_sizes.append(len(next_positions) - reached_count)
+
+    metrics.count("day21 bruteforce", searches=1, steps=target_steps_count, reached=len(even_positions) + len(odd_positions))
+    metrics.sample("day21 bruteforce", "frontier_sizes", frontier_sizes)
+
     final_positions = even_positions if target_steps_count % 2 == 0 else odd_positions
-    return list(final_positions)
+    return [Vector2(*coords.unpack(pos)) + start_offset for pos in final_positions]
 
 def do_part1(input_data: InputData):
     target_steps_count = 6 if IS_EXAMPLE else 64
-    print(f"part1: {len(solve_bruteforce(input_data, target_steps_count, False, False))}")
+    return len(solve_bruteforce(input_data, target_steps_count, False, False))
 
 def get_test_bounds(grid_size: Vector2, rep_min = Vector2(0, 0), rep_max = Vector2(1, 1)) -> (Vector2, Vector2):
     return (grid_size.scaled(rep_min), grid_size.scaled(rep_max))
@@ -138,26 +171,28 @@ def constrain_to_bounds(point: Vector2, bounds: (Vector2, Vector2)) -> Vector2:
     bounds_min, bounds_max = bounds
     return point.max(bounds_min).min(bounds_max - Vector2(1, 1))
 
-def calc_min_steps_per_pos(input_data: InputData, start_pos: Vector2, bounds: (Vector2, Vector2)):
-    min_steps = { start_pos: 0 }
-    cur_positions = [start_pos]
-
-    for step in range(100000000):
-        next_positions = set()
-
-        for cur_pos in cur_positions:
-            for next_pos in get_neighbors(cur_pos):
-                if not in_bounds(next_pos, bounds): continue
-                if input_data.get(input_data.wrap(next_pos)) != ".": continue
-
-                if next_pos in min_steps: continue
+def tile_garden(input_data: InputData, bounds: (Vector2, Vector2)) -> Grid:
+    # the garden repeated over bounds, its border cells keep searches inside them
+    bounds_min, bounds_max = bounds
+    grid = input_data.grid
+    width = bounds_max.x - bounds_min.x
+    start_x = bounds_min.x % grid.width
+    lines = []
+    for y in range(bounds_min.y, bounds_max.y):
+        row = grid.row(y % grid.height).decode()
+        lines.append((row * (width // grid.width + 2))[start_x:start_x + width])
+    return parse_grid(lines)
 
-                min_steps[next_pos] = step + 1
-                next_positions.add(next_pos)
+def calc_min_steps_per_pos(input_data: InputData, start_pos: Vector2, bounds: (Vector2, Vector2)):
+    bounds_min, _ = bounds
+    tiled = tile_garden(input_data, bounds)
+    neighbors = tiled.neighbor_table(tiled.offsets4, ".")
 
-        cur_positions = next_positions
-        if len(cur_positions) == 0: break
-    return min_steps
+    result = search.bfs([tiled.index(start_pos.x - bounds_min.x, start_pos.y - bounds_min.y)], neighbors.__getitem__)
+    # tiled.pos shifted to the bounds, in one step
+    origin_x, origin_y = bounds_min.x - 1, bounds_min.y - 1
+    return {Vector2(x + origin_x, y + origin_y): steps
+            for idx, steps in result.dist.items() for y, x in [divmod(idx, tiled.stride)]}
 
 def test_edge_distance_assumption(input_data: InputData, max_expansion: int) -> bool:
     grid_size = input_data.grid_size
@@ -180,43 +215,42 @@ def test_edge_distance_assumption(input_data: InputData, max_expansion: int) ->
                     return False
     return True
 
-def grid_get(grid_bounds, rows, pos):
-    min_bounds, max_bounds = grid_bounds
-    return rows[pos.y - min_bounds.y][pos.x - min_bounds.x]
-
-def grid_set(grid_bounds, rows, pos, value):
-    min_bounds, max_bounds = grid_bounds
-    rows[pos.y - min_bounds.y][pos.x - min_bounds.x] = value
-
 def search_all_possible_positions_with_steps_fast(input_data: InputData, start_pos: Vector2, grid_bounds: (Vector2, Vector2), target_steps_count: int, show_progress: bool = False) -> (int, int):
-
+    # grid_bounds always covers one repetition of the garden, which is the same as searching the
+    # original grid from the same relative position, where the border cells keep the search in bounds
     min_bounds, max_bounds = grid_bounds
+    assert max_bounds - min_bounds == input_data.grid_size
 
-    visited_grid = [[False] * (max_bounds.x - min_bounds.x) for _ in range(max_bounds.y - min_bounds.y)]
+    grid = input_data.grid
+    cells = grid.cells
+    offsets = grid.offsets4
+    relative_start_pos = start_pos - min_bounds
 
-    cur_positions = [start_pos]
+    visited = bytearray(len(cells))
+    cur_positions = [grid.index(relative_start_pos.x, relative_start_pos.y)]
     for pos in cur_positions:
-        grid_set(grid_bounds, visited_grid, pos, True)
+        visited[pos] = 1
 
     steps_done = 0
     even_pos_count = 0
     odd_pos_count = 0
 
+    frontier_sizes = []
+
     steps_range = range(target_steps_count + 1)
-    if show_progress: steps_range = tqdm(steps_range)
+    if show_progress: steps_range = progress.track(steps_range)
     for step in steps_range:
+        frontier_sizes.append(len(cur_positions))
+        if step % 2 == 0: even_pos_count += len(cur_positions)
+        else: odd_pos_count += len(cur_positions)
 
         next_positions = []
         for cur_pos in cur_positions:
-            if step % 2 == 0: even_pos_count += 1
-            else: odd_pos_count += 1
-
-            for next_pos in get_neighbors(cur_pos):
-                if not in_bounds(next_pos, grid_bounds): continue
-                if input_data.get(input_data.wrap(next_pos)) != ".": continue
-                if grid_get(grid_bounds, visited_grid, next_pos): continue
+            for offset in offsets:
+                next_pos = cur_pos + offset
+                if visited[next_pos] or cells[next_pos] != OPEN: continue
 
-                grid_set(grid_bounds, visited_grid, next_pos, True)
+                visited[next_pos] = 1
                 next_positions.append(next_pos)
 
         if len(next_positions) == 0 and steps_done % 2 == target_steps_count % 2: 
@@ -225,6 +259,9 @@ def search_all_possible_positions_with_steps_fast(input_data: InputData, start_p
         cur_positions = next_positions
         steps_done += 1
 
+    metrics.count("day21 fill search", searches=1, steps=steps_done, reached=even_pos_count + odd_pos_count)
+    metrics.sample("day21 fill search", "frontier_sizes", frontier_sizes)
+
     final_pos_count = even_pos_count if target_steps_count % 2 == 0 else odd_pos_count
     return steps_done, final_pos_count
 
@@ -233,20 +270,37 @@ class Cache:
     position_counts: Dict
     max_steps_to_fill: Dict
 
-def get_possible_positions_for_grids_cached(input_data: InputData, cache: Cache, grid_indexes: [Vector2], target_steps_count: int, show_progress: bool = False) -> int:
+    def close(self):
+        self.position_counts.close()
+        self.max_steps_to_fill.close()
+
+def new_cache(input_data: InputData) -> Cache:
+    # positions are relative to a repetition of the garden, so the results only depend on the garden
+    persist_key = memo.digest(input_data.grid_size, bytes(input_data.grid.cells))
+    return Cache(memo.table("day21 position counts", persist_key=persist_key),
+                 memo.table("day21 max steps to fill", persist_key=persist_key))
+
+def get_possible_positions_for_grids_cached(input_data: InputData, cache: Cache, grid_indexes: [Tuple[int, int]], target_steps_count: int, show_progress: bool = False) -> int:
     final_positions_count = 0
 
-    if show_progress: grid_indexes = tqdm(grid_indexes)
+    if show_progress: grid_indexes = progress.track(grid_indexes)
+
+    size_x, size_y = input_data.grid_size.x, input_data.grid_size.y
+    start_x, start_y = input_data.start_pos.x, input_data.start_pos.y
+    coords = grid_coords(input_data.grid)
+
+    for grid_x, grid_y in grid_indexes:
+        min_x, min_y = grid_x * size_x, grid_y * size_y
 
-    for grid_idx in grid_indexes:
-        grid_bounds = get_bounds_for_grid(grid_idx, input_data.grid_size)
-        start_pos = constrain_to_bounds(input_data.start_pos, grid_bounds)
+        # the position in this repetition of the garden closest to the start
+        relative_x = min(max(start_x - min_x, 0), size_x - 1)
+        relative_y = min(max(start_y - min_y, 0), size_y - 1)
 
-        start_distance = (start_pos - input_data.start_pos).abs().sum()
+        start_distance = abs(min_x + relative_x - start_x) + abs(min_y + relative_y - start_y)
         remaining_steps = target_steps_count - start_distance
         if remaining_steps < 0: continue
 
-        relative_start_pos = start_pos - grid_bounds[0]
+        relative_start_pos = coords.pack(relative_x, relative_y)
         remaining_steps_is_odd = remaining_steps % 2 == 1
         max_steps_to_fill = cache.max_steps_to_fill.get((relative_start_pos, remaining_steps_is_odd), 100000000)
 
@@ -254,6 +308,8 @@ def get_possible_positions_for_grids_cached(input_data: InputData, cache: Cache,
         grid_positions_count = cache.position_counts.get(cache_key, None)
 
         if grid_positions_count is None:
+            grid_bounds = get_bounds_for_grid(Vector2(grid_x, grid_y), input_data.grid_size)
+            start_pos = Vector2(min_x + relative_x, min_y + relative_y)
             steps_done, grid_positions_count = search_all_possible_positions_with_steps_fast(input_data, start_pos, grid_bounds, remaining_steps, False)
 
             # if didn't need all remaining steps to fill the grid, adjust cache key
@@ -273,10 +329,11 @@ def solve_grid_based_bruteforce(input_data: InputData, target_steps_count: int)
     grid_indexes = []
     for grid_y in range(-max_expansion, max_expansion + 1):
         for grid_x in range(-max_expansion, max_expansion + 1):
-            grid_indexes.append(Vector2(grid_x, grid_y))
+            grid_indexes.append((grid_x, grid_y))
 
-    cache = Cache({}, {})
-    final_positions_count = get_possible_positions_for_grids_cached(input_data, cache, grid_indexes, target_steps_count, True, False)
+    cache = new_cache(input_data)
+    final_positions_count = get_possible_positions_for_grids_cached(input_data, cache, grid_indexes, target_steps_count)
+    cache.close()
     return final_positions_count
 
 def solve_grid_based_optimized(input_data: InputData, target_steps_count: int) -> int:
@@ -287,18 +344,18 @@ def solve_grid_based_optimized(input_data: InputData, target_steps_count: int) -
     _, odd_filled_count = search_all_possible_positions_with_steps_fast(input_data, Vector2(0, 0), (Vector2(0, 0), input_data.grid_size), 100000001)
 
     final_count = 0
-    cache = Cache({}, {})
+    cache = new_cache(input_data)
 
-    for grid_y in tqdm(range(-max_edge_expansion, max_edge_expansion + 1)):
+    for grid_y in progress.track(range(-max_edge_expansion, max_edge_expansion + 1)):
 
         xee_max = max_edge_expansion - abs(grid_y)
         xee_min = xee_max - 2
 
         if xee_min <= 0:
-            final_count += get_possible_positions_for_grids_cached(input_data, cache, [Vector2(grid_x, grid_y) for grid_x in range(-xee_max, xee_max + 1)], target_steps_count)
+            final_count += get_possible_positions_for_grids_cached(input_data, cache, [(grid_x, grid_y) for grid_x in range(-xee_max, xee_max + 1)], target_steps_count)
         else:
-            final_count += get_possible_positions_for_grids_cached(input_data, cache, [Vector2(grid_x, grid_y) for grid_x in range(-xee_max, -xee_min + 1)], target_steps_count)
-            final_count += get_possible_positions_for_grids_cached(input_data, cache, [Vector2(grid_x, grid_y) for grid_x in range(xee_min, xee_max + 1)], target_steps_count)
+            final_count += get_possible_positions_for_grids_cached(input_data, cache, [(grid_x, grid_y) for grid_x in range(-xee_max, -xee_min + 1)], target_steps_count)
+            final_count += get_possible_positions_for_grids_cached(input_data, cache, [(grid_x, grid_y) for grid_x in range(xee_min, xee_max + 1)], target_steps_count)
 
             if grid_y % 2 == target_steps_count % 2:
                 final_count += (1 + 2 * ((xee_min - 1) // 2)) * even_filled_count
@@ -307,6 +364,7 @@ def solve_grid_based_optimized(input_data: InputData, target_steps_count: int) -
                 final_count += (1 + 2 * ((xee_min - 1) // 2)) * odd_filled_count
                 final_count += 2 * (xee_min // 2) * even_filled_count
 
+    cache.close()
     return final_count
 
 def do_part2(input_data: InputData):
@@ -334,14 +392,4 @@ def do_part2(input_data: InputData):
     
     final_positions_count = solve_grid_based_optimized(input_data, target_steps_count)
 
-    print(f"part2: {final_positions_count}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return final_positions_count
@@ -1,14 +1,17 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
+from array import array
+
+from aoc import parsing
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector3:
@@ -44,19 +47,25 @@ class Brick:
 class InputData:
     bricks: [Brick]
 
-def parse_vector3(input: str) -> Vector3:
-    parts = input.split(',')
-    return Vector3(int(parts[0]), int(parts[1]), int(parts[2]))
+def parse_text(text: str):
+    # x,y,z~x,y,z per line
+    records = parsing.int_records(text, 6)
+
+    bricks = [Brick(i, Vector3(x1, y1, z1), Vector3(x2, y2, z2)) for i, (x1, y1, z1, x2, y2, z2) in enumerate(records)]
+
+    return InputData(bricks=bricks)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-    bricks = []
-    for i, line in enumerate(lines):
-        parts = line.split("~")
-        bricks.append(Brick(i, parse_vector3(parts[0]), parse_vector3(parts[1])))
+# six coordinates per brick, bricks in input order
+def encode_input(input_data: InputData):
+    return {"bricks": array('q', [c for b in input_data.bricks for c in (b.p1.x, b.p1.y, b.p1.z, b.p2.x, b.p2.y, b.p2.z)])}
 
+def decode_input(arrays) -> InputData:
+    coords = arrays["bricks"].tolist()
+    bricks = [Brick(i, Vector3(*coords[i * 6:i * 6 + 3]), Vector3(*coords[i * 6 + 3:i * 6 + 6])) for i in range(len(coords) // 6)]
     return InputData(bricks=bricks)
 
 def solve_supports(input_data: InputData):
@@ -116,7 +125,7 @@ def do_part1(input_data: InputData):
         if not is_critical_support:
             safe_to_remove_count += 1
 
-    print(f"part1: {safe_to_remove_count}")
+    return safe_to_remove_count
 
 def do_part2(input_data: InputData):
     supports, supported_by = solve_supports(input_data)
@@ -143,14 +152,4 @@ def do_part2(input_data: InputData):
         # print(f"destroying {root_brick.idx} causes {len(falling_bricks) - 1} bricks to fall")
         total_fall_count += len(falling_bricks) - 1
 
-    print(f"part2: {total_fall_count}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return total_fall_count
@@ -1,15 +1,18 @@
-from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
+
+from aoc import metrics
+from aoc.grid import Grid, grid_from_arrays, grid_to_arrays, parse_grid
 # import graphviz
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector2:
@@ -29,22 +32,30 @@ class Vector2:
     def __str__(a): return f"({a.x}, {a.y})"
     def __repr__(a): return str(a)
 
-@dataclass
-class Grid:
-    size: Vector2
-    rows: [str]
+WALL = ord('#')
+OPEN = ord('.')
+SLOPE_DIRS = {
+    ord('^'): Vector2(0, -1),
+    ord('<'): Vector2(-1, 0),
+    ord('v'): Vector2(0, 1),
+    ord('>'): Vector2(1, 0),
+}
+
+def parse_text(text: str):
+    lines = text.splitlines()
 
-    def get(self, pos: Vector2) -> str:
-        if pos.y < 0 or pos.y >= self.size.y: return "#"
-        return self.rows[pos.y][pos.x]
+    # the border is made of walls, so stepping off the map needs no bounds check
+    return parse_grid(lines, border=WALL)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-    grid_size = Vector2(len(lines[0]), len(lines))
+def encode_input(grid: Grid):
+    return grid_to_arrays(grid)
 
-    return Grid(size=grid_size, rows=lines)
+def decode_input(arrays) -> Grid:
+    return grid_from_arrays(arrays)
 
 # black=30, red=31, green=32, yellow=33, blue=34, magenta=35, cyan=36, white=37 (bg_color=40+)
 def colorize(text: str, color: str, bold = False, underline = False, bg_color: str = None) -> str:
@@ -56,11 +67,11 @@ def colorize(text: str, color: str, bold = False, underline = False, bg_color: s
 
 def pretty_format(grid: Grid, intersections: Set[Vector2]):
     result_str = ""
-    for y in range(grid.size.y):
+    for y in range(grid.height):
         line = ""
-        for x in range(grid.size.x):
+        for x in range(grid.width):
             pos = Vector2(x, y)
-            cell = grid.get(pos)
+            cell = chr(grid.get(x, y))
 
             if pos in intersections:
                 cell = colorize('o' if cell == '.' else cell, "31")
@@ -72,17 +83,12 @@ def pretty_format(grid: Grid, intersections: Set[Vector2]):
 def get_neighbors(pos: Vector2) -> [Vector2]:
     return [pos + offset for offset in [Vector2(0, -1), Vector2(-1, 0), Vector2(0, 1), Vector2(1, 0)]]
 
-def get_cell_dir(cell: str) -> Vector2:
-    match cell:
-        case "^": return Vector2(0, -1)
-        case "<": return Vector2(-1, 0)
-        case "v": return Vector2(0, 1)
-        case ">": return Vector2(1, 0)
-    return None
+def get_cell_dir(cell: int) -> Vector2:
+    return SLOPE_DIRS.get(cell)
 
 def do_part1(grid: Grid):
-    start_pos = Vector2(grid.rows[0].index("."), 0)
-    end_pos = Vector2(grid.rows[-1].index("."), grid.size.y - 1)
+    start_pos = Vector2(grid.row(0).index(OPEN), 0)
+    end_pos = Vector2(grid.row(grid.height - 1).index(OPEN), grid.height - 1)
 
     path = {start_pos: (0, None)}
     search_queue = [start_pos]
@@ -93,16 +99,16 @@ def do_part1(grid: Grid):
         if cur_pos == end_pos: continue
 
         for next_pos in get_neighbors(cur_pos):
-            next_cell = grid.get(next_pos)
+            next_cell = grid.get(next_pos.x, next_pos.y)
             if next_pos == prev_pos: continue
-            if next_cell == "#": continue
-            next_cell_dir = get_cell_dir(grid.get(next_pos))
+            if next_cell == WALL: continue
+            next_cell_dir = get_cell_dir(next_cell)
             if next_cell_dir is not None and next_pos - cur_pos != next_cell_dir: continue
 
             path[next_pos] = (cur_steps + 1, cur_pos)
             search_queue.append(next_pos)
 
-    print(f"part1: {path[end_pos][0]}")
+    return path[end_pos][0]
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Connection:
@@ -119,7 +125,7 @@ def rec_find_connections(grid, intersections, visited, start_pos, cur_pos, dista
     connections = []
     for next_pos in get_neighbors(cur_pos):
         if next_pos in visited: continue
-        if grid.get(next_pos) == "#": continue
+        if grid.get(next_pos.x, next_pos.y) == WALL: continue
         connections.extend(rec_find_connections(grid, intersections, visited, start_pos, next_pos, distance + 1))
 
     return connections
@@ -135,30 +141,42 @@ def rec_find_connections(grid, intersections, visited, start_pos, cur_pos, dista
 
 #     dot.render('thehike.gv').replace('\\', '/')
 
-def find_longest_path(connections_map, end_node, visited, cur_node):
-    if cur_node == end_node: return 0
+@dataclass(slots=True)
+class LongestPathCounts:
+    nodes_visited: int = 0
+    # edges not taken because they lead back onto the current path
+    branches_pruned: int = 0
+    paths_completed: int = 0
+
+def find_longest_path(connections_map, end_node, visited, cur_node, counts: LongestPathCounts):
+    counts.nodes_visited += 1
+    if cur_node == end_node:
+        counts.paths_completed += 1
+        return 0
     visited.add(cur_node)
 
     max_dist = -99999999
     for dist_to_next, next_node in connections_map[cur_node]:
-        if next_node in visited: continue
+        if next_node in visited:
+            counts.branches_pruned += 1
+            continue
 
-        dist = dist_to_next + find_longest_path(connections_map, end_node, visited, next_node)
+        dist = dist_to_next + find_longest_path(connections_map, end_node, visited, next_node, counts)
         max_dist = max(max_dist, dist)
 
     visited.remove(cur_node)
     return max_dist
 
 def do_part2(grid: Grid):
-    start_pos = Vector2(grid.rows[0].index("."), 0)
-    end_pos = Vector2(grid.rows[-1].index("."), grid.size.y - 1)
+    start_pos = Vector2(grid.row(0).index(OPEN), 0)
+    end_pos = Vector2(grid.row(grid.height - 1).index(OPEN), grid.height - 1)
 
     intersections = [start_pos]
-    for y in range(1, grid.size.y - 1):
-        for x in range(1, grid.size.x - 1):
+    for y in range(1, grid.height - 1):
+        for x in range(1, grid.width - 1):
             pos = Vector2(x, y)
-            if grid.get(pos) == "#": continue
-            paths_count = len([n for n in get_neighbors(pos) if grid.get(n) != "#"])
+            if grid.get(x, y) == WALL: continue
+            paths_count = len([n for n in get_neighbors(pos) if grid.get(n.x, n.y) != WALL])
             if paths_count > 2: intersections.append(pos)
     intersections.append(end_pos)
     intersections_set = set(intersections)
@@ -168,7 +186,7 @@ def do_part2(grid: Grid):
     for start in intersections:
         visited.add(start)
         for n_pos in get_neighbors(start):
-            if grid.get(n_pos) != "#":
+            if grid.get(n_pos.x, n_pos.y) != WALL:
                 connections.extend(rec_find_connections(grid, intersections_set, visited, start, n_pos, 1))
 
     # draw_graph(intersections, connections)
@@ -181,16 +199,8 @@ def do_part2(grid: Grid):
         connections_map[conn.start].append((conn.distance, conn.end))
         connections_map[conn.end].append((conn.distance, conn.start))
 
-    max_dist = find_longest_path(connections_map, end_pos, set(), start_pos)
+    counts = LongestPathCounts()
+    max_dist = find_longest_path(connections_map, end_pos, set(), start_pos, counts)
+    metrics.count("day23 longest path", **asdict(counts))
     
-    print(f"part2: {max_dist}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return max_dist
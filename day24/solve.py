@@ -1,14 +1,17 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
+from array import array
+
+from aoc import parsing, progress
 
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
+PARSER_VERSION = 1
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector3:
@@ -48,19 +51,25 @@ class Hailstone:
 class InputData:
     hailstones: [Hailstone]
 
-def parse_vector3(input: str) -> Vector3:
-    x = input.split(', ')
-    return Vector3(int(x[0]), int(x[1]), int(x[2]))
+def parse_text(text: str):
+    # px, py, pz @ vx, vy, vz per line
+    records = parsing.int_records(text, 6)
+
+    hailstones = [Hailstone(Vector3(px, py, pz), Vector3(vx, vy, vz)) for px, py, pz, vx, vy, vz in records]
+
+    return InputData(hailstones)
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
 
-    hailstones = []
-    for line in lines:
-        x = line.split(' @ ')
-        hailstones.append(Hailstone(parse_vector3(x[0]), parse_vector3(x[1])))
+# position then velocity per hailstone
+def encode_input(input_data: InputData):
+    return {"hailstones": array('q', [c for h in input_data.hailstones for c in (h.pos.x, h.pos.y, h.pos.z, h.vel.x, h.vel.y, h.vel.z)])}
 
+def decode_input(arrays) -> InputData:
+    coords = arrays["hailstones"].tolist()
+    hailstones = [Hailstone(Vector3(*coords[i:i + 3]), Vector3(*coords[i + 3:i + 6])) for i in range(0, len(coords), 6)]
     return InputData(hailstones)
 
 def linesegment_intersect_2d(a1: Vector3, a2: Vector3, b1: Vector3, b2: Vector3) -> Vector3:
@@ -89,7 +98,7 @@ def do_part1(input_data: InputData):
             if intersection.y < bounds_min or intersection.y > bounds_max: continue
             total_intersections += 1
 
-    print(f"part1: {total_intersections}")
+    return total_intersections
 
 def calc_closest_encounter(s1: Hailstone, s2: Hailstone):
     a, b = s1.pos, s1.vel
@@ -148,7 +157,7 @@ def find_best_times(a: Hailstone, b: Hailstone, others: [Hailstone], a_time_rang
     best_b_time = None
     best_throw = None
 
-    for a_i in tqdm(range(max_steps)):
+    for a_i in progress.track(range(max_steps)):
         a_time = a_time_range[0] + (a_time_range[1] - a_time_range[0]) / (max_steps - 1) * a_i
 
         for b_i in range(max_steps):
@@ -203,7 +212,7 @@ def improve_best_throw(best_throw: Hailstone, others: [Hailstone]) -> (float, Ha
     best_error = None
     best_offset = None
 
-    for z in tqdm(range(-10, 10)):
+    for z in progress.track(range(-10, 10)):
         for y in range(-10, 10):
             for x in range(-10, 10):
                 offset = Vector3(x, y, z)
@@ -247,14 +256,4 @@ def do_part2(input_data: InputData):
 
     print(f"2nd pass: {best_throw=}")
 
-    print(f"part2: {best_throw.pos.x + best_throw.pos.y + best_throw.pos.z}")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return best_throw.pos.x + best_throw.pos.y + best_throw.pos.z
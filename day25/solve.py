@@ -1,24 +1,24 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
 # import graphviz
 
+from aoc import metrics, progress
+
 IS_EXAMPLE = False
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 @dataclass
 class InputData:
     node_names: [str]
     connections: [(str, str)]
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     nodes = set()
     for line in lines:
@@ -36,6 +36,10 @@ def parse_input():
 
     return InputData(node_names=list(nodes), connections=connections)
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 # def draw_graph(nodes, connections):
 #     dot = graphviz.Graph(comment='Graph')
 
@@ -62,7 +66,7 @@ def parse_input():
 
 #     dot.render('graph2.gv').replace('\\', '/')
 
-def flow_step(connections_map, node_levels, connections_used) -> bool:
+def flow_step(connections_map, node_levels, connections_used) -> int:
     total_flow = 0
     for src_idx in range(len(node_levels)):
         for conn_idx, dst_idx in connections_map[src_idx]:
@@ -71,7 +75,7 @@ def flow_step(connections_map, node_levels, connections_used) -> bool:
                 node_levels[dst_idx] += 1
                 connections_used[conn_idx] = True
                 total_flow += 1
-    return total_flow > 0
+    return total_flow
 
 def do_part1(input_data: InputData):
     node_names = input_data.node_names
@@ -98,10 +102,16 @@ def do_part1(input_data: InputData):
 
         node_levels[node_idx_map[origin_node_name]] = 100000
         max_steps = 10000
-        for step in tqdm(range(max_steps)):
+        flow_steps, units_moved = 0, 0
+        for step in progress.track(range(max_steps)):
             for i in range(len(connections_used)): connections_used[i] = False
-            while flow_step(connections_map, node_levels, connections_used):
-                pass
+            # until a step moves nothing
+            moved = 1
+            while moved > 0:
+                moved = flow_step(connections_map, node_levels, connections_used)
+                flow_steps += 1
+                units_moved += moved
+        metrics.count("day25 flow", origins=1, steps=max_steps, flow_steps=flow_steps, units_moved=units_moved)
 
         # draw_graph2(connections_map, node_levels)
         sorted_levels = sorted(node_levels)
@@ -116,17 +126,7 @@ def do_part1(input_data: InputData):
         break
     
     print(f"{group1_count=}, {group2_count=}")
-    print(f"part1: {group1_count * group2_count}")
+    return group1_count * group2_count
 
 def do_part2(input_data: InputData):
-    print(f"part2: big red button pressed")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return "big red button pressed"
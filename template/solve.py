@@ -1,28 +1,27 @@
-from datetime import datetime
 from dataclasses import dataclass
 from typing import List, Dict, Set, Tuple, Any, Self
-from tqdm import tqdm
 import operator
 import functools
 import itertools
 import math
 
-# import heapq
+# from aoc import progress
 #
-# search_visited = set()
-# search_queue = [(0, start_state)]
-# heapq.heapify(search_queue)
-#
-# while len(search_queue) > 0:
-#     (cur_cost, cur_state) = heapq.heappop(search_queue)
-#     if cur_state in search_visited: continue
-#     search_visited.add(cur_state)
+# for item in progress.track(items):
+#     ...
+
+# from aoc import search
 #
+# def edges(state):
 #     for next_state in next_states:
-#         heapq.heappush(search_queue, (next_cost, next_state))
+#         yield (next_cost, next_state)
+#
+# result = search.dijkstra([start_state], edges, is_goal=lambda state: state == end_state)
+# result.cost, result.path()
 
 IS_EXAMPLE = True
-INPUT_FILE = "example.txt" if IS_EXAMPLE else "input.txt"
+EXAMPLE_FILE = "example.txt"
+INPUT_FILE = EXAMPLE_FILE if IS_EXAMPLE else "input.txt"
 
 @dataclass(slots=True, frozen=True, eq=True, order=True)
 class Vector2:
@@ -64,25 +63,18 @@ class Vector3:
 class InputData:
     lines: [str]
 
-def parse_input():
-    with open(INPUT_FILE, "r") as file:
-        lines = [line.rstrip("\r\n") for line in file.readlines()]
+def parse_text(text: str):
+    lines = text.splitlines()
 
     return InputData(lines=lines)
 
+def parse_input(input_file=INPUT_FILE):
+    with open(input_file, "r") as file:
+        return parse_text(file.read())
+
 def do_part1(input_data: InputData):
     print(input_data.lines)
-    print(f"part1: ")
+    return None
 
 def do_part2(input_data: InputData):
-    print(f"part2: ")
-
-if __name__ == '__main__':
-    start_time = datetime.now()
-    input_data = parse_input()
-
-    do_part1(input_data)
-    do_part2(input_data)
-
-    end_time = datetime.now()
-    print(f"run time: {end_time - start_time}")
+    return None